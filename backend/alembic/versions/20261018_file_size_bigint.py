@@ -0,0 +1,26 @@
+"""widen order_files/product_files.file_size to BIGINT for files of 2 GiB and more
+
+Revision ID: 20261018_file_size_bigint
+Revises: 20261018_reservation_expiry
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_file_size_bigint"
+down_revision = "20261018_reservation_expiry"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("order_files", "product_files"):
+        op.alter_column(table, "file_size", type_=sa.BigInteger(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    # Fails if a file of 2 GiB or more is recorded
+    for table in ("product_files", "order_files"):
+        op.alter_column(table, "file_size", type_=sa.Integer(), existing_nullable=False)
@@ -0,0 +1,25 @@
+"""cache CRC-32 of order files for streamed ZIP bundles
+
+Revision ID: 20261018_order_file_crc
+Revises: 20261018_order_number_seq
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_order_file_crc"
+down_revision = "20261018_order_number_seq"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("order_files", sa.Column("crc32", sa.BigInteger(), nullable=True))
+    op.add_column("order_files", sa.Column("crc32_mtime_ns", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("order_files", "crc32_mtime_ns")
+    op.drop_column("order_files", "crc32")
@@ -0,0 +1,79 @@
+"""order_items: multi-product orders
+
+Revision ID: 20261018_order_items
+Revises: 20261018_idempotency_keys
+Create Date: 2026-10-18
+
+"""
+
+import math
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_order_items"
+down_revision = "20261018_idempotency_keys"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.core.ranking.popularity_rebuild_sql() as of this revision: purchases are
+# now order lines weighing quantity x 3 (2026-01-01 epoch, 14-day half-life, like 1).
+_EPOCH = 1767225600.0
+_RATE = math.log(2) / (14 * 86400)
+POPULARITY_REBUILD_SQL = f"""
+UPDATE products AS p
+SET popularity_score = coalesce(s.score, 0)
+FROM products pr
+LEFT JOIN (
+    SELECT product_id, m + ln(exp(-m) + total) AS score
+    FROM (
+        SELECT product_id, m, sum(exp(x - m)) AS total
+        FROM (
+            SELECT product_id, x, greatest(0, max(x) OVER (PARTITION BY product_id)) AS m
+            FROM (
+                SELECT i.product_id,
+                       ln(3.0 * i.quantity)
+                       + (extract(epoch FROM coalesce(o.updated_at, o.created_at)) - {_EPOCH}) * {_RATE} AS x
+                FROM orders o JOIN order_items i ON i.order_id = o.id
+                WHERE o.status = 'COMPLETED'
+                UNION ALL
+                SELECT product_id,
+                       ln(1.0) + (extract(epoch FROM created_at) - {_EPOCH}) * {_RATE}
+                FROM product_likes
+            ) events
+        ) shifted
+        GROUP BY product_id, m
+    ) totals
+) s ON s.product_id = pr.id
+WHERE p.id = pr.id
+  AND p.popularity_score IS DISTINCT FROM coalesce(s.score, 0)
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("quantity", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("unit_price", sa.Float(), nullable=False),
+        sa.UniqueConstraint("order_id", "product_id", name="uq_order_item_order_product"),
+    )
+    op.create_index("ix_order_items_id", "order_items", ["id"])
+    op.create_index("ix_order_items_product_id", "order_items", ["product_id"])
+    # Existing orders are single-product: one line each
+    op.execute(
+        """
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price)
+        SELECT id, product_id, 1, amount FROM orders
+        """
+    )
+    # Purchases are scored from order lines from here on
+    op.execute(POPULARITY_REBUILD_SQL)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_items_product_id", table_name="order_items")
+    op.drop_index("ix_order_items_id", table_name="order_items")
+    op.drop_table("order_items")
@@ -0,0 +1,22 @@
+"""order_number_seq: sequential, checksummed order numbers
+
+Revision ID: 20261018_order_number_seq
+Revises: 20261018_order_items
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+revision = "20261018_order_number_seq"
+down_revision = "20261018_order_items"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS order_number_seq START WITH 1")
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE IF EXISTS order_number_seq")
@@ -0,0 +1,47 @@
+"""add denormalized like/review counters to products
+
+Revision ID: 20261018_product_counters
+Revises: 20261018_product_keyset
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_product_counters"
+down_revision = "20261018_product_keyset"
+branch_labels = None
+depends_on = None
+
+COUNTERS = ("like_count", "review_count", "rating_sum", "rating_count")
+
+
+def upgrade() -> None:
+    for name in COUNTERS:
+        op.add_column(
+            "products",
+            sa.Column(name, sa.Integer(), nullable=False, server_default="0"),
+        )
+    op.execute(
+        """
+        UPDATE products AS p
+        SET like_count = coalesce(l.n, 0),
+            review_count = coalesce(r.n, 0),
+            rating_sum = coalesce(r.rating_sum, 0),
+            rating_count = coalesce(r.rating_count, 0)
+        FROM products pr
+        LEFT JOIN (SELECT product_id, count(*) AS n FROM product_likes GROUP BY product_id) l
+            ON l.product_id = pr.id
+        LEFT JOIN (
+            SELECT product_id, count(*) AS n, sum(rating) AS rating_sum, count(rating) AS rating_count
+            FROM reviews GROUP BY product_id
+        ) r ON r.product_id = pr.id
+        WHERE p.id = pr.id
+        """
+    )
+
+
+def downgrade() -> None:
+    for name in reversed(COUNTERS):
+        op.drop_column("products", name)
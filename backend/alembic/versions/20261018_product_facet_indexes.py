@@ -0,0 +1,36 @@
+"""add indexes for product facet filters
+
+Revision ID: 20261018_product_facets
+Revises: 20261018_product_counters
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+revision = "20261018_product_facets"
+down_revision = "20261018_product_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_category ON products (category)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_format ON products (format)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_price ON products (price)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_products_offer_end_date ON products (offer_end_date) "
+        "WHERE offer_end_date IS NOT NULL"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_products_bestseller_created_at_id ON products (created_at, id) "
+        "WHERE bestseller"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_products_bestseller_created_at_id")
+    op.execute("DROP INDEX IF EXISTS ix_products_offer_end_date")
+    op.execute("DROP INDEX IF EXISTS ix_products_price")
+    op.execute("DROP INDEX IF EXISTS ix_products_format")
+    op.execute("DROP INDEX IF EXISTS ix_products_category")
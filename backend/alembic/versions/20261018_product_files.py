@@ -0,0 +1,38 @@
+"""product_files: uploaded product assets, copied onto paid orders
+
+Revision ID: 20261018_product_files
+Revises: 20261018_order_file_crc
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_product_files"
+down_revision = "20261018_order_file_crc"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "product_files",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("file_name", sa.String(), nullable=False),
+        sa.Column("file_path", sa.String(), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("sha256", sa.String(64), nullable=False),
+        sa.Column("crc32", sa.BigInteger(), nullable=True),
+        sa.Column("crc32_mtime_ns", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_product_files_id", "product_files", ["id"])
+    op.create_index("ix_product_files_product_id", "product_files", ["product_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_files_product_id", table_name="product_files")
+    op.drop_index("ix_product_files_id", table_name="product_files")
+    op.drop_table("product_files")
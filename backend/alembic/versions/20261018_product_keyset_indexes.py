@@ -0,0 +1,26 @@
+"""add composite indexes for keyset pagination of products
+
+Revision ID: 20261018_product_keyset
+Revises: 20261018_product_search
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+revision = "20261018_product_keyset"
+down_revision = "20261018_product_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_created_at_id ON products (created_at, id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_products_featured_created_at_id ON products (featured, created_at, id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_products_featured_created_at_id")
+    op.execute("DROP INDEX IF EXISTS ix_products_created_at_id")
@@ -0,0 +1,73 @@
+"""add popularity_score and sort-order indexes to products
+
+Revision ID: 20261018_product_popularity
+Revises: 20261018_product_title_trgm
+Create Date: 2026-10-18
+
+"""
+
+import math
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_product_popularity"
+down_revision = "20261018_product_title_trgm"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.core.ranking.popularity_rebuild_sql() as of this revision (orders were
+# single-product; order_items comes later): 2026-01-01 epoch, 14-day half-life, purchase 3, like 1.
+_EPOCH = 1767225600.0
+_RATE = math.log(2) / (14 * 86400)
+POPULARITY_REBUILD_SQL = f"""
+UPDATE products AS p
+SET popularity_score = coalesce(s.score, 0)
+FROM products pr
+LEFT JOIN (
+    SELECT product_id, m + ln(exp(-m) + total) AS score
+    FROM (
+        SELECT product_id, m, sum(exp(x - m)) AS total
+        FROM (
+            SELECT product_id, x, greatest(0, max(x) OVER (PARTITION BY product_id)) AS m
+            FROM (
+                SELECT product_id,
+                       ln(3.0) + (extract(epoch FROM coalesce(updated_at, created_at)) - {_EPOCH}) * {_RATE} AS x
+                FROM orders WHERE status = 'COMPLETED'
+                UNION ALL
+                SELECT product_id,
+                       ln(1.0) + (extract(epoch FROM created_at) - {_EPOCH}) * {_RATE}
+                FROM product_likes
+            ) events
+        ) shifted
+        GROUP BY product_id, m
+    ) totals
+) s ON s.product_id = pr.id
+WHERE p.id = pr.id
+  AND p.popularity_score IS DISTINCT FROM coalesce(s.score, 0)
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "products",
+        sa.Column("popularity_score", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.execute(POPULARITY_REBUILD_SQL)
+    op.execute("DROP INDEX IF EXISTS ix_products_price")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_price_id ON products (price, id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_popularity_id ON products (popularity_score, id)")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_products_top_rated ON products
+            ((coalesce(rating_sum::float8 / nullif(rating_count, 0), 0)), rating_count, id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_products_top_rated")
+    op.execute("DROP INDEX IF EXISTS ix_products_popularity_id")
+    op.execute("DROP INDEX IF EXISTS ix_products_price_id")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_price ON products (price)")
+    op.drop_column("products", "popularity_score")
@@ -0,0 +1,51 @@
+"""add per-star rating histogram counters to products
+
+Revision ID: 20261018_rating_histogram
+Revises: 20261018_review_keyset
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_rating_histogram"
+down_revision = "20261018_review_keyset"
+branch_labels = None
+depends_on = None
+
+BUCKETS = ("rating_1", "rating_2", "rating_3", "rating_4", "rating_5")
+
+
+def upgrade() -> None:
+    for name in BUCKETS:
+        op.add_column(
+            "products",
+            sa.Column(name, sa.Integer(), nullable=False, server_default="0"),
+        )
+    op.execute(
+        """
+        UPDATE products AS p
+        SET rating_1 = r.rating_1,
+            rating_2 = r.rating_2,
+            rating_3 = r.rating_3,
+            rating_4 = r.rating_4,
+            rating_5 = r.rating_5
+        FROM (
+            SELECT
+                product_id,
+                count(*) FILTER (WHERE rating = 1) AS rating_1,
+                count(*) FILTER (WHERE rating = 2) AS rating_2,
+                count(*) FILTER (WHERE rating = 3) AS rating_3,
+                count(*) FILTER (WHERE rating = 4) AS rating_4,
+                count(*) FILTER (WHERE rating = 5) AS rating_5
+            FROM reviews GROUP BY product_id
+        ) r
+        WHERE p.id = r.product_id
+        """
+    )
+
+
+def downgrade() -> None:
+    for name in reversed(BUCKETS):
+        op.drop_column("products", name)
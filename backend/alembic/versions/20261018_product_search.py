@@ -0,0 +1,73 @@
+"""add full-text search vector to products
+
+Revision ID: 20261018_product_search
+Revises: 20260403_pref_lang
+Create Date: 2026-10-18
+
+"""
+
+import os
+
+from alembic import op
+
+revision = "20261018_product_search"
+down_revision = "20260403_pref_lang"
+branch_labels = None
+depends_on = None
+
+
+def _search_ddl(language: str) -> list:
+    """Frozen copy of app.db.database.product_search_ddl() as of this revision (title trigram indexes come later)."""
+    stemmer = "simple" if language == "simple" else f"{language}_stem"
+    document = (
+        "setweight(to_tsvector('product_search', coalesce({row}title, '')), 'A') || "
+        "setweight(to_tsvector('product_search', coalesce({row}description, '')), 'B')"
+    )
+    return [
+        "CREATE EXTENSION IF NOT EXISTS unaccent",
+        f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'product_search') THEN
+                CREATE TEXT SEARCH CONFIGURATION product_search (COPY = {language});
+                ALTER TEXT SEARCH CONFIGURATION product_search
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, {stemmer};
+            END IF;
+        END
+        $$
+        """,
+        "ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector TSVECTOR",
+        f"""
+        CREATE OR REPLACE FUNCTION products_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {document.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_products_search_vector ON products",
+        """
+        CREATE TRIGGER trg_products_search_vector
+            BEFORE INSERT OR UPDATE OF title, description ON products
+            FOR EACH ROW EXECUTE FUNCTION products_search_vector_update()
+        """,
+        f"UPDATE products SET search_vector = {document.format(row='')} WHERE search_vector IS NULL",
+        "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING GIN (search_vector)",
+    ]
+
+
+def upgrade() -> None:
+    # Same setting the app reads (SEARCH_LANGUAGE, default french), without importing app code
+    language = os.environ.get("SEARCH_LANGUAGE", "french").strip().lower()
+    if not language.isidentifier():
+        raise ValueError("SEARCH_LANGUAGE must be a PostgreSQL text search language, e.g. french")
+    for statement in _search_ddl(language):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_products_search_vector ON products")
+    op.execute("DROP FUNCTION IF EXISTS products_search_vector_update()")
+    op.execute("DROP INDEX IF EXISTS ix_products_search_vector")
+    op.drop_column("products", "search_vector")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS product_search")
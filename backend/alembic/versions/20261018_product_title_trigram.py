@@ -0,0 +1,28 @@
+"""add trigram and prefix indexes on product titles for suggestions
+
+Revision ID: 20261018_product_title_trgm
+Revises: 20261018_product_facets
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+revision = "20261018_product_title_trgm"
+down_revision = "20261018_product_facets"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_products_title_trgm ON products USING GIN (lower(title) gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_products_title_prefix ON products (lower(title) text_pattern_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_products_title_prefix")
+    op.execute("DROP INDEX IF EXISTS ix_products_title_trgm")
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm")
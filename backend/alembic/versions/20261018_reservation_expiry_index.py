@@ -0,0 +1,31 @@
+"""index expiring reservations of pending orders by expiry alone
+
+Revision ID: 20261018_reservation_expiry
+Revises: 20261018_product_files
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+revision = "20261018_reservation_expiry"
+down_revision = "20261018_product_files"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Expired reservations are released across all products, so product_id no longer leads the index
+    op.execute("DROP INDEX IF EXISTS ix_orders_product_reserved_until")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_orders_pending_reserved_until ON orders (stock_reserved_until) "
+        "WHERE status = 'PENDING' AND stock_reserved_until IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_orders_pending_reserved_until")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_orders_product_reserved_until "
+        "ON orders (product_id, stock_reserved_until) WHERE stock_reserved_until IS NOT NULL"
+    )
@@ -0,0 +1,24 @@
+"""add composite index for keyset pagination of reviews
+
+Revision ID: 20261018_review_keyset
+Revises: 20261018_product_popularity
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+revision = "20261018_review_keyset"
+down_revision = "20261018_product_popularity"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_reviews_product_created_at_id ON reviews (product_id, created_at, id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_reviews_product_created_at_id")
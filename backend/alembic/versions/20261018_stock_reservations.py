@@ -0,0 +1,34 @@
+"""track limited stock and time-boxed stock reservations
+
+Revision ID: 20261018_stock_reservations
+Revises: 20261018_rating_histogram
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_stock_reservations"
+down_revision = "20261018_rating_histogram"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "products",
+        sa.Column("stock_limited", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.execute("UPDATE products SET stock_limited = true WHERE stock > 0")
+    op.add_column("orders", sa.Column("stock_reserved_until", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_orders_product_reserved_until "
+        "ON orders (product_id, stock_reserved_until) WHERE stock_reserved_until IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_orders_product_reserved_until")
+    op.drop_column("orders", "stock_reserved_until")
+    op.drop_column("products", "stock_limited")
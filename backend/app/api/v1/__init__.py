@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, users, products, product_engagement, orders, downloads, config, admin
+from app.api.v1 import auth, users, products, product_engagement, orders, downloads, config, admin, uploads
 
 api_router = APIRouter()
 
@@ -11,4 +11,5 @@ api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
 api_router.include_router(downloads.router, prefix="/downloads", tags=["downloads"])
 api_router.include_router(config.router, prefix="/config", tags=["config"])
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(uploads.router, prefix="/admin/uploads", tags=["admin"])
 
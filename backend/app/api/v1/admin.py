@@ -8,6 +8,7 @@ from app.models.product import Product
 from app.models.user import User
 from app.api.dependencies import get_current_admin_user
 from app.models.user import User as UserModel
+from app.core.cache import product_cache
 
 router = APIRouter()
 
@@ -49,11 +50,19 @@ async def get_all_orders(
 ):
     """Get all orders (admin only)."""
     from app.schemas.order import OrderResponse
-    from sqlalchemy.orm import joinedload
+    from sqlalchemy.orm import joinedload, selectinload
+    from app.models.order import OrderItem
     
     orders = db.query(Order).options(
         joinedload(Order.product),
         joinedload(Order.user),
+        selectinload(Order.items).joinedload(OrderItem.product),
     ).offset(skip).limit(limit).all()
     return [OrderResponse.model_validate(o) for o in orders]
 
+@router.get("/cache-stats")
+async def get_cache_stats(
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """In-process cache counters for this worker, used to size PRODUCT_CACHE_* (admin only)."""
+    return {"products": product_cache.stats()}
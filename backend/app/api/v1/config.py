@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
 from app.db.database import get_db
 from app.models.config import SiteConfig
 from app.schemas.config import SiteConfigResponse, SocialLinksUpdate
 from app.api.dependencies import get_current_admin_user
 from app.models.user import User
+from app.core.config import settings
+from app.core.http_cache import conditional_response, make_etag
 
 router = APIRouter()
 
@@ -20,10 +23,16 @@ def get_or_create_config(db: Session) -> SiteConfig:
 
 @router.get("", response_model=SiteConfigResponse)
 async def get_site_config(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """Get site configuration."""
+    """Get site configuration (supports If-None-Match)."""
     config = get_or_create_config(db)
+    etag = make_etag(config.id, config.created_at, config.updated_at)
+    not_modified = conditional_response(request, response, etag, settings.CACHE_CONTROL_SITE_CONFIG)
+    if not_modified is not None:
+        return not_modified
     return SiteConfigResponse.model_validate(config)
 
 @router.put("/social-links", response_model=SiteConfigResponse)
@@ -50,6 +59,9 @@ async def update_social_links(
             config.social_links = {}
         config.social_links["youtube"] = links.youtube
     
+    # In-place JSON edits are invisible to the ORM; flag them so the row (and its
+    # updated_at, which feeds the GET ETag) is actually written.
+    flag_modified(config, "social_links")
     db.commit()
     db.refresh(config)
     return SiteConfigResponse.model_validate(config)
@@ -1,47 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 import os
 from app.db.database import get_db
 from app.models.order import Order, OrderFile
-from app.schemas.download import DownloadFilesResponse, FileResponse as FileResponseSchema
+from app.schemas.download import (
+    DownloadFilesResponse,
+    DownloadLink,
+    DownloadLinksResponse,
+    FileResponse as FileResponseSchema,
+)
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.core.config import settings
+from app.core.byte_ranges import RangeFileResponse
+from app.core.zip_stream import ZipMember, ZipStreamResponse, refresh_crc32, unique_names
+from app.core.signed_urls import InvalidDownloadToken, SignedFile, decode_token, encode_token
 from app.dependencies.locale import get_locale
 from app.i18n import get_translation
 
 router = APIRouter()
 
-@router.get("/{order_id}", response_model=DownloadFilesResponse)
-async def get_download_files(
-    order_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    locale: str = Depends(get_locale),
-):
-    """Get download files for an order."""
+DOWNLOAD_MEDIA_TYPE = "application/pdf"
+# Paid content: browsers may keep it and revalidate by ETag, shared caches must not
+DOWNLOAD_CACHE_CONTROL = "private, no-cache"
+
+
+def _entitled_order(db: Session, order_id: int, current_user: User, locale: str) -> Order:
+    """The order if the caller owns it (or is admin) and it is paid; HTTPException otherwise."""
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=get_translation("errors.order_not_found", lang=locale),
         )
-    
+
     # Check if user owns the order or is admin
     if order.user_id != current_user.id and current_user.role.value != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=get_translation("errors.forbidden_download", lang=locale),
         )
-    
+
     # Check if order is completed
     if order.status.value != "completed":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=get_translation("errors.payment_incomplete", lang=locale),
         )
-    
+    return order
+
+
+def _content_disposition(file_name: str) -> str:
+    quoted = quote(file_name)
+    if quoted != file_name:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{file_name}"'
+
+
+def _file_response(stored_path: str, file_name: str) -> Response:
+    """Send an uploaded file, or with DOWNLOAD_OFFLOAD hand it to the web server in front of us.
+
+    Offloaded responses carry only headers: nginx (X-Accel-Redirect) or Apache/lighttpd
+    (X-Sendfile) send the bytes, including ranges, and the worker is free at once.
+    """
+    headers = {"Cache-Control": DOWNLOAD_CACHE_CONTROL}
+    if settings.DOWNLOAD_OFFLOAD:
+        headers["Content-Disposition"] = _content_disposition(file_name)
+        if settings.DOWNLOAD_OFFLOAD == "x-accel-redirect":
+            headers["X-Accel-Redirect"] = settings.DOWNLOAD_ACCEL_PREFIX.rstrip("/") + "/" + quote(stored_path)
+        else:
+            headers["X-Sendfile"] = os.path.abspath(os.path.join(settings.UPLOAD_DIR, stored_path))
+        return Response(media_type=DOWNLOAD_MEDIA_TYPE, headers=headers)
+    return RangeFileResponse(
+        path=os.path.join(settings.UPLOAD_DIR, stored_path),
+        filename=file_name,
+        media_type=DOWNLOAD_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+@router.get("/{order_id}", response_model=DownloadFilesResponse)
+async def get_download_files(
+    order_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    locale: str = Depends(get_locale),
+):
+    """Get download files for an order."""
+    _entitled_order(db, order_id, current_user, locale)
     files = db.query(OrderFile).filter(OrderFile.order_id == order_id).all()
     return DownloadFilesResponse(
         files=[FileResponseSchema(
@@ -51,57 +102,133 @@ async def get_download_files(
         ) for f in files]
     )
 
-@router.get("/{order_id}/files/{file_id}")
-async def download_file(
+
+@router.post("/{order_id}/links", response_model=DownloadLinksResponse)
+async def create_download_links(
     order_id: int,
-    file_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     locale: str = Depends(get_locale),
 ):
-    """Download a specific file."""
-    order = db.query(Order).filter(Order.id == order_id).first()
-    if not order:
+    """Signed, short-lived URLs for every file of a paid order, checked against the order once.
+
+    The URLs need no Authorization header, so browsers and download managers can fetch and
+    resume them natively until `expires_at`.
+    """
+    _entitled_order(db, order_id, current_user, locale)
+    files = db.query(OrderFile).filter(OrderFile.order_id == order_id).all()
+    expires_at = int(time.time()) + settings.DOWNLOAD_URL_TTL_SECONDS
+    links = []
+    for f in files:
+        token = encode_token(SignedFile(file_id=f.id, path=f.file_path, name=f.file_name, expires_at=expires_at))
+        url = request.url_for("download_signed_file", token=token)
+        links.append(DownloadLink(id=f.id, name=f.file_name, size=f.file_size, url=str(url)))
+    return DownloadLinksResponse(
+        expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+        files=links,
+    )
+
+
+@router.api_route("/signed/{token}", methods=["GET", "HEAD"], name="download_signed_file")
+async def download_signed_file(
+    token: str,
+    locale: str = Depends(get_locale),
+):
+    """Download through a signed link: verified from the token alone, without touching the database."""
+    try:
+        signed = decode_token(token)
+    except InvalidDownloadToken:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=get_translation("errors.order_not_found", lang=locale),
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=get_translation("errors.download_link_invalid", lang=locale),
         )
-    
-    # Check if user owns the order or is admin
-    if order.user_id != current_user.id and current_user.role.value != "admin":
+    if not settings.DOWNLOAD_OFFLOAD and not os.path.isfile(os.path.join(settings.UPLOAD_DIR, signed.path)):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=get_translation("errors.forbidden_download", lang=locale),
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=get_translation("errors.file_not_found_on_server", lang=locale),
         )
-    
-    # Check if order is completed
-    if order.status.value != "completed":
+    return _file_response(signed.path, signed.name)
+
+
+@router.api_route("/{order_id}/bundle", methods=["GET", "HEAD"])
+async def download_bundle(
+    order_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    locale: str = Depends(get_locale),
+):
+    """All files of a paid order as one ZIP, generated while streaming (no temp files).
+
+    Entries are stored uncompressed and their CRCs are cached on OrderFile, so the size is
+    known up front: the response has Content-Length and supports Range to resume.
+    """
+    order = _entitled_order(db, order_id, current_user, locale)
+    files = db.query(OrderFile).filter(OrderFile.order_id == order_id).order_by(OrderFile.id).all()
+    if not files:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=get_translation("errors.payment_incomplete", lang=locale),
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=get_translation("errors.file_not_found", lang=locale),
+        )
+
+    members = []
+    recomputed = False
+    for file_record, name in zip(files, unique_names([f.file_name for f in files])):
+        file_path = os.path.join(settings.UPLOAD_DIR, file_record.file_path)
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=get_translation("errors.file_not_found_on_server", lang=locale),
+            )
+        # Only the first bundle of a file version reads it through; later ones use the cached CRC
+        recomputed |= await anyio.to_thread.run_sync(refresh_crc32, file_record, file_path, stat_result)
+        members.append(
+            ZipMember(
+                name=name,
+                path=file_path,
+                size=stat_result.st_size,
+                crc32=file_record.crc32,
+                mtime=stat_result.st_mtime,
+            )
         )
-    
+    if recomputed:
+        db.commit()
+
+    return ZipStreamResponse(
+        members,
+        filename=f"{order.order_number}.zip",
+        headers={"Cache-Control": DOWNLOAD_CACHE_CONTROL},
+    )
+
+
+@router.api_route("/{order_id}/files/{file_id}", methods=["GET", "HEAD"])
+async def download_file(
+    order_id: int,
+    file_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    locale: str = Depends(get_locale),
+):
+    """Download a specific file. Supports Range/If-Range so interrupted downloads resume; HEAD probes size and validators."""
+    _entitled_order(db, order_id, current_user, locale)
     file_record = db.query(OrderFile).filter(
         OrderFile.id == file_id,
         OrderFile.order_id == order_id
     ).first()
-    
+
     if not file_record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=get_translation("errors.file_not_found", lang=locale),
         )
-    
+
     file_path = os.path.join(settings.UPLOAD_DIR, file_record.file_path)
-    if not os.path.exists(file_path):
+    if not settings.DOWNLOAD_OFFLOAD and not os.path.exists(file_path):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=get_translation("errors.file_not_found_on_server", lang=locale),
         )
-    
-    return FileResponse(
-        path=file_path,
-        filename=file_record.file_name,
-        media_type='application/pdf'
-    )
 
+    return _file_response(file_record.file_path, file_record.file_name)
@@ -1,14 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List
-import uuid
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import Float, Integer, case, column, func, insert, literal, or_, select, update, values
+from typing import Dict, List, Optional
+from datetime import timedelta
 from app.db.database import get_db
-from app.models.order import Order, OrderStatus, PaymentMethod
+from app.models.order import Order, OrderFile, OrderItem, OrderStatus, PaymentMethod
 from app.models.product import Product
+from app.models.product_file import ProductFile
 from app.schemas.order import OrderCreate, OrderResponse, PaymentRequest, PaymentResponse
 from app.api.dependencies import get_current_user, get_current_admin_user
 from app.models.user import User
+from app.core.cache import invalidate_catalog
+from app.core import idempotency
+from app.core.config import settings
+from app.core.order_numbers import next_order_number
+from app.core.ranking import PURCHASE_WEIGHT, popularity_bump
 from app.dependencies.locale import get_locale
+from app.dependencies.idempotency import get_idempotency_key
+from app.dependencies.shaping import get_response_shape
+from app.core.shaping import ResponseShape
 from app.i18n import get_translation
 
 router = APIRouter()
@@ -36,66 +47,299 @@ def resolve_payment_method(payment_data: PaymentRequest) -> PaymentMethod:
         return PaymentMethod.ONLINE
 
 
-def generate_order_number() -> str:
-    """Generate a unique order number."""
-    return f"ORD-{uuid.uuid4().hex[:8].upper()}"
+Lines = Dict[int, int]  # product id -> quantity
+
+
+def _lines_table(lines: Lines):
+    """(product_id, quantity) VALUES list, sorted by product id, usable as UPDATE ... FROM."""
+    return values(
+        column("product_id", Integer), column("quantity", Integer), name="lines"
+    ).data(sorted(lines.items()))
+
+
+def _locked_product_ids(product_ids):
+    """Product rows locked in id order, so concurrent multi-row stock updates cannot deadlock.
+
+    `product_ids` is a list of ids or a select of them.
+    """
+    return (
+        select(Product.id)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update(key_share=True)
+        .cte("locked")
+    )
+
+
+def _release_expired_reservations(db: Session) -> None:
+    """Give back units held by unpaid orders whose reservation expired (one statement)."""
+    released = (
+        update(Order)
+        .where(Order.status == OrderStatus.PENDING, Order.stock_reserved_until < func.now())
+        .values(stock_reserved_until=None)
+        .returning(Order.id)
+        .cte("released")
+    )
+    units = (
+        select(OrderItem.product_id, func.sum(OrderItem.quantity).label("quantity"))
+        .join(released, released.c.id == OrderItem.order_id)
+        .group_by(OrderItem.product_id)
+        .cte("units")
+    )
+    locked = _locked_product_ids(select(units.c.product_id))
+    db.execute(
+        update(Product)
+        .where(
+            Product.id == units.c.product_id,
+            Product.id.in_(select(locked.c.id)),
+            Product.stock_limited.is_(True),
+        )
+        .values(stock=Product.stock + units.c.quantity)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _reserve_units(db: Session, lines: Lines) -> Optional[list]:
+    """Take the limited stock of every line in one UPDATE.
+
+    Returns the changed (id, stock, updated_at) rows, or None when a line is short (the caller rolls back).
+    """
+    table = _lines_table(lines)
+    locked = _locked_product_ids(list(lines))
+    rows = db.execute(
+        update(Product)
+        .where(
+            Product.id == table.c.product_id,
+            Product.id.in_(select(locked.c.id)),
+            Product.stock_limited.is_(True),
+            Product.stock >= table.c.quantity,
+        )
+        .values(stock=Product.stock - table.c.quantity)
+        .returning(Product.id, Product.stock, Product.updated_at)
+        .execution_options(synchronize_session=False)
+    ).all()
+    return rows if len(rows) == len(lines) else None
+
+
+def _record_sales(db: Session, lines: Lines, held: bool) -> Optional[list]:
+    """Count the sale of every line in one conditional UPDATE; None when a product is sold out.
+
+    Without a reservation (`held`), limited stock is taken here: the `stock >= quantity` guard
+    is checked on the locked rows, so concurrent payments can never oversell. The caller rolls
+    back on None. Returns the changed counter columns of each product.
+    """
+    table = _lines_table(lines)
+    locked = _locked_product_ids(list(lines))
+    limited = Product.stock_limited.is_(True)
+    statement = update(Product).where(Product.id == table.c.product_id, Product.id.in_(select(locked.c.id)))
+    changes = {
+        "purchase_count": func.coalesce(Product.purchase_count, 0) + table.c.quantity,
+        "sold": case((limited, func.coalesce(Product.sold, 0) + table.c.quantity), else_=Product.sold),
+        "popularity_score": popularity_bump(Product.popularity_score, PURCHASE_WEIGHT, table.c.quantity),
+    }
+    if not held:
+        statement = statement.where(or_(Product.stock_limited.isnot(True), Product.stock >= table.c.quantity))
+        changes["stock"] = case((limited, Product.stock - table.c.quantity), else_=Product.stock)
+    rows = db.execute(
+        statement.values(changes)
+        .returning(
+            Product.id, Product.stock, Product.sold, Product.purchase_count,
+            Product.popularity_score, Product.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    if len(rows) == len(lines):
+        return rows
+    # Lines whose product was deleted since the order was placed are not a stock problem.
+    existing = db.query(func.count(Product.id)).filter(Product.id.in_(list(lines))).scalar()
+    return rows if len(rows) == existing else None
+
+
+def _sync_products(products: Dict[int, Product], rows: list) -> None:
+    """Copy RETURNING rows onto already loaded products (as loaded state, nothing to flush)."""
+    for row in rows:
+        product = products.get(row.id)
+        if product is not None:
+            for key, value in row._mapping.items():
+                set_committed_value(product, key, value)
+
+
+def order_insert_statement(columns: dict, lines: Lines, prices: Dict[int, float]):
+    """One statement inserting the order and all of its lines; returns the order's id, number and created_at."""
+    new_order = (
+        insert(Order)
+        .values(**columns, order_number=next_order_number())
+        .returning(Order.id, Order.order_number, Order.created_at)
+        .cte("new_order")
+    )
+    table = values(
+        column("product_id", Integer), column("quantity", Integer), column("unit_price", Float), name="lines"
+    ).data([(pid, quantity, prices[pid]) for pid, quantity in lines.items()])
+    new_items = (
+        insert(OrderItem)
+        .from_select(
+            ["order_id", "product_id", "quantity", "unit_price"],
+            select(new_order.c.id, table.c.product_id, table.c.quantity, table.c.unit_price),
+        )
+        .returning(OrderItem.id)
+        .cte("new_items")
+    )
+    return select(new_order.c.id, new_order.c.order_number, new_order.c.created_at).add_cte(new_items)
+
+
+def attach_files_statement(order_id: int, product_ids):
+    """INSERT ... SELECT giving a paid order its own copy of its products' files (one statement)."""
+    columns = ["order_id", "file_name", "file_path", "file_size", "crc32", "crc32_mtime_ns"]
+    return insert(OrderFile).from_select(
+        columns,
+        select(
+            literal(order_id),
+            ProductFile.file_name,
+            ProductFile.file_path,
+            ProductFile.file_size,
+            ProductFile.crc32,
+            ProductFile.crc32_mtime_ns,
+        )
+        .where(ProductFile.product_id.in_(list(product_ids)))
+        .order_by(ProductFile.product_id, ProductFile.id),
+    )
+
+
+def _order_options():
+    return (
+        joinedload(Order.product),
+        joinedload(Order.user),
+        selectinload(Order.items).joinedload(OrderItem.product),
+    )
+
+
+def _begin_idempotent(
+    db: Session,
+    user_id: int,
+    key: Optional[str],
+    fingerprint: str,
+    payload: ResponseShape,
+    locale: str,
+):
+    """Replay for a key already answered (422 when it was used for another request), else None."""
+    if key is None:
+        return None
+    stored = idempotency.claim(db, user_id, key)
+    if stored is None:
+        return None
+    if stored.fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=get_translation("errors.idempotency_key_reused", lang=locale),
+        )
+    db.rollback()
+    return idempotency.replay(stored, payload)
+
+
 
 @router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order_data: OrderCreate,
+    payload: ResponseShape = Depends(get_response_shape),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     locale: str = Depends(get_locale),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key),
 ):
-    """Create a new order."""
-    # Verify product exists
-    product = db.query(Product).filter(Product.id == order_data.product_id).first()
-    if not product:
+    """Create a new order (replayed, not repeated, for a known Idempotency-Key)."""
+    fingerprint = idempotency.request_fingerprint("orders.create", order_data)
+    replayed = _begin_idempotent(db, current_user.id, idempotency_key, fingerprint, payload, locale)
+    if replayed is not None:
+        return replayed
+
+    # Verify products exist (one query for all lines)
+    lines = order_data.quantities()
+    products = {p.id: p for p in db.query(Product).filter(Product.id.in_(list(lines))).all()}
+    if len(products) != len(lines):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=get_translation("errors.product_not_found", lang=locale),
         )
     
-    # Check stock if applicable
-    if product.stock and product.stock <= 0:
+    # Limited stock: hold the units for STOCK_RESERVATION_MINUTES, or just refuse when short
+    # (the units are then taken atomically at payment).
+    limited = {pid: quantity for pid, quantity in lines.items() if products[pid].stock_limited}
+    reserved_until = None
+    if limited and settings.STOCK_RESERVATION_MINUTES > 0:
+        _release_expired_reservations(db)
+        reserved = _reserve_units(db, limited)
+        if reserved is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=get_translation("errors.out_of_stock", lang=locale),
+            )
+        _sync_products(products, reserved)
+        reserved_until = func.now() + timedelta(minutes=settings.STOCK_RESERVATION_MINUTES)
+    elif any((products[pid].stock or 0) < quantity for pid, quantity in limited.items()):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=get_translation("errors.out_of_stock", lang=locale),
         )
     
-    # Create order
-    order_number = generate_order_number()
-    db_order = Order(
-        order_number=order_number,
-        user_id=current_user.id,
-        product_id=order_data.product_id,
-        amount=order_data.amount,
-        status=OrderStatus.PENDING
+    # Single-product checkouts keep their client amount; items[] are priced here.
+    if order_data.items is None:
+        prices = {order_data.product_id: order_data.amount}
+        amount = order_data.amount
+    else:
+        prices = {pid: products[pid].price for pid in lines}
+        amount = sum(prices[pid] * quantity for pid, quantity in lines.items())
+    
+    # Create the order and all of its lines in one statement; the response is built from
+    # what is already in memory plus the RETURNING row.
+    first_product_id = next(iter(lines))
+    created = db.execute(
+        order_insert_statement(
+            {
+                "user_id": current_user.id,
+                "product_id": first_product_id,
+                "amount": amount,
+                "status": OrderStatus.PENDING,
+                "stock_reserved_until": reserved_until,
+            },
+            lines,
+            prices,
+        )
+    ).one()
+    result = OrderResponse.model_validate(
+        {
+            "id": created.id,
+            "order_number": created.order_number,
+            "user_id": current_user.id,
+            "product_id": first_product_id,
+            "product": products[first_product_id],
+            "items": [
+                {"product_id": pid, "quantity": quantity, "unit_price": prices[pid], "product": products[pid]}
+                for pid, quantity in lines.items()
+            ],
+            "user": current_user,
+            "amount": amount,
+            "status": OrderStatus.PENDING.value,
+            "created_at": created.created_at,
+        }
     )
-    db.add(db_order)
+    if idempotency_key is not None:
+        idempotency.store(db, current_user.id, idempotency_key, fingerprint, status.HTTP_201_CREATED, result)
     db.commit()
-    db.refresh(db_order)
-    
-    # Eager load product relationship
-    order = db.query(Order).options(
-        joinedload(Order.product),
-        joinedload(Order.user),
-    ).filter(Order.id == db_order.id).first()
-    
-    return OrderResponse.model_validate(order)
+    if reserved_until is not None:
+        invalidate_catalog(*limited)
+    return payload.render(result, status_code=status.HTTP_201_CREATED) if payload.active else result
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: int,
+    payload: ResponseShape = Depends(get_response_shape),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     locale: str = Depends(get_locale),
 ):
     """Get an order by ID."""
-    order = db.query(Order).options(
-        joinedload(Order.product),
-        joinedload(Order.user),
-    ).filter(Order.id == order_id).first()
+    order = db.query(Order).options(*_order_options()).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -109,30 +353,54 @@ async def get_order(
             detail=get_translation("errors.forbidden_order", lang=locale),
         )
     
-    return OrderResponse.model_validate(order)
+    result = OrderResponse.model_validate(order)
+    return payload.render(result) if payload.active else result
 
 @router.get("/my-orders", response_model=List[OrderResponse])
 async def get_user_orders(
+    payload: ResponseShape = Depends(get_response_shape),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all orders for the current user."""
-    orders = db.query(Order).options(
-        joinedload(Order.product),
-        joinedload(Order.user),
-    ).filter(Order.user_id == current_user.id).all()
-    return [OrderResponse.model_validate(o) for o in orders]
+    orders = db.query(Order).options(*_order_options()).filter(Order.user_id == current_user.id).all()
+    result = [OrderResponse.model_validate(o) for o in orders]
+    return payload.render(result) if payload.active else result
 
 @router.post("/{order_id}/payment", response_model=PaymentResponse)
 async def process_payment(
     order_id: int,
     payment_data: PaymentRequest,
+    payload: ResponseShape = Depends(get_response_shape),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     locale: str = Depends(get_locale),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key),
 ):
-    """Process payment for an order."""
-    order = db.query(Order).filter(Order.id == order_id).first()
+    """Process payment for an order.
+
+    The whole checkout is one transaction: the order row is locked, so a pending order is
+    completed (and counted) exactly once, the products of all its lines are changed by one
+    conditional UPDATE, and their files are copied onto the order for download. A known
+    Idempotency-Key replays the stored response.
+    """
+    fingerprint = idempotency.request_fingerprint(f"orders.payment:{order_id}", payment_data)
+    replayed = _begin_idempotent(db, current_user.id, idempotency_key, fingerprint, payload, locale)
+    if replayed is not None:
+        return replayed
+
+    # Everything the response needs, in one query; only the order row is locked.
+    order = (
+        db.query(Order)
+        .options(
+            joinedload(Order.product),
+            joinedload(Order.user),
+            joinedload(Order.items).joinedload(OrderItem.product),
+        )
+        .filter(Order.id == order_id)
+        .with_for_update(of=Order)
+        .one_or_none()
+    )
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -146,29 +414,34 @@ async def process_payment(
             detail=get_translation("errors.forbidden_payment", lang=locale),
         )
     
-    # Update order status and payment method
-    order.status = OrderStatus.COMPLETED
-    order.payment_method = resolve_payment_method(payment_data)
-    
-    # Update product purchase count
-    product = db.query(Product).filter(Product.id == order.product_id).first()
-    if product:
-        product.purchase_count = (product.purchase_count or 0) + 1
-        if product.stock:
-            product.stock -= 1
-            product.sold = (product.sold or 0) + 1
-    
-    db.commit()
-    
-    # Reload order with product relationship
-    order = db.query(Order).options(
-        joinedload(Order.product),
-        joinedload(Order.user),
-    ).filter(Order.id == order_id).first()
+    # Already paid orders (e.g. a retry without a key) are reported without counting them again.
+    completed = order.status == OrderStatus.PENDING
+    lines = {item.product_id: item.quantity for item in order.items}
+    if completed:
+        held = order.stock_reserved_until is not None
+        sold = _record_sales(db, lines, held)
+        if sold is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=get_translation("errors.out_of_stock", lang=locale),
+            )
+        _sync_products({item.product_id: item.product for item in order.items}, sold)
+        order.status = OrderStatus.COMPLETED
+        order.payment_method = resolve_payment_method(payment_data)
+        order.stock_reserved_until = None
+        db.flush()  # UPDATE ... RETURNING updated_at
+        db.execute(attach_files_statement(order.id, lines))
     
-    return PaymentResponse(
+    result = PaymentResponse(
         success=True,
         message=get_translation("success.payment_processed", lang=locale),
         order=OrderResponse.model_validate(order)
     )
+    if idempotency_key is not None:
+        idempotency.store(db, current_user.id, idempotency_key, fingerprint, status.HTTP_200_OK, result)
+    db.commit()
+    if completed:
+        invalidate_catalog(*lines)
+    return payload.render(result) if payload.active else result
 
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional, Tuple
 
 from app.db.database import get_db
 from app.models.product import Product
@@ -11,6 +12,16 @@ from app.models.product_like import ProductLike
 from app.models.user import User, UserRole
 from app.api.dependencies import get_current_user
 from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse
+from app.core.cache import product_cache
+from app.core.pagination import (
+    InvalidCursor,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    keyset_order_by,
+)
+from app.core.ranking import LIKE_WEIGHT, popularity_bump, popularity_drop
 from app.dependencies.locale import get_locale
 from app.i18n import get_translation
 
@@ -27,12 +38,52 @@ def _product_or_404(db: Session, product_id: int, locale: str) -> Product:
     return product
 
 
-def _review_to_response(review: Review) -> ReviewResponse:
+# Review listing order; served by ix_reviews_product_created_at_id
+_REVIEW_KEYS = [(Review.created_at, True), (Review.id, True)]
+
+
+def _review_rows():
+    """Projection of exactly the ReviewResponse fields (author name only, never the full User row)."""
+    return select(
+        Review.id,
+        Review.product_id,
+        Review.user_id,
+        User.name.label("user_name"),
+        Review.body,
+        Review.rating,
+        Review.created_at,
+        Review.updated_at,
+    ).join(User, User.id == Review.user_id)
+
+
+def _invalidate_reviews(product_id: int) -> None:
+    """Drop the product's cached first review pages and its detail (review_count)."""
+    product_cache.invalidate_where(lambda key: key[0] == "reviews" and key[1] == product_id)
+    product_cache.invalidate(("detail", product_id))
+
+
+def _locked_review(db: Session, product_id: int, review_id: int, locale: str) -> Review:
+    """The review, row-locked until commit so concurrent edits and deletes compute counter deltas one at a time."""
+    review = (
+        db.query(Review)
+        .filter(Review.id == review_id, Review.product_id == product_id)
+        .with_for_update()
+        .first()
+    )
+    if not review:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=get_translation("errors.review_not_found", lang=locale),
+        )
+    return review
+
+
+def _review_to_response(review: Review, author: User) -> ReviewResponse:
     return ReviewResponse(
         id=review.id,
         product_id=review.product_id,
         user_id=review.user_id,
-        user_name=review.user.name,
+        user_name=author.name,
         body=review.body,
         rating=review.rating,
         created_at=review.created_at,
@@ -40,29 +91,175 @@ def _review_to_response(review: Review) -> ReviewResponse:
     )
 
 
-def _like_count(db: Session, product_id: int) -> int:
-    return db.query(func.count(ProductLike.id)).filter(ProductLike.product_id == product_id).scalar() or 0
+def _counters_update(**deltas: int):
+    """UPDATE applying `column=delta` to engagement counters (filter it to the product), or None when nothing changes."""
+    values = {name: getattr(Product, name) + delta for name, delta in deltas.items() if delta}
+    if not values:
+        return None
+    # Counters are not catalog content: keep updated_at (and the listing ETags built from it) unchanged.
+    return update(Product).values(**values, updated_at=Product.updated_at)
+
+
+def _bump_counters(db: Session, product_id: int, **deltas: int) -> None:
+    """Apply `column=delta` to the product's engagement counters inside the caller's transaction.
+
+    The single UPDATE takes the row lock, so concurrent writers serialize instead of losing increments.
+    """
+    statement = _counters_update(**deltas)
+    if statement is not None:
+        db.execute(
+            statement.where(Product.id == product_id).execution_options(synchronize_session=False)
+        )
+
+
+def _rating_deltas(old: Optional[int], new: Optional[int]) -> dict:
+    deltas = {
+        "rating_sum": (new or 0) - (old or 0),
+        "rating_count": (new is not None) - (old is not None),
+    }
+    # Histogram buckets; an unchanged rating nets out to zero and is skipped by _bump_counters.
+    for rating, delta in ((old, -1), (new, 1)):
+        if rating is not None:
+            deltas[f"rating_{rating}"] = deltas.get(f"rating_{rating}", 0) + delta
+    return deltas
+
+
+def like_statement(product_id: int, user_id: int, liked: bool):
+    """One idempotent statement that sets the like state and returns (like_count, changed).
+
+    INSERT ... ON CONFLICT DO NOTHING RETURNING (or DELETE ... RETURNING) feeds a counter
+    UPDATE in the same statement, so only a real state change moves like_count. like_count is
+    NULL when the product does not exist.
+    """
+    if liked:
+        changed = (
+            pg_insert(ProductLike)
+            .from_select(
+                ["product_id", "user_id"],
+                select(literal(product_id), literal(user_id)).where(exists().where(Product.id == product_id)),
+            )
+            .on_conflict_do_nothing(constraint="uq_product_like_user_product")
+            .returning(ProductLike.product_id)
+            .cte("changed")
+        )
+        values = {
+            "like_count": Product.like_count + 1,
+            "popularity_score": popularity_bump(Product.popularity_score, LIKE_WEIGHT),
+        }
+    else:
+        changed = (
+            delete(ProductLike)
+            .where(ProductLike.product_id == product_id, ProductLike.user_id == user_id)
+            .returning(ProductLike.product_id, ProductLike.created_at)
+            .cte("changed")
+        )
+        # Withdraw the like's own (decayed) contribution: like/unlike cycles must not pile up score.
+        values = {
+            "like_count": Product.like_count - 1,
+            "popularity_score": popularity_drop(
+                Product.popularity_score, LIKE_WEIGHT, select(changed.c.created_at).scalar_subquery()
+            ),
+        }
+    counted = (
+        update(Product)
+        .where(Product.id.in_(select(changed.c.product_id)))
+        # Counters are not catalog content: keep updated_at unchanged.
+        .values(**values, updated_at=Product.updated_at)
+        .returning(Product.like_count)
+        .cte("counted")
+    )
+    return select(
+        func.coalesce(
+            select(counted.c.like_count).scalar_subquery(),
+            select(Product.like_count).where(Product.id == product_id).scalar_subquery(),
+        ),
+        exists(select(counted.c.like_count)),
+    )
+
+
+def _set_like(db: Session, product_id: int, user_id: int, liked: bool) -> Tuple[Optional[int], bool]:
+    like_count, changed = db.execute(like_statement(product_id, user_id, liked)).one()
+    return like_count, changed
+
+
+def review_insert_statement(product_id: int, user_id: int, body: str, rating: Optional[int]):
+    """One statement that inserts the review and bumps the product's counters, returning the new row.
+
+    No row comes back when the user already reviewed the product (ON CONFLICT DO NOTHING); a
+    missing product fails the foreign key.
+    """
+    inserted = (
+        pg_insert(Review)
+        .values(product_id=product_id, user_id=user_id, body=body, rating=rating)
+        .on_conflict_do_nothing(constraint="uq_review_user_product")
+        .returning(Review.id, Review.created_at, Review.updated_at)
+        .cte("inserted")
+    )
+    counted = (
+        _counters_update(review_count=1, **_rating_deltas(None, rating))
+        .where(Product.id == product_id, exists(select(inserted.c.id)))
+        .returning(Product.id)
+        .cte("counted")
+    )
+    return select(inserted).add_cte(counted)
+
+
+def _like_response(db: Session, product_id: int, user: User, liked: bool, locale: str) -> dict:
+    like_count, changed = _set_like(db, product_id, user.id, liked)
+    if like_count is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=get_translation("errors.product_not_found", lang=locale),
+        )
+    db.commit()
+    if changed:
+        product_cache.invalidate(("detail", product_id))
+    return {"liked": liked, "like_count": like_count}
 
 
 @router.get("/{product_id}/reviews", response_model=List[ReviewResponse])
 async def list_reviews(
     product_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor value from the previous page"),
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale),
 ):
-    _product_or_404(db, product_id, locale)
-    reviews = (
-        db.query(Review)
-        .options(joinedload(Review.user))
-        .filter(Review.product_id == product_id)
-        .order_by(Review.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return [_review_to_response(r) for r in reviews]
+    """Newest reviews first; full pages return X-Next-Cursor (`skip` still works)."""
+    first_page = not cursor and not skip
+    cache_key = ("reviews", product_id, limit)
+    page = product_cache.get(cache_key) if first_page else None
+    if page is None:
+        query = _review_rows().where(Review.product_id == product_id)
+        if cursor:
+            try:
+                values = decode_cursor(cursor, "reviews", len(_REVIEW_KEYS))
+            except InvalidCursor:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=get_translation("errors.invalid_cursor", lang=locale),
+                )
+            query = query.where(keyset_condition(_REVIEW_KEYS, values))
+        elif skip:
+            query = query.offset(skip)
+        rows = db.execute(query.order_by(*keyset_order_by(_REVIEW_KEYS)).limit(limit)).all()
+        if not rows and first_page:
+            # Only an empty first page needs to tell "no reviews yet" from "no such product".
+            _product_or_404(db, product_id, locale)
+        items = [ReviewResponse.model_validate(row) for row in rows]
+        next_cursor = (
+            encode_cursor("reviews", [rows[-1].created_at, rows[-1].id]) if len(rows) == limit else None
+        )
+        page = (items, next_cursor)
+        if first_page:
+            product_cache.set(cache_key, page)
+
+    items, next_cursor = page
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.post(
@@ -77,25 +274,32 @@ async def create_review(
     current_user: User = Depends(get_current_user),
     locale: str = Depends(get_locale),
 ):
-    _product_or_404(db, product_id, locale)
-    review = Review(
-        product_id=product_id,
-        user_id=current_user.id,
-        body=data.body,
-        rating=data.rating,
-    )
-    db.add(review)
     try:
-        db.commit()
+        row = db.execute(review_insert_statement(product_id, current_user.id, data.body, data.rating)).first()
     except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=get_translation("errors.product_not_found", lang=locale),
+        )
+    if row is None:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=get_translation("errors.review_exists", lang=locale),
         )
-    db.refresh(review)
-    review = db.query(Review).options(joinedload(Review.user)).filter(Review.id == review.id).first()
-    return _review_to_response(review)
+    db.commit()
+    _invalidate_reviews(product_id)
+    return ReviewResponse(
+        id=row.id,
+        product_id=product_id,
+        user_id=current_user.id,
+        user_name=current_user.name,
+        body=data.body,
+        rating=data.rating,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
 
 
 @router.patch("/{product_id}/reviews/{review_id}", response_model=ReviewResponse)
@@ -108,17 +312,7 @@ async def update_review(
     locale: str = Depends(get_locale),
 ):
     _product_or_404(db, product_id, locale)
-    review = (
-        db.query(Review)
-        .options(joinedload(Review.user))
-        .filter(Review.id == review_id, Review.product_id == product_id)
-        .first()
-    )
-    if not review:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=get_translation("errors.review_not_found", lang=locale),
-        )
+    review = _locked_review(db, product_id, review_id, locale)
     if review.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -131,11 +325,15 @@ async def update_review(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=get_translation("errors.review_no_updates", lang=locale),
         )
+    old_rating = review.rating
     for key, value in patch.items():
         setattr(review, key, value)
+    _bump_counters(db, product_id, **_rating_deltas(old_rating, review.rating))
+    db.flush()  # UPDATE ... RETURNING updated_at (eager_defaults): no reload after commit
+    result = _review_to_response(review, current_user)
     db.commit()
-    db.refresh(review)
-    return _review_to_response(review)
+    _invalidate_reviews(product_id)
+    return result
 
 
 @router.delete("/{product_id}/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -147,19 +345,23 @@ async def delete_review(
     locale: str = Depends(get_locale),
 ):
     _product_or_404(db, product_id, locale)
-    review = db.query(Review).filter(Review.id == review_id, Review.product_id == product_id).first()
-    if not review:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=get_translation("errors.review_not_found", lang=locale),
-        )
+    review = _locked_review(db, product_id, review_id, locale)
     if review.user_id != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=get_translation("errors.review_delete_forbidden", lang=locale),
         )
-    db.delete(review)
+    # The deltas come from the row actually deleted: a delete that lost a race removes nothing and moves no counter.
+    deleted = db.execute(
+        delete(Review)
+        .where(Review.id == review_id)
+        .returning(Review.rating)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if deleted is not None:
+        _bump_counters(db, product_id, review_count=-1, **_rating_deltas(deleted.rating, None))
     db.commit()
+    _invalidate_reviews(product_id)
     return None
 
 
@@ -170,21 +372,7 @@ async def like_product(
     current_user: User = Depends(get_current_user),
     locale: str = Depends(get_locale),
 ):
-    _product_or_404(db, product_id, locale)
-    existing = (
-        db.query(ProductLike)
-        .filter(ProductLike.product_id == product_id, ProductLike.user_id == current_user.id)
-        .first()
-    )
-    if existing:
-        return {"liked": True, "like_count": _like_count(db, product_id)}
-    like = ProductLike(product_id=product_id, user_id=current_user.id)
-    db.add(like)
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-    return {"liked": True, "like_count": _like_count(db, product_id)}
+    return _like_response(db, product_id, current_user, True, locale)
 
 
 @router.delete("/{product_id}/like", status_code=status.HTTP_200_OK)
@@ -194,10 +382,5 @@ async def unlike_product(
     current_user: User = Depends(get_current_user),
     locale: str = Depends(get_locale),
 ):
-    _product_or_404(db, product_id, locale)
-    db.query(ProductLike).filter(
-        ProductLike.product_id == product_id,
-        ProductLike.user_id == current_user.id,
-    ).delete()
-    db.commit()
-    return {"liked": False, "like_count": _like_count(db, product_id)}
+    return _like_response(db, product_id, current_user, False, locale)
+
@@ -1,80 +1,627 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
-from app.db.database import get_db
+from sqlalchemy import and_, any_, bindparam, exists, false, func, literal, select, text, true, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import Integer
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.sql.elements import ColumnElement
+from typing import Dict, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass
+import io
+import json
+import anyio
+import tempfile
+from app.db.database import get_db, SessionLocal
 from app.models.product import Product
-from app.models.review import Review
 from app.models.product_like import ProductLike
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
     ProductDetailResponse,
+    ProductImportReport,
+    ProductFacetsResponse,
+    ProductSuggestion,
+    ProductSort,
+    ProductBatchRequest,
+    ProductBatchResponse,
+    MAX_BATCH_IDS,
+    FacetCount,
     product_payload_to_orm_dict,
 )
 from app.api.dependencies import get_current_admin_user, get_optional_current_user
 from app.models.user import User
+from app.core.search import normalize_suggest_query, product_search, suggest_statement
+from app.core.cache import product_cache, invalidate_catalog
+from app.core.config import settings
+from app.core.http_cache import conditional_response, make_etag
+from app.core.catalog_io import export_products, import_products, iter_records
+from app.core.pagination import (
+    InvalidCursor,
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    TOTAL_EXACT_HEADER,
+    capped_count,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    keyset_order_by,
+)
 from app.dependencies.locale import get_locale
+from app.dependencies.shaping import get_response_shape
+from app.core.shaping import ResponseShape
 from app.i18n import get_translation
 
 router = APIRouter()
 
-@router.get("", response_model=List[ProductResponse])
+# Bulk import bodies are spooled to disk past this size instead of being held in memory.
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+_IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+# Search totals are exact up to this many matches, then reported as a lower bound.
+SEARCH_COUNT_CAP = 1000
+SEARCH_STREAM_BATCH_SIZE = 500
+
+_QUERY_CANCELED = "57014"  # PostgreSQL SQLSTATE raised when statement_timeout fires
+
+# Listing sort orders: (expression, descending) keys, unique last key (see app.core.pagination)
+_SORTS = {
+    ProductSort.NEWEST: [(Product.created_at, True), (Product.id, True)],
+    ProductSort.POPULAR: [(Product.popularity_score, True), (Product.id, True)],
+    ProductSort.TOP_RATED: [(Product.average_rating, True), (Product.rating_count, True), (Product.id, True)],
+    ProductSort.PRICE_ASC: [(Product.price, False), (Product.id, False)],
+    ProductSort.PRICE_DESC: [(Product.price, True), (Product.id, True)],
+}
+
+
+def _apply_search(query, q: str):
+    """Full-text filter (GIN-indexed tsvector); returns the query and its relevance sort keys."""
+    match = product_search(q)
+    if match is None:
+        return query.filter(false()), [(Product.id, True)]
+    condition, rank = match
+    return query.filter(condition), [(rank, True), (Product.id, True)]
+
+
+def _page(query, sort: str, keys, cursor: Optional[str], skip: int, limit: int, locale: str):
+    """Fetch one page by keyset (`cursor`) or legacy offset (`skip`); returns (products, next cursor)."""
+    if cursor:
+        try:
+            values = decode_cursor(cursor, sort, len(keys))
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=get_translation("errors.invalid_cursor", lang=locale),
+            )
+        query = query.filter(keyset_condition(keys, values))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = (
+        query.add_columns(*(expr for expr, _ in keys))
+        .order_by(*keyset_order_by(keys))
+        .limit(limit)
+        .all()
+    )
+    next_cursor = encode_cursor(sort, list(rows[-1][1:])) if len(rows) == limit else None
+    return [row[0] for row in rows], next_cursor
+
+
+@dataclass(frozen=True)
+class CatalogFilters:
+    """Listing filters shared by GET /products and /products/facets (hashable: part of cache keys)."""
+
+    featured: Optional[bool] = None
+    categories: Tuple[str, ...] = ()
+    formats: Tuple[str, ...] = ()
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    bestseller: Optional[bool] = None
+    on_offer: Optional[bool] = None
+
+    def category_condition(self) -> ColumnElement:
+        return Product.category.in_(self.categories) if self.categories else true()
+
+    def format_condition(self) -> ColumnElement:
+        return Product.content_format.in_(self.formats) if self.formats else true()
+
+    def common_conditions(self) -> List[ColumnElement]:
+        """Every filter except the category/format facets."""
+        conditions = []
+        if self.featured is not None:
+            conditions.append(Product.featured == self.featured)
+        if self.min_price is not None:
+            conditions.append(Product.price >= self.min_price)
+        if self.max_price is not None:
+            conditions.append(Product.price <= self.max_price)
+        if self.bestseller is not None:
+            # NULL (legacy rows) counts as "not a bestseller"
+            conditions.append(Product.bestseller.is_(True) if self.bestseller else Product.bestseller.isnot(True))
+        if self.on_offer is not None:
+            conditions.append(_on_offer() if self.on_offer else ~_on_offer())
+        return conditions
+
+    def apply(self, query):
+        conditions = self.common_conditions()
+        if self.categories:
+            conditions.append(self.category_condition())
+        if self.formats:
+            conditions.append(self.format_condition())
+        return query.filter(*conditions) if conditions else query
+
+
+def _on_offer() -> ColumnElement:
+    return and_(Product.offer_end_date.isnot(None), Product.offer_end_date > func.now())
+
+
+def catalog_filters(
+    featured: Optional[bool] = Query(None),
+    category: Optional[List[str]] = Query(None, description="Repeat to match any of several categories"),
+    format: Optional[List[str]] = Query(None, description="Repeat to match any of several formats"),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    bestseller: Optional[bool] = Query(None),
+    on_offer: Optional[bool] = Query(None, description="Offer end date still in the future"),
+) -> CatalogFilters:
+    return CatalogFilters(
+        featured=featured,
+        categories=tuple(sorted(set(category or ()))),
+        formats=tuple(sorted(set(format or ()))),
+        min_price=min_price,
+        max_price=max_price,
+        bestseller=bestseller,
+        on_offer=on_offer,
+    )
+
+
+def _parse_include(include: Optional[str]) -> Set[str]:
+    return {part.strip().lower() for part in (include or "").split(",") if part.strip()}
+
+
+# Denormalized counter columns behind the ProductDetailResponse stats (see _stats)
+_STATS_COLUMNS = (
+    Product.like_count,
+    Product.review_count,
+    Product.rating_sum,
+    Product.rating_count,
+    Product.rating_1,
+    Product.rating_2,
+    Product.rating_3,
+    Product.rating_4,
+    Product.rating_5,
+)
+
+
+def _stats(like_count: int, review_count: int, rating_sum: int, rating_count: int, *histogram: int) -> dict:
+    """Engagement and rating fields of ProductDetailResponse, from the _STATS_COLUMNS values."""
+    return {
+        "like_count": like_count,
+        "review_count": review_count,
+        "average_rating": round(rating_sum / rating_count, 2) if rating_count else 0.0,
+        "rating_count": rating_count,
+        "rating_histogram": dict(zip(range(1, 6), histogram)),
+    }
+
+
+def _detail_entry(product: Product) -> tuple:
+    """Cached ("detail", id) value: the product and its stats (liked_by_me is per viewer, never cached)."""
+    return ProductResponse.model_validate(product), _stats(*(getattr(product, c.key) for c in _STATS_COLUMNS))
+
+
+def _engagement(db: Session, product_ids: List[int], viewer: Optional[User]) -> Dict[int, dict]:
+    """Stats plus liked_by_me (None without a viewer) for a whole page in one query (denormalized counters)."""
+    if not product_ids:
+        return {}
+    if viewer is None:
+        liked = literal(None)
+    else:
+        liked = exists().where(ProductLike.product_id == Product.id, ProductLike.user_id == viewer.id)
+    rows = (
+        db.query(Product.id, *_STATS_COLUMNS, liked)
+        .filter(Product.id.in_(product_ids))
+        .all()
+    )
+    return {row[0]: {**_stats(*row[1:-1]), "liked_by_me": row[-1]} for row in rows}
+
+
+@router.get("", response_model=List[Union[ProductDetailResponse, ProductResponse]])
 async def get_products(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor value from the previous page"),
     search: Optional[str] = Query(None),
-    featured: Optional[bool] = Query(None),
-    db: Session = Depends(get_db)
+    sort: Optional[ProductSort] = Query(None, description="Defaults to newest, or relevance when searching"),
+    filters: CatalogFilters = Depends(catalog_filters),
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated extras: engagement (like/review counts, liked_by_me), "
+        "ratings (average_rating, rating_count, rating_histogram)",
+    ),
+    payload: ResponseShape = Depends(get_response_shape),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    locale: str = Depends(get_locale),
 ):
-    """Get all products with optional filtering."""
-    query = db.query(Product)
-    
-    if search:
-        query = query.filter(
-            Product.title.ilike(f"%{search}%") |
-            Product.description.ilike(f"%{search}%")
-        )
-    
-    if featured is not None:
-        query = query.filter(Product.featured == featured)
-    
-    products = query.offset(skip).limit(limit).all()
-    return [ProductResponse.model_validate(p) for p in products]
+    """Get all products with optional filtering, in `sort` order (newest first, or by relevance when searching).
+
+    Supports If-None-Match: the ETag covers the ids and update stamps of the rows on the page
+    (plus the stats values when include=engagement or include=ratings).
+    """
+    cache_key = ("list", search, sort, filters, cursor, skip, limit)
+    page = product_cache.get(cache_key)
+    if page is None:
+        query = db.query(Product)
+        order = sort or ProductSort.NEWEST
+        keys = _SORTS[order]
+        
+        if search:
+            query, relevance = _apply_search(query, search)
+            if sort is None:
+                order, keys = "relevance", relevance
+        
+        query = filters.apply(query)
+        products, next_cursor = _page(query, order, keys, cursor, skip, limit, locale)
+        etag = make_etag(cache_key, next_cursor, [(p.id, p.created_at, p.updated_at) for p in products])
+        page = ([ProductResponse.model_validate(p) for p in products], next_cursor, etag)
+        product_cache.set(cache_key, page)
+
+    items, next_cursor, etag = page
+    cache_control, vary = settings.CACHE_CONTROL_PRODUCT_LIST, None
+    engagement = None
+    extras = _parse_include(include)
+    if extras & {"engagement", "ratings"}:
+        viewer = current_user if "engagement" in extras else None
+        engagement = _engagement(db, [item.id for item in items], viewer)
+        etag = make_etag(etag, sorted(engagement.items()))
+        if "engagement" in extras:
+            cache_control, vary = settings.CACHE_CONTROL_PRODUCT_DETAIL, "Authorization"
+    if payload.active:
+        etag = make_etag(etag, payload)
+
+    not_modified = conditional_response(request, response, etag, cache_control, vary=vary)
+    if not_modified is not None:
+        return not_modified
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if engagement is None:
+        return payload.render(items, response) if payload.active else items
+    # A product deleted since the page was cached has no stats row; it keeps the zero defaults.
+    decorated = [ProductDetailResponse(**item.model_dump(), **engagement.get(item.id, {})) for item in items]
+    return payload.render(decorated, response) if payload.active else decorated
 
 @router.get("/search", response_model=List[ProductResponse])
 async def search_products(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor value from the previous page"),
+    stream: bool = Query(False, description="Stream every match as NDJSON, one product per line (ignores limit/cursor)"),
+    payload: ResponseShape = Depends(get_response_shape),
+    db: Session = Depends(get_db),
+    locale: str = Depends(get_locale),
+):
+    """Full-text search, most relevant first, one page at a time.
+
+    Pages carry X-Next-Cursor and an X-Total-Count estimate (exact up to SEARCH_COUNT_CAP,
+    see X-Total-Count-Exact). stream=true returns every match as NDJSON with constant memory.
+    """
+    if stream:
+        return StreamingResponse(_stream_search(q, payload), media_type="application/x-ndjson")
+
+    cache_key = ("search", q, cursor, limit)
+    page = product_cache.get(cache_key)
+    if page is None:
+        query, keys = _apply_search(db.query(Product), q)
+        products, next_cursor = _page(query, "relevance", keys, cursor, 0, limit, locale)
+        total, exact = capped_count(query, SEARCH_COUNT_CAP)
+        page = ([ProductResponse.model_validate(p) for p in products], next_cursor, total, exact)
+        product_cache.set(cache_key, page)
+
+    items, next_cursor, total, exact = page
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    response.headers[TOTAL_EXACT_HEADER] = "true" if exact else "false"
+    return payload.render(items, response) if payload.active else items
+
+
+def _ndjson_lines(products, payload: ResponseShape):
+    """One JSON document per product, each terminated by a newline."""
+    for product in products:
+        item = ProductResponse.model_validate(product)
+        if payload.active:
+            yield json.dumps(payload.apply(jsonable_encoder(item)), ensure_ascii=False) + "\n"
+        else:
+            yield item.model_dump_json(by_alias=True) + "\n"
+
+
+def _stream_search(q: str, payload: ResponseShape):
+    """Every match as NDJSON, serialized row by row from a server-side cursor."""
+    db = SessionLocal()
+    try:
+        query, keys = _apply_search(db.query(Product), q)
+        yield from _ndjson_lines(query.order_by(*keyset_order_by(keys)).yield_per(SEARCH_STREAM_BATCH_SIZE), payload)
+    finally:
+        db.close()
+
+
+@router.get("/suggest", response_model=List[ProductSuggestion])
+async def suggest_products(
+    response: Response,
     q: str = Query(..., min_length=1),
-    db: Session = Depends(get_db)
+    limit: int = Query(8, ge=1, le=20),
+    db: Session = Depends(get_db),
 ):
-    """Search products by query."""
-    products = db.query(Product).filter(
-        Product.title.ilike(f"%{q}%") |
-        Product.description.ilike(f"%{q}%")
-    ).all()
-    return [ProductResponse.model_validate(p) for p in products]
+    """Search-as-you-type title completions: small payload, trigram index, hard statement timeout."""
+    normalized = normalize_suggest_query(q)
+    response.headers["Cache-Control"] = settings.CACHE_CONTROL_PRODUCT_SUGGEST
+    if not normalized:
+        return []
+    cache_key = ("suggest", normalized, limit)
+    items = product_cache.get(cache_key)
+    if items is not None:
+        return items
+
+    # SET LOCAL only lasts for this request's transaction.
+    db.execute(text(f"SET LOCAL statement_timeout = {int(settings.SUGGEST_TIMEOUT_MS)}"))
+    try:
+        rows = db.execute(suggest_statement(normalized, limit)).all()
+    except DBAPIError as exc:
+        if getattr(exc.orig, "pgcode", None) != _QUERY_CANCELED:
+            raise
+        db.rollback()
+        # Over budget: an empty answer beats a late one for a keystroke the user has already typed past.
+        response.headers["Cache-Control"] = "no-store"
+        return []
+    items = [ProductSuggestion(id=row.id, title=row.title) for row in rows]
+    product_cache.set(cache_key, items)
+    return items
+
+
+def _facets_statement(filters: CatalogFilters, search: Optional[str]):
+    """One row per category, per format and a grand total (GROUPING SETS), each with disjunctive counts."""
+    conditions = filters.common_conditions()
+    if search:
+        match = product_search(search)
+        conditions.append(match[0] if match else false())
+    in_category = filters.category_condition()
+    in_format = filters.format_condition()
+    selected = and_(in_category, in_format)
+    return (
+        select(
+            Product.category,
+            Product.content_format,
+            func.grouping(Product.category, Product.content_format),
+            func.count().filter(in_format),
+            func.count().filter(in_category),
+            func.count().filter(selected),
+            func.count().filter(and_(selected, Product.bestseller.is_(True))),
+            func.count().filter(and_(selected, _on_offer())),
+            func.min(Product.price).filter(selected),
+            func.max(Product.price).filter(selected),
+        )
+        .where(*conditions)
+        .group_by(func.grouping_sets(tuple_(Product.category), tuple_(Product.content_format), tuple_()))
+    )
+
+
+@router.get("/facets", response_model=ProductFacetsResponse)
+async def get_product_facets(
+    search: Optional[str] = Query(None),
+    filters: CatalogFilters = Depends(catalog_filters),
+    db: Session = Depends(get_db),
+):
+    """Facet counts for the current filters, computed in one GROUPING SETS query.
+
+    Category counts ignore the category filter and format counts ignore the format filter,
+    so the UI can show how many products each alternative value would add.
+    """
+    cache_key = ("facets", search, filters)
+    facets = product_cache.get(cache_key)
+    if facets is not None:
+        return facets
+
+    rows = db.execute(_facets_statement(filters, search)).all()
+
+    facets = ProductFacetsResponse()
+    for category, content_format, grouping, by_category, by_format, total, bestseller, on_offer, low, high in rows:
+        if grouping == 1 and category is not None and by_category:
+            facets.categories.append(FacetCount(value=category, count=by_category))
+        elif grouping == 2 and content_format is not None and by_format:
+            facets.formats.append(FacetCount(value=content_format, count=by_format))
+        elif grouping == 3:
+            facets.total, facets.bestseller, facets.on_offer = total, bestseller, on_offer
+            facets.min_price, facets.max_price = low, high
+    facets.categories.sort(key=lambda facet: (-facet.count, facet.value))
+    facets.formats.sort(key=lambda facet: (-facet.count, facet.value))
+    product_cache.set(cache_key, facets)
+    return facets
+
+
+@router.post("/import", response_model=ProductImportReport)
+async def import_catalog(
+    request: Request,
+    file_format: Optional[str] = Query(
+        None, alias="format", pattern="^(csv|ndjson)$", description="Defaults from Content-Type"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+    locale: str = Depends(get_locale),
+):
+    """Bulk-create products from a streamed CSV or NDJSON body (admin only).
+
+    Rows are validated with ProductCreate and inserted in committed batches; invalid rows are
+    reported by line number without stopping the load.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    file_format = file_format or _IMPORT_CONTENT_TYPES.get(content_type)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=get_translation("errors.import_format_unsupported", lang=locale),
+        )
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        lines = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            # Blocking DB work with many commits: keep it off the event loop
+            report = await anyio.to_thread.run_sync(import_products, db, iter_records(lines, file_format))
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=get_translation("errors.import_encoding", lang=locale),
+            )
+        finally:
+            # Batches commit as they go, so even an aborted load may have changed the catalog.
+            invalidate_catalog()
+    return report
+
+@router.get("/export")
+async def export_catalog(
+    file_format: str = Query("ndjson", alias="format", pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Stream the whole catalog as CSV or NDJSON through a server-side cursor (admin only)."""
+
+    def stream():
+        db = SessionLocal()
+        try:
+            yield from export_products(db, file_format)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/csv" if file_format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="products.{file_format}"'},
+    )
+
+def _batch(db: Session, ids: List[int], viewer: Optional[User]) -> ProductBatchResponse:
+    """Resolve ids from the detail cache, then one = ANY(...) query for the rest (plus one for likes)."""
+    ids = list(dict.fromkeys(ids))
+    found = {}
+    for product_id in ids:
+        cached = product_cache.get(("detail", product_id))
+        if cached is not None:
+            found[product_id] = cached
+    uncached = [product_id for product_id in ids if product_id not in found]
+    if uncached:
+        for product in db.query(Product).filter(Product.id == any_(_id_array(uncached))):
+            cached = _detail_entry(product)
+            product_cache.set(("detail", product.id), cached)
+            found[product.id] = cached
+
+    liked: Set[int] = set()
+    if viewer is not None and found:
+        liked = {
+            row[0]
+            for row in db.query(ProductLike.product_id).filter(
+                ProductLike.user_id == viewer.id,
+                ProductLike.product_id == any_(_id_array(list(found))),
+            )
+        }
+    items = []
+    for product_id in ids:
+        if product_id not in found:
+            continue
+        base, stats = found[product_id]
+        items.append(
+            ProductDetailResponse(
+                **base.model_dump(),
+                **stats,
+                liked_by_me=None if viewer is None else product_id in liked,
+            )
+        )
+    return ProductBatchResponse(items=items, missing=[product_id for product_id in ids if product_id not in found])
+
+
+def _render_batch(payload: ResponseShape, result: ProductBatchResponse) -> JSONResponse:
+    """Shape each product in `items` (`fields` names product fields, not the wrapper); `missing` stays as is."""
+    return JSONResponse({"items": payload.apply(jsonable_encoder(result.items)), "missing": result.missing})
+
+
+def _id_array(ids: List[int]):
+    """A single array parameter, so the statement text does not grow with the id count."""
+    return bindparam("ids", ids, type_=ARRAY(Integer))
+
+
+def _parse_ids(raw: str, locale: str) -> List[int]:
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        ids = []
+    if not 1 <= len(ids) <= MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=get_translation("errors.invalid_product_ids", lang=locale, max=MAX_BATCH_IDS),
+        )
+    return ids
+
+
+@router.get("/batch", response_model=ProductBatchResponse)
+async def get_products_batch(
+    ids: str = Query(..., description=f"Comma-separated product ids (at most {MAX_BATCH_IDS})"),
+    payload: ResponseShape = Depends(get_response_shape),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    locale: str = Depends(get_locale),
+):
+    """Several products in one round trip (cart, wishlist), in request order; unknown ids are listed in `missing`."""
+    result = _batch(db, _parse_ids(ids, locale), current_user)
+    return _render_batch(payload, result) if payload.active else result
+
+
+@router.post("/batch", response_model=ProductBatchResponse)
+async def post_products_batch(
+    body: ProductBatchRequest,
+    payload: ResponseShape = Depends(get_response_shape),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+):
+    """Same as GET /batch for id lists too long for a URL."""
+    result = _batch(db, body.ids, current_user)
+    return _render_batch(payload, result) if payload.active else result
+
 
 @router.get("/{product_id}", response_model=ProductDetailResponse)
 async def get_product(
     product_id: int,
+    request: Request,
+    response: Response,
+    payload: ResponseShape = Depends(get_response_shape),
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_current_user),
     locale: str = Depends(get_locale),
 ):
-    """Get a product by ID (includes like/review counts; optional Bearer sets liked_by_me)."""
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=get_translation("errors.product_not_found", lang=locale),
-        )
-    like_count = (
-        db.query(func.count(ProductLike.id)).filter(ProductLike.product_id == product_id).scalar() or 0
-    )
-    review_count = (
-        db.query(func.count(Review.id)).filter(Review.product_id == product_id).scalar() or 0
-    )
+    """Get a product by ID (includes denormalized like/review counts and rating summary; optional Bearer sets liked_by_me).
+
+    Supports If-None-Match; a matching ETag answers 304 without building the response body.
+    """
+    cached = product_cache.get(("detail", product_id))
+    if cached is None:
+        product = db.query(Product).filter(Product.id == product_id).first()
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=get_translation("errors.product_not_found", lang=locale),
+            )
+        cached = _detail_entry(product)
+        product_cache.set(("detail", product_id), cached)
+    base, stats = cached
     liked_by_me: Optional[bool] = None
     if current_user is not None:
         liked_by_me = (
@@ -86,13 +633,14 @@ async def get_product(
             .first()
             is not None
         )
-    base = ProductResponse.model_validate(product).model_dump()
-    return ProductDetailResponse(
-        **base,
-        like_count=like_count,
-        review_count=review_count,
-        liked_by_me=liked_by_me,
+    etag = make_etag(base.id, base.created_at, base.updated_at, stats, liked_by_me, payload)
+    not_modified = conditional_response(
+        request, response, etag, settings.CACHE_CONTROL_PRODUCT_DETAIL, vary="Authorization"
     )
+    if not_modified is not None:
+        return not_modified
+    detail = ProductDetailResponse(**base.model_dump(), **stats, liked_by_me=liked_by_me)
+    return payload.render(detail, response) if payload.active else detail
 
 @router.post("", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 async def create_product(
@@ -101,11 +649,15 @@ async def create_product(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Create a new product (admin only)."""
-    db_product = Product(**product_payload_to_orm_dict(product_data.model_dump()))
+    # updated_at is set explicitly: left unset, the flush would expire it (onupdate column)
+    # and building the response would reload the row.
+    db_product = Product(**product_payload_to_orm_dict(product_data.model_dump(), creating=True), updated_at=None)
     db.add(db_product)
+    db.flush()  # INSERT ... RETURNING id and server defaults
+    result = ProductResponse.model_validate(db_product)
     db.commit()
-    db.refresh(db_product)
-    return ProductResponse.model_validate(db_product)
+    invalidate_catalog()
+    return result
 
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(
@@ -115,22 +667,29 @@ async def update_product(
     current_user: User = Depends(get_current_admin_user),
     locale: str = Depends(get_locale),
 ):
-    """Update a product (admin only)."""
-    product = db.query(Product).filter(Product.id == product_id).first()
+    """Update a product (admin only): one UPDATE ... RETURNING, no read before or after."""
+    update_data = product_data.model_dump(exclude_unset=True)
+    update_data = product_payload_to_orm_dict(update_data)
+    if update_data:
+        product = db.scalars(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(**update_data)
+            .returning(Product)
+            .execution_options(synchronize_session=False)
+        ).first()
+    else:
+        product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=get_translation("errors.product_not_found", lang=locale),
         )
     
-    update_data = product_data.model_dump(exclude_unset=True)
-    update_data = product_payload_to_orm_dict(update_data)
-    for field, value in update_data.items():
-        setattr(product, field, value)
-    
+    result = ProductResponse.model_validate(product)
     db.commit()
-    db.refresh(product)
-    return ProductResponse.model_validate(product)
+    invalidate_catalog(product_id)
+    return result
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
@@ -149,5 +708,6 @@ async def delete_product(
     
     db.delete(product)
     db.commit()
+    invalidate_catalog(product_id)
     return None
 
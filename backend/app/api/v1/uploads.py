@@ -0,0 +1,160 @@
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_current_admin_user
+from app.core import uploads
+from app.core.config import settings
+from app.db.database import get_db
+from app.dependencies.locale import get_locale
+from app.i18n import get_translation
+from app.models.product import Product
+from app.models.product_file import ProductFile
+from app.models.user import User
+from app.schemas.upload import ProductFileResponse, UploadCreate, UploadPartReceipt, UploadStatus
+
+router = APIRouter()
+
+SHA256_HEADER = "X-Content-SHA256"
+
+_ERRORS = {
+    uploads.UploadNotFound: (status.HTTP_404_NOT_FOUND, "errors.upload_not_found"),
+    uploads.InvalidPart: (status.HTTP_400_BAD_REQUEST, "errors.upload_part_invalid"),
+    uploads.PartTooLarge: (status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "errors.file_too_large"),
+    uploads.ChecksumMismatch: (status.HTTP_400_BAD_REQUEST, "errors.upload_checksum_mismatch"),
+    uploads.IncompleteUpload: (status.HTTP_409_CONFLICT, "errors.upload_incomplete"),
+}
+
+
+def _upload_error(exc: Exception, locale: str) -> HTTPException:
+    status_code, key = _ERRORS[type(exc)]
+    return HTTPException(status_code=status_code, detail=get_translation(key, lang=locale))
+
+
+async def _status(upload: uploads.Upload) -> UploadStatus:
+    received = await anyio.to_thread.run_sync(uploads.stored_parts, upload)
+    return UploadStatus(
+        id=upload.id,
+        product_id=upload.product_id,
+        file_name=upload.file_name,
+        size=upload.size,
+        part_size=upload.part_size,
+        part_count=upload.part_count,
+        received_parts=list(received),
+    )
+
+
+@router.post("", response_model=UploadStatus, status_code=status.HTTP_201_CREATED)
+async def create_upload(
+    upload_data: UploadCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+    locale: str = Depends(get_locale),
+):
+    """Start a chunked upload of a product file (admin only).
+
+    Send the parts it lists with PUT .../parts/{n} (1-based, `part_size` bytes each, the last
+    one shorter) in any order, in parallel if you like, then POST .../complete.
+    """
+    if db.get(Product, upload_data.product_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=get_translation("errors.product_not_found", lang=locale),
+        )
+    if upload_data.size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=get_translation("errors.file_too_large", lang=locale),
+        )
+    upload = await anyio.to_thread.run_sync(
+        uploads.create_upload, upload_data.product_id, upload_data.file_name, upload_data.size, upload_data.sha256
+    )
+    return await _status(upload)
+
+
+@router.get("/{upload_id}", response_model=UploadStatus)
+async def get_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_admin_user),
+    locale: str = Depends(get_locale),
+):
+    """Parts received so far: resume an interrupted upload by sending only the missing ones."""
+    try:
+        upload = await anyio.to_thread.run_sync(uploads.load_upload, upload_id)
+        return await _status(upload)
+    except uploads.UploadNotFound as exc:
+        raise _upload_error(exc, locale)
+
+
+@router.put("/{upload_id}/parts/{part_number}", response_model=UploadPartReceipt)
+async def upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    content_sha256: Optional[str] = Header(None, alias=SHA256_HEADER),
+    current_user: User = Depends(get_current_admin_user),
+    locale: str = Depends(get_locale),
+):
+    """Store one part from the raw request body, streamed to disk (admin only).
+
+    Sending a part again replaces it. With an X-Content-SHA256 header a corrupted part is
+    rejected, so only that part has to be retried.
+    """
+    try:
+        upload = await anyio.to_thread.run_sync(uploads.load_upload, upload_id)
+        _, length = upload.part_bounds(part_number)
+        declared = request.headers.get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) != length:
+            # Refuse before reading a byte of the wrong-sized body
+            if int(declared) > length:
+                raise uploads.PartTooLarge(part_number)
+            raise uploads.InvalidPart(part_number)
+        receipt = await uploads.write_part(upload, part_number, request.stream(), content_sha256)
+    except tuple(_ERRORS) as exc:
+        raise _upload_error(exc, locale)
+    return UploadPartReceipt(part_number=part_number, size=receipt["size"], sha256=receipt["sha256"])
+
+
+@router.post("/{upload_id}/complete", response_model=ProductFileResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+    locale: str = Depends(get_locale),
+):
+    """Verify the upload and move it into place atomically; the product then ships the file with every paid order."""
+    try:
+        upload = await anyio.to_thread.run_sync(uploads.load_upload, upload_id)
+        stored = await anyio.to_thread.run_sync(uploads.finish_upload, upload)
+    except tuple(_ERRORS) as exc:
+        raise _upload_error(exc, locale)
+    product_file = ProductFile(
+        product_id=upload.product_id,
+        file_name=upload.file_name,
+        file_path=stored.path,
+        file_size=stored.size,
+        sha256=stored.sha256,
+        crc32=stored.crc32,
+        crc32_mtime_ns=stored.mtime_ns,
+    )
+    db.add(product_file)
+    db.flush()  # INSERT ... RETURNING id, created_at
+    response = ProductFileResponse.model_validate(product_file)
+    db.commit()
+    return response
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_admin_user),
+    locale: str = Depends(get_locale),
+):
+    """Abandon an upload and delete what was received (admin only)."""
+    try:
+        await anyio.to_thread.run_sync(uploads.abort_upload, upload_id)
+    except uploads.UploadNotFound as exc:
+        raise _upload_error(exc, locale)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
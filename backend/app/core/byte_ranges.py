@@ -0,0 +1,232 @@
+"""Resumable file downloads: Range/If-Range (RFC 9110 §14), 206 and multipart/byteranges.
+
+Starlette's FileResponse always sends the whole file, so a connection dropped at 90% of a
+large purchase restarts from byte zero. RangeFileResponse serves `Range: bytes=...` with
+206 Partial Content (one range) or multipart/byteranges (several), answers 416 when no range
+overlaps the file, and sends strong ETag/Last-Modified validators so clients can resume with
+If-Range and revalidate with If-None-Match/If-Modified-Since (304).
+
+File bytes go out through the ASGI `http.response.zerocopy` extension (os.sendfile) when the
+server advertises it; otherwise they are read in large chunks off the event loop.
+"""
+import os
+import re
+import secrets
+import stat
+from abc import ABC, abstractmethod
+from email.utils import formatdate, parsedate_to_datetime
+from typing import List, Optional, Tuple
+
+import anyio
+from fastapi import Request
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.http_cache import etag_matches, make_etag
+
+ByteRange = Tuple[int, int]  # first and last byte offsets, inclusive
+MAX_RANGES = 16  # more pieces than this (after merging) is not a resume: send the whole file
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+CHUNK_SIZE = 256 * 1024
+
+_RANGE_SPEC = re.compile(r"(\d*)-(\d*)", re.ASCII)
+# Headers a 304 repeats from the 200 it stands for
+_NOT_MODIFIED_HEADERS = {"etag", "last-modified", "cache-control", "vary", "accept-ranges"}
+
+
+class RangeNotSatisfiable(ValueError):
+    """A well-formed Range header none of whose ranges overlaps the file."""
+
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[List[ByteRange]]:
+    """Satisfiable ranges of a Range header, in file order with overlapping/adjacent ones merged.
+
+    None means the header must be ignored and the whole file sent: absent, another unit,
+    malformed, or more than MAX_RANGES pieces. Raises RangeNotSatisfiable when it is valid
+    but no range overlaps a file of `size` bytes.
+    """
+    if not header:
+        return None
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes" or not specs.strip():
+        return None
+    ranges = []
+    for spec in filter(None, (spec.strip() for spec in specs.split(","))):
+        match = _RANGE_SPEC.fullmatch(spec)
+        if not match or match.group(1) == match.group(2) == "":
+            return None
+        first, last = match.groups()
+        if not first:  # suffix: the final N bytes
+            if int(last) > 0 and size > 0:
+                ranges.append((max(size - int(last), 0), size - 1))
+            continue
+        if last and int(last) < int(first):
+            return None
+        if int(first) < size:
+            ranges.append((int(first), min(int(last), size - 1) if last else size - 1))
+    if not ranges:
+        raise RangeNotSatisfiable(header)
+
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged if len(merged) <= MAX_RANGES else None
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """Strong ETag of a file version: changes whenever the file is replaced or rewritten."""
+    return make_etag(stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+
+
+def _http_date(header: str) -> Optional[int]:
+    """Unix time of an HTTP-date header value; None when it is not a date."""
+    try:
+        return int(parsedate_to_datetime(header).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+async def send_file_bytes(scope: Scope, send: Send, file, offset: int, count: int) -> None:
+    """Send `count` bytes of an open anyio file from `offset`, zero-copy when the server supports it."""
+    if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+        await send({"type": ZEROCOPY_EXTENSION, "file": file.wrapped, "offset": offset, "count": count, "more_body": True})
+        return
+    await file.seek(offset)
+    while count:
+        chunk = await file.read(min(CHUNK_SIZE, count))
+        if not chunk:
+            raise RuntimeError(f"File {file.wrapped.name} shrank while being sent.")
+        count -= len(chunk)
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+
+class RangeMixin(ABC):
+    """Range and conditional-request handling for a body of `content_size` bytes addressable by offset.
+
+    Subclasses set the etag, last-modified, accept-ranges and content-length headers plus
+    `content_size`/`content_mtime`, implement send_span() and call send_ranged() from __call__.
+    """
+
+    content_size: int
+    content_mtime: float
+
+    def _not_modified(self, request: Request) -> bool:
+        etag = self.headers["etag"]
+        if "if-none-match" in request.headers:
+            return etag_matches(request, etag)
+        since = _http_date(request.headers.get("if-modified-since", ""))
+        return since is not None and int(self.content_mtime) <= since
+
+    def _if_range_holds(self, request: Request) -> bool:
+        """If-Range: resume only if the client's partial copy is of this exact version."""
+        validator = request.headers.get("if-range", "").strip()
+        if not validator:
+            return True
+        if validator.startswith('"'):
+            return validator == self.headers["etag"]  # strong comparison; weak tags never match
+        if validator.startswith("W/"):
+            return False
+        return _http_date(validator) == int(self.content_mtime)
+
+    def _plan(self, request: Request) -> Tuple[List[Tuple[bytes, int, int]], bytes]:
+        """Set status and headers for the request; returns the body as (prefix, first, last) pieces and a trailer."""
+        size = self.content_size
+        whole = ([(b"", 0, size - 1)] if size else []), b""
+        if not self._if_range_holds(request):
+            return whole
+        try:
+            ranges = parse_range_header(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            self.status_code = 416
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            return [], b""
+        if ranges is None:
+            return whole
+
+        self.status_code = 206
+        if len(ranges) == 1:
+            ((first, last),) = ranges
+            self.headers["content-range"] = f"bytes {first}-{last}/{size}"
+            self.headers["content-length"] = str(last - first + 1)
+            return [(b"", first, last)], b""
+
+        boundary = secrets.token_hex(16)
+        part_type = self.headers.get("content-type", self.media_type)
+        pieces = []
+        for first, last in ranges:
+            # Every part after the first starts with the CRLF that ends the previous part's data
+            delimiter = f"--{boundary}" if not pieces else f"\r\n--{boundary}"
+            part_headers = f"Content-Type: {part_type}\r\nContent-Range: bytes {first}-{last}/{size}\r\n\r\n"
+            pieces.append((f"{delimiter}\r\n{part_headers}".encode("latin-1"), first, last))
+        trailer = f"\r\n--{boundary}--\r\n".encode("latin-1")
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(
+            sum(len(prefix) + last - first + 1 for prefix, first, last in pieces) + len(trailer)
+        )
+        return pieces, trailer
+
+    @abstractmethod
+    async def send_span(self, scope: Scope, send: Send, first: int, last: int) -> None:
+        """Send body bytes first..last (inclusive) as http.response.body messages with more_body=True."""
+
+    async def send_ranged(self, scope: Scope, send: Send) -> None:
+        request = Request(scope)
+        header_only = getattr(self, "send_header_only", False) or scope.get("method") == "HEAD"
+
+        if self._not_modified(request):
+            self.status_code = 304
+            headers = [(k, v) for k, v in self.raw_headers if k.decode("latin-1") in _NOT_MODIFIED_HEADERS]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        pieces, trailer = self._plan(request)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not header_only:
+            for prefix, first, last in pieces:
+                if prefix:
+                    await send({"type": "http.response.body", "body": prefix, "more_body": True})
+                await self.send_span(scope, send, first, last)
+        await send({"type": "http.response.body", "body": b"" if header_only else trailer, "more_body": False})
+
+
+class RangeFileResponse(RangeMixin, FileResponse):
+    """FileResponse with byte ranges, conditional requests and zero-copy sending.
+
+    The request's Range, If-Range, If-None-Match and If-Modified-Since headers are read from
+    the ASGI scope, so endpoints construct it exactly like FileResponse. HEAD requests get the
+    headers of the matching GET without a body.
+    """
+
+    def set_stat_headers(self, stat_result: os.stat_result) -> None:
+        self.content_size, self.content_mtime = stat_result.st_size, stat_result.st_mtime
+        self.headers.setdefault("content-length", str(stat_result.st_size))
+        self.headers.setdefault("last-modified", formatdate(stat_result.st_mtime, usegmt=True))
+        self.headers.setdefault("etag", file_etag(stat_result))
+        self.headers.setdefault("accept-ranges", "bytes")
+
+    async def _stat(self) -> os.stat_result:
+        if self.stat_result is None:
+            try:
+                stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            if not stat.S_ISREG(stat_result.st_mode):
+                raise RuntimeError(f"File at path {self.path} is not a file.")
+            self.stat_result = stat_result
+            self.set_stat_headers(stat_result)
+        return self.stat_result
+
+    async def send_span(self, scope: Scope, send: Send, first: int, last: int) -> None:
+        await send_file_bytes(scope, send, self._file, first, last - first + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self._stat()
+        async with await anyio.open_file(self.path, mode="rb") as self._file:
+            await self.send_ranged(scope, send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,154 @@
+"""Bulk product catalog import/export (CSV or NDJSON), shared by the admin API and scripts/catalog_io.py."""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.schemas.product import (
+    ProductCreate,
+    ProductImportError,
+    ProductImportReport,
+    product_payload_to_orm_dict,
+)
+
+FORMATS = ("csv", "ndjson")
+IMPORT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# Import columns (ProductCreate fields) followed by read-only columns that exports add.
+IMPORT_COLUMNS = list(ProductCreate.model_fields)
+EXPORT_COLUMNS = ["id"] + IMPORT_COLUMNS + ["sold", "purchase_count", "created_at", "updated_at"]
+
+Record = Union[Dict[str, Any], str]  # parsed row, or a parse error message
+
+
+def iter_csv_records(lines: Iterable[str]) -> Iterator[Tuple[int, Record]]:
+    """(row number, record) per CSV data row; empty cells are dropped so schema defaults apply."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, "more cells than header columns"
+            continue
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def iter_ndjson_records(lines: Iterable[str]) -> Iterator[Tuple[int, Record]]:
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_num, f"invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_num, "expected a JSON object"
+            continue
+        yield line_num, record
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Record]]:
+    return iter_csv_records(lines) if fmt == "csv" else iter_ndjson_records(lines)
+
+
+def validate_record(record: Record) -> Tuple[Optional[dict], List[str]]:
+    """Product constructor kwargs for a valid record, else (None, error messages)."""
+    if isinstance(record, str):
+        return None, [record]
+    try:
+        product = ProductCreate.model_validate(record)
+    except ValidationError as exc:
+        return None, [
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in exc.errors()
+        ]
+    return product_payload_to_orm_dict(product.model_dump(), creating=True), []
+
+
+def _insert_batch(db: Session, batch: List[Tuple[int, dict]], report: ProductImportReport) -> None:
+    """executemany the batch (batched multi-row INSERTs); on a DB error retry row by row to isolate it."""
+    try:
+        db.execute(insert(Product), [values for _, values in batch])
+        db.commit()
+        report.inserted += len(batch)
+        return
+    except SQLAlchemyError:
+        db.rollback()
+    for row, values in batch:
+        try:
+            db.execute(insert(Product), [values])
+            db.commit()
+            report.inserted += 1
+        except SQLAlchemyError as exc:
+            db.rollback()
+            _record_error(report, row, [str(getattr(exc, "orig", exc)).strip()])
+
+
+def _record_error(report: ProductImportReport, row: int, messages: List[str]) -> None:
+    report.failed += 1
+    if len(report.errors) < MAX_REPORTED_ERRORS:
+        report.errors.append(ProductImportError(row=row, errors=messages))
+    else:
+        report.errors_truncated = True
+
+
+def import_products(
+    db: Session,
+    records: Iterable[Tuple[int, Record]],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ProductImportReport:
+    """Validate each record with ProductCreate and insert valid ones in committed batches.
+
+    Invalid rows are reported (up to MAX_REPORTED_ERRORS) and never block the rest of the load.
+    """
+    report = ProductImportReport()
+    batch: List[Tuple[int, dict]] = []
+    for row, record in records:
+        values, errors = validate_record(record)
+        if errors:
+            _record_error(report, row, errors)
+            continue
+        batch.append((row, values))
+        if len(batch) >= batch_size:
+            _insert_batch(db, batch, report)
+            batch = []
+    if batch:
+        _insert_batch(db, batch, report)
+    return report
+
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def export_products(db: Session, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Stream the catalog as CSV or NDJSON chunks through a server-side cursor (constant memory)."""
+    columns = [Product.content_format if name == "format" else getattr(Product, name) for name in EXPORT_COLUMNS]
+    result = db.execute(
+        select(*columns).order_by(Product.id).execution_options(yield_per=batch_size)
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(EXPORT_COLUMNS)
+    for partition in result.partitions():
+        for row in partition:
+            values = [_export_value(value) for value in row]
+            if writer is not None:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False))
+                buffer.write("\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is not None and buffer.tell():
+        yield buffer.getvalue()
@@ -26,6 +26,33 @@ class Settings(BaseSettings):
     VERIFICATION_RESEND_COOLDOWN_SECONDS: int = 60
     # smtp: send via SMTP (set SMTP_USERNAME / SMTP_PASSWORD). console: log link only (local dev).
     VERIFICATION_EMAIL_MODE: str = "smtp"
+    # PostgreSQL text search language used to stem product titles/descriptions (french, english, spanish, simple...)
+    SEARCH_LANGUAGE: str = "french"
+    # Per-worker product catalog cache (0 disables); TTL bounds staleness across workers
+    PRODUCT_CACHE_MAX_ENTRIES: int = 1024
+    PRODUCT_CACHE_TTL_SECONDS: int = 60
+    # Cache-Control sent with ETag-validated responses (no-cache = store, but revalidate with If-None-Match)
+    CACHE_CONTROL_PRODUCT_LIST: str = "public, no-cache"
+    CACHE_CONTROL_PRODUCT_DETAIL: str = "private, no-cache"
+    CACHE_CONTROL_SITE_CONFIG: str = "public, max-age=60, must-revalidate"
+    CACHE_CONTROL_PRODUCT_SUGGEST: str = "public, max-age=30"
+    # Latency budget for /products/suggest; slower queries are cancelled and return no suggestions
+    SUGGEST_TIMEOUT_MS: int = 150
+    # ?sort=popular: a purchase or like counts half as much after this many days
+    POPULARITY_HALF_LIFE_DAYS: float = 14.0
+    # Minutes a new order holds its items' quantities of limited stock; 0 takes the units only at payment
+    STOCK_RESERVATION_MINUTES: int = 0
+    # How long a stored Idempotency-Key response is replayed
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    # Lifetime of signed download links (POST /api/downloads/{order_id}/links)
+    DOWNLOAD_URL_TTL_SECONDS: int = 900
+    # Who sends file bytes: "" = this app, "x-accel-redirect" = nginx, "x-sendfile" = Apache/lighttpd
+    DOWNLOAD_OFFLOAD: str = ""
+    # nginx `internal` location that aliases UPLOAD_DIR (used with DOWNLOAD_OFFLOAD=x-accel-redirect)
+    DOWNLOAD_ACCEL_PREFIX: str = "/protected-uploads/"
+    # Chunked admin uploads (/api/admin/uploads): bytes per part, and when unfinished uploads are purged
+    UPLOAD_PART_SIZE: int = 8 * 1024 * 1024
+    UPLOAD_SESSION_TTL_HOURS: int = 24
 
     model_config = SettingsConfigDict(
         env_file=_BACKEND_DIR / ".env",
@@ -52,7 +79,23 @@ class Settings(BaseSettings):
                 "(SQLite is not supported.)"
             )
         return v.strip()
+
+    @field_validator("SEARCH_LANGUAGE")
+    @classmethod
+    def search_language_is_identifier(cls, v: str) -> str:
+        v = v.strip().lower()
+        if not v.isidentifier():
+            raise ValueError("SEARCH_LANGUAGE must be a PostgreSQL text search language, e.g. french")
+        return v
     
+    @field_validator("DOWNLOAD_OFFLOAD")
+    @classmethod
+    def download_offload_is_known(cls, v: str) -> str:
+        v = v.strip().lower()
+        if v not in ("", "x-accel-redirect", "x-sendfile"):
+            raise ValueError('DOWNLOAD_OFFLOAD must be empty, "x-accel-redirect" or "x-sendfile"')
+        return v
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS_ORIGINS into a list."""
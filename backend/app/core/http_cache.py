@@ -0,0 +1,43 @@
+"""Conditional GET helpers: strong ETags, If-None-Match matching and 304 responses."""
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from version inputs (ids, updated_at stamps, counters), never from the rendered body."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check; uses weak comparison as RFC 9110 requires for this header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def cache_headers(etag: str, cache_control: str, vary: Optional[str] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    return headers
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str,
+    vary: Optional[str] = None,
+) -> Optional[Response]:
+    """304 when the client already holds `etag`; otherwise adds the validators to `response` and returns None."""
+    headers = cache_headers(etag, cache_control, vary)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
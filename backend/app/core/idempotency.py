@@ -0,0 +1,88 @@
+"""Idempotency-Key support for retried POSTs (order creation and payment).
+
+A request carrying `Idempotency-Key` first takes a transaction-scoped advisory lock on
+(user, key), so concurrent duplicates queue behind the first one instead of racing each
+other. The successful response is stored in the same transaction as the order changes it
+describes; until IDEMPOTENCY_KEY_TTL_HOURS later, requests with the key get that response
+back (`Idempotent-Replayed: true`) without touching the order tables. Errors are not stored:
+the transaction rolled back, so a retry simply runs again.
+"""
+import hashlib
+import json
+import zlib
+from datetime import timedelta
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.shaping import ResponseShape
+from app.models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(scope: str, body: Any) -> str:
+    """sha256 of the endpoint scope and the JSON request body."""
+    data = json.dumps([scope, jsonable_encoder(body)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def encode_body(content: Any) -> bytes:
+    return zlib.compress(json.dumps(jsonable_encoder(content), separators=(",", ":")).encode())
+
+
+def decode_body(data: bytes) -> Any:
+    return json.loads(zlib.decompress(data))
+
+
+def claim(db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    """Serialize requests sharing (user, key) until commit; the stored response if one is still live."""
+    db.execute(select(func.pg_advisory_xact_lock(user_id, func.hashtext(key))))
+    return db.execute(
+        select(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > func.now(),
+        )
+    ).scalar_one_or_none()
+
+
+def store_statement(user_id: int, key: str, fingerprint: str, status_code: int, content: Any) -> Insert:
+    """INSERT of the response, replacing an expired entry for the same key."""
+    values = {
+        "fingerprint": fingerprint,
+        "status_code": status_code,
+        "body": encode_body(content),
+        "created_at": func.now(),
+        "expires_at": func.now() + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+    }
+    return (
+        insert(IdempotencyKey)
+        .values(user_id=user_id, key=key, **values)
+        .on_conflict_do_update(index_elements=["user_id", "key"], set_=values)
+    )
+
+
+def store(db: Session, user_id: int, key: str, fingerprint: str, status_code: int, content: Any) -> None:
+    """Record the response in the caller's transaction."""
+    db.execute(store_statement(user_id, key, fingerprint, status_code, content))
+
+
+def replay(stored: IdempotencyKey, payload: ResponseShape) -> JSONResponse:
+    return JSONResponse(
+        payload.apply(decode_body(stored.body)),
+        status_code=stored.status_code,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def purge_expired(db: Session) -> int:
+    """Delete expired entries; returns how many were removed."""
+    return db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= func.now())).rowcount
@@ -0,0 +1,95 @@
+"""Opaque keyset (cursor) pagination.
+
+A sort order is a list of (expression, descending) keys whose last key is unique
+(usually the primary key). A cursor records the sort name and the key values of the
+last row served; the next page is everything strictly after that row.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Sequence, Tuple
+
+from sqlalchemy import and_, func, literal, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+SortKeys = Sequence[Tuple[ColumnElement, bool]]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_EXACT_HEADER = "X-Total-Count-Exact"
+
+
+class InvalidCursor(ValueError):
+    """Cursor is malformed, tampered with, or belongs to a different sort order."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        try:
+            return datetime.fromisoformat(value["dt"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise InvalidCursor("bad datetime in cursor") from exc
+    return value
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Opaque, URL-safe cursor for the row whose sort key values are `values`."""
+    payload = json.dumps({"s": sort, "k": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> List[Any]:
+    """Key values stored in `cursor`; raises InvalidCursor unless it was issued for `sort`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursor("cursor is not valid base64 JSON") from exc
+    if not isinstance(payload, dict) or payload.get("s") != sort:
+        raise InvalidCursor("cursor was issued for a different sort order")
+    values = payload.get("k")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("cursor has the wrong number of keys")
+    return [_decode_value(v) for v in values]
+
+
+def keyset_order_by(keys: SortKeys) -> List[ColumnElement]:
+    return [expr.desc() if descending else expr.asc() for expr, descending in keys]
+
+
+def keyset_condition(keys: SortKeys, values: Sequence[Any]) -> ColumnElement:
+    """Rows strictly after `values` in the order given by `keys`.
+
+    Uniform directions compile to a row comparison, (a, b) < (:a, :b), which PostgreSQL
+    answers with a single range scan on a matching composite index.
+    """
+    directions = {descending for _, descending in keys}
+    if len(directions) == 1:
+        row = tuple_(*(expr for expr, _ in keys))
+        bound = tuple_(*values)
+        return row < bound if directions.pop() else row > bound
+
+    clauses = []
+    for i, (expr, descending) in enumerate(keys):
+        equal_prefix = [k == v for (k, _), v in zip(keys[:i], values[:i])]
+        after = expr < values[i] if descending else expr > values[i]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+def capped_count(query, cap: int) -> Tuple[int, bool]:
+    """(row count, exact) for an ORM query, counting at most `cap` + 1 rows.
+
+    Past the cap the count stops and is reported as the inexact lower bound `cap`, so a
+    broad filter never costs a full scan just to print a total.
+    """
+    bounded = query.with_entities(literal(1)).order_by(None).limit(cap + 1).subquery()
+    count = query.session.query(func.count()).select_from(bounded).scalar()
+    return min(count, cap), count <= cap
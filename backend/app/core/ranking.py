@@ -0,0 +1,88 @@
+"""Time-decayed popularity score behind ?sort=popular.
+
+Every completed purchase and every like is an event of weight w at time t (an order
+line of n copies weighs n·w); an unlike withdraws its like's event again, so toggling a like
+never accumulates score. A product's score is ln(Σ w · 2^((t - EPOCH) / half-life)),
+stored in the log domain: recording an event is a single log-add-exp on the row (no
+rescans), newer events outweigh older ones by the half-life, and scores of different
+products stay comparable without periodic decay jobs.
+A score of 0 means no activity (one event of weight 1 at EPOCH).
+"""
+import math
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import func, literal
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+PURCHASE_WEIGHT = 3.0
+LIKE_WEIGHT = 1.0
+
+
+def decay_rate() -> float:
+    """Log-score gained per second of recency (ln 2 per half-life)."""
+    return math.log(2) / (settings.POPULARITY_HALF_LIFE_DAYS * 86400)
+
+
+def log_add_exp(a: ColumnElement, b: ColumnElement) -> ColumnElement:
+    """ln(e^a + e^b) without overflow."""
+    return func.greatest(a, b) + func.ln(1 + func.exp(-func.abs(a - b)))
+
+
+def event_score(
+    weight: float, quantity: Optional[ColumnElement] = None, at: Optional[ColumnElement] = None
+) -> ColumnElement:
+    """Log-domain contribution of an event of `weight` (times `quantity`) at `at` (default: now, database clock)."""
+    elapsed = func.extract("epoch", func.now() if at is None else at) - EPOCH.timestamp()
+    score = literal(math.log(weight)) + elapsed * decay_rate()
+    return score if quantity is None else score + func.ln(quantity)
+
+
+def popularity_bump(score: ColumnElement, weight: float, quantity: Optional[ColumnElement] = None) -> ColumnElement:
+    """New value for a popularity_score column after one event of `weight` (`quantity` of them)."""
+    return log_add_exp(score, event_score(weight, quantity))
+
+
+def popularity_drop(score: ColumnElement, weight: float, at: ColumnElement) -> ColumnElement:
+    """New value for a popularity_score column after withdrawing an event of `weight` recorded at `at`.
+
+    ln(e^score - e^event), floored at 0 (no activity) where rounding leaves nothing to subtract.
+    """
+    remaining = 1 - func.exp(func.least(event_score(weight, at=at) - score, 0))
+    return func.greatest(score + func.ln(func.greatest(remaining, 1e-300)), 0)
+
+
+def popularity_rebuild_sql() -> str:
+    """UPDATE recomputing every popularity_score from completed orders and likes (log-sum-exp)."""
+    epoch, rate = EPOCH.timestamp(), decay_rate()
+    return f"""
+UPDATE products AS p
+SET popularity_score = coalesce(s.score, 0)
+FROM products pr
+LEFT JOIN (
+    SELECT product_id, m + ln(exp(-m) + total) AS score
+    FROM (
+        SELECT product_id, m, sum(exp(x - m)) AS total
+        FROM (
+            SELECT product_id, x, greatest(0, max(x) OVER (PARTITION BY product_id)) AS m
+            FROM (
+                SELECT i.product_id,
+                       ln({PURCHASE_WEIGHT} * i.quantity)
+                       + (extract(epoch FROM coalesce(o.updated_at, o.created_at)) - {epoch}) * {rate} AS x
+                FROM orders o JOIN order_items i ON i.order_id = o.id
+                WHERE o.status = 'COMPLETED'
+                UNION ALL
+                SELECT product_id,
+                       ln({LIKE_WEIGHT}) + (extract(epoch FROM created_at) - {epoch}) * {rate}
+                FROM product_likes
+            ) events
+        ) shifted
+        GROUP BY product_id, m
+    ) totals
+) s ON s.product_id = pr.id
+WHERE p.id = pr.id
+  AND p.popularity_score IS DISTINCT FROM coalesce(s.score, 0)
+"""
@@ -0,0 +1,74 @@
+"""Full-text search and title suggestions over the product catalog (schema: see ensure_product_search)."""
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import Float, cast, func, literal, select
+from sqlalchemy.sql import Select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.product import Product
+
+SEARCH_CONFIG = "product_search"
+MAX_SEARCH_TERMS = 8
+# pg_trgm indexes only help from three characters on; shorter input uses the prefix index.
+TRIGRAM_MIN_LENGTH = 3
+MAX_SUGGEST_QUERY_LENGTH = 64
+
+_TERM_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def build_prefix_tsquery(text: str) -> Optional[str]:
+    """Turn free text into a to_tsquery() expression where every word matches as a prefix.
+
+    Only word characters survive, so user input can never produce tsquery syntax errors.
+    """
+    terms = _TERM_RE.findall(text or "")[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def product_search(text: str) -> Optional[Tuple[ColumnElement, ColumnElement]]:
+    """(match condition, relevance rank) for `text`, or None when it has no searchable words."""
+    expression = build_prefix_tsquery(text)
+    if expression is None:
+        return None
+    tsquery = func.to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), expression)
+    condition = Product.search_vector.op("@@")(tsquery)
+    # ts_rank() is float4; as float8 the value written into a keyset cursor compares equal to the
+    # row it came from, so ties at a page boundary are neither skipped nor repeated.
+    rank = cast(func.ts_rank(Product.search_vector, tsquery), Float)
+    return condition, rank
+
+
+def normalize_suggest_query(text: str) -> str:
+    """Lowercased, whitespace-collapsed input, capped so one request can't build a huge pattern."""
+    return " ".join((text or "").split()).lower()[:MAX_SUGGEST_QUERY_LENGTH]
+
+
+def escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def suggest_statement(text: str, limit: int) -> Select:
+    """Top `limit` (id, title) completions: prefix matches first, then closest trigram similarity.
+
+    Matches on lower(title), served by ix_products_title_trgm (substring) or
+    ix_products_title_prefix (1-2 characters); see product_search_ddl.
+    """
+    q = normalize_suggest_query(text)
+    title = func.lower(Product.title)
+    prefix = title.like(escape_like(q) + "%", escape="\\")
+    condition = title.like("%" + escape_like(q) + "%", escape="\\") if len(q) >= TRIGRAM_MIN_LENGTH else prefix
+    return (
+        select(Product.id, Product.title)
+        .where(condition)
+        .order_by(
+            prefix.desc(),
+            func.similarity(title, literal(q)).desc(),
+            func.length(Product.title),
+            Product.id,
+        )
+        .limit(limit)
+    )
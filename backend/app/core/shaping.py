@@ -0,0 +1,118 @@
+"""Sparse fieldsets (?fields=) and single-convention payloads (?shape=camel|snake).
+
+Product and order responses repeat most fields for the frontend: snake_case plus camelCase
+computed duplicates (imageUrl, createdAt, ...). Clients that opt in get one naming convention
+and, with `fields`, only the fields they ask for. Without either parameter responses are
+unchanged.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Computed fields that repeat another field's value under a different name
+# (ProductResponse.discount_end_date / download_count, OrderResponse.total).
+REDUNDANT_FIELDS = frozenset({"discount_end_date", "download_count", "total"})
+
+FieldTree = Dict[str, Optional["FieldTree"]]  # None selects the whole value
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def to_snake(name: str) -> str:
+    return _CAMEL_BOUNDARY.sub("_", name).lower()
+
+
+def to_camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def parse_fields(raw: Optional[str]) -> Tuple[str, ...]:
+    """Normalized (snake_case, sorted, unique) dotted paths from "id,title,product.imageUrl"."""
+    paths = set()
+    for path in (raw or "").split(","):
+        parts = [to_snake(part.strip()) for part in path.split(".")]
+        if all(parts):
+            paths.add(".".join(parts))
+    return tuple(sorted(paths))
+
+
+def field_tree(paths: Tuple[str, ...]) -> FieldTree:
+    """{"product": {"title": None}} for ("product.title",)."""
+    tree: FieldTree = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for part in parents:
+            child = node.setdefault(part, {})
+            if child is None:
+                break  # a shorter path already selects the whole value
+            node = child
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _single_convention(payload: Any) -> Any:
+    """Snake_case only: drop camelCase twins and redundant aliases."""
+    if isinstance(payload, list):
+        return [_single_convention(item) for item in payload]
+    if not isinstance(payload, dict):
+        return payload
+    return {
+        key: _single_convention(value)
+        for key, value in payload.items()
+        if key not in REDUNDANT_FIELDS and not (key != to_snake(key) and to_snake(key) in payload)
+    }
+
+
+def _select(payload: Any, tree: FieldTree) -> Any:
+    if isinstance(payload, list):
+        return [_select(item, tree) for item in payload]
+    if not isinstance(payload, dict):
+        return payload
+    return {
+        key: payload[key] if sub is None else _select(payload[key], sub)
+        for key, sub in tree.items()
+        if key in payload
+    }
+
+
+def _camelize(payload: Any) -> Any:
+    if isinstance(payload, list):
+        return [_camelize(item) for item in payload]
+    if not isinstance(payload, dict):
+        return payload
+    return {to_camel(key): _camelize(value) for key, value in payload.items()}
+
+
+@dataclass(frozen=True)
+class ResponseShape:
+    """Requested payload shape; `fields` alone implies snake_case."""
+
+    fields: Tuple[str, ...] = ()
+    shape: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.fields) or self.shape is not None
+
+    def apply(self, payload: Any) -> Any:
+        """Reshape a JSON-compatible payload (as produced by jsonable_encoder)."""
+        if not self.active:
+            return payload
+        payload = _single_convention(payload)
+        if self.fields:
+            payload = _select(payload, field_tree(self.fields))
+        if self.shape == "camel":
+            payload = _camelize(payload)
+        return payload
+
+    def render(self, content: Any, response: Optional[Response] = None, status_code: int = 200) -> JSONResponse:
+        """JSONResponse for `content` (models or lists of models), keeping headers already set on `response`."""
+        headers = dict(response.headers) if response is not None else None
+        return JSONResponse(self.apply(jsonable_encoder(content)), status_code=status_code, headers=headers)
@@ -0,0 +1,256 @@
+"""Chunked, resumable uploads written straight to disk.
+
+An upload is a directory under UPLOAD_DIR/.incoming/<id>/ holding the declared metadata, a
+data file preallocated (sparse) to the final size, and one small receipt per stored part.
+Parts are fixed-size slices (UPLOAD_PART_SIZE, the last one shorter), so each is written
+with os.pwrite() at its own offset: parts may arrive in any order and in parallel, from any
+worker sharing UPLOAD_DIR, and a failed part is simply sent again. A part's receipt is
+dropped before its slice is rewritten, so a re-send that fails leaves the part missing
+rather than vouching for bytes it no longer describes. The request body is streamed to disk
+chunk by chunk and its size, SHA-256 and CRC-32 are computed as it is written; a part that
+runs past its slice is cut off at once, so MAX_FILE_SIZE (checked on the declared size) can
+never be exceeded on disk.
+
+Finishing checks that every part arrived, takes the file's SHA-256/CRC-32 (from the single
+part's receipt, or one sequential pass over multi-part files), fsyncs and moves the data file
+into place with an atomic os.replace(): readers see either no file or the complete one.
+"""
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import time
+import zlib
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+
+import anyio
+
+from app.core.config import settings
+from app.core.byte_ranges import CHUNK_SIZE
+
+INCOMING_DIR = ".incoming"
+_UPLOAD_ID = re.compile(r"[0-9a-f]{32}")
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w.\- ()]+")
+
+
+class UploadNotFound(LookupError):
+    """Unknown, malformed, aborted or already finished upload id."""
+
+
+class InvalidPart(ValueError):
+    """Part number outside the upload, or a body shorter than the part's slice."""
+
+
+class PartTooLarge(ValueError):
+    """Body longer than the part's slice (and so than the declared file size)."""
+
+
+class ChecksumMismatch(ValueError):
+    """Data does not match the SHA-256 the client declared."""
+
+
+class IncompleteUpload(ValueError):
+    """Finishing was requested before every part was stored."""
+
+
+@dataclass(frozen=True)
+class Upload:
+    id: str
+    file_name: str
+    size: int
+    part_size: int
+    product_id: int
+    sha256: Optional[str] = None  # expected digest of the whole file, if the client sent one
+
+    @property
+    def part_count(self) -> int:
+        return max(1, -(-self.size // self.part_size))
+
+    def part_bounds(self, part_number: int) -> tuple:
+        """(offset, length) of a 1-based part; InvalidPart outside the upload."""
+        if not 1 <= part_number <= self.part_count:
+            raise InvalidPart(part_number)
+        offset = (part_number - 1) * self.part_size
+        return offset, min(self.part_size, self.size - offset)
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    path: str  # relative to UPLOAD_DIR
+    size: int
+    sha256: str
+    crc32: int
+    mtime_ns: int
+
+
+def _upload_dir(upload_id: str) -> str:
+    if not _UPLOAD_ID.fullmatch(upload_id):
+        raise UploadNotFound(upload_id)
+    return os.path.join(settings.UPLOAD_DIR, INCOMING_DIR, upload_id)
+
+
+def _write_json(path: str, data: dict) -> None:
+    # Receipts are replaced atomically, so a reader never sees half a file
+    partial = f"{path}.{secrets.token_hex(4)}.tmp"
+    with open(partial, "w") as file:
+        json.dump(data, file)
+    os.replace(partial, path)
+
+
+def safe_file_name(name: str) -> str:
+    """File name usable on disk: no directories, no separators or control characters."""
+    base = name.replace("\\", "/").rsplit("/", 1)[-1].strip()
+    return _UNSAFE_NAME_CHARS.sub("_", base).lstrip(".") or "file"
+
+
+def create_upload(product_id: int, file_name: str, size: int, sha256: Optional[str] = None) -> Upload:
+    """Start an upload of `size` bytes (blocking: run it in a worker thread)."""
+    upload = Upload(
+        id=secrets.token_hex(16),
+        file_name=file_name,
+        size=size,
+        part_size=settings.UPLOAD_PART_SIZE,
+        product_id=product_id,
+        sha256=sha256.lower() if sha256 else None,
+    )
+    directory = _upload_dir(upload.id)
+    os.makedirs(os.path.join(directory, "parts"))
+    with open(os.path.join(directory, "data"), "wb") as data:
+        data.truncate(size)  # sparse: no disk blocks until parts are written
+    _write_json(os.path.join(directory, "upload.json"), upload.__dict__)
+    return upload
+
+
+def load_upload(upload_id: str) -> Upload:
+    try:
+        with open(os.path.join(_upload_dir(upload_id), "upload.json")) as file:
+            return Upload(**json.load(file))
+    except FileNotFoundError:
+        raise UploadNotFound(upload_id)
+
+
+def stored_parts(upload: Upload) -> Dict[int, dict]:
+    """Receipts of the parts stored so far: part number -> {size, sha256, crc32}."""
+    parts_dir = os.path.join(_upload_dir(upload.id), "parts")
+    receipts = {}
+    try:
+        entries = list(os.scandir(parts_dir))
+    except FileNotFoundError:
+        raise UploadNotFound(upload.id)
+    for entry in entries:
+        if entry.name.endswith(".json"):
+            with open(entry.path) as file:
+                receipts[int(entry.name[:-5])] = json.load(file)
+    return dict(sorted(receipts.items()))
+
+
+async def write_part(
+    upload: Upload, part_number: int, body: AsyncIterator[bytes], sha256: Optional[str] = None
+) -> dict:
+    """Stream one part's body into its slice of the data file; returns the part's receipt."""
+    offset, length = upload.part_bounds(part_number)
+    path = os.path.join(_upload_dir(upload.id), "data")
+    receipt_path = os.path.join(_upload_dir(upload.id), "parts", f"{part_number}.json")
+    try:
+        fd = await anyio.to_thread.run_sync(os.open, path, os.O_WRONLY)
+    except FileNotFoundError:
+        raise UploadNotFound(upload.id)
+    # The slice is about to be overwritten: until this body validates, the part is not stored
+    try:
+        await anyio.to_thread.run_sync(os.unlink, receipt_path)
+    except FileNotFoundError:
+        pass
+    digest, crc, written = hashlib.sha256(), 0, 0
+    try:
+        async for chunk in body:
+            if written + len(chunk) > length:
+                raise PartTooLarge(part_number)
+            while chunk:
+                # pwrite: parallel parts each write their own offsets through their own fd
+                count = await anyio.to_thread.run_sync(os.pwrite, fd, chunk, offset + written)
+                digest.update(chunk[:count])
+                crc = zlib.crc32(chunk[:count], crc)
+                written += count
+                chunk = chunk[count:]
+    finally:
+        await anyio.to_thread.run_sync(os.close, fd)
+    if written != length:
+        raise InvalidPart(part_number)
+    receipt = {"size": written, "sha256": digest.hexdigest(), "crc32": crc}
+    if sha256 and sha256.lower() != receipt["sha256"]:
+        raise ChecksumMismatch(part_number)
+    await anyio.to_thread.run_sync(_write_json, receipt_path, receipt)
+    return receipt
+
+
+def _file_checksums(path: str) -> tuple:
+    digest, crc = hashlib.sha256(), 0
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+    return digest.hexdigest(), crc
+
+
+def finish_upload(upload: Upload) -> StoredFile:
+    """Verify and atomically move a fully received upload into UPLOAD_DIR (blocking).
+
+    The file lands in products/<product_id>/<upload id>-<name>; the upload directory is removed.
+    """
+    receipts = stored_parts(upload)
+    if len(receipts) != upload.part_count:
+        raise IncompleteUpload(upload.id)
+    directory = _upload_dir(upload.id)
+    data = os.path.join(directory, "data")
+    if upload.part_count == 1:
+        sha256, crc32 = receipts[1]["sha256"], receipts[1]["crc32"]  # hashed while it was written
+    else:
+        sha256, crc32 = _file_checksums(data)
+    if upload.sha256 and upload.sha256 != sha256:
+        raise ChecksumMismatch(upload.id)
+
+    relative = os.path.join("products", str(upload.product_id), f"{upload.id}-{safe_file_name(upload.file_name)}")
+    target = os.path.join(settings.UPLOAD_DIR, relative)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        with open(data, "rb+") as file:
+            os.fsync(file.fileno())
+        os.replace(data, target)  # same file system: atomic
+    except FileNotFoundError:
+        raise UploadNotFound(upload.id)  # finished or aborted concurrently by another request
+    directory_fd = os.open(os.path.dirname(target), os.O_RDONLY)
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
+    shutil.rmtree(directory, ignore_errors=True)
+    stat_result = os.stat(target)
+    return StoredFile(path=relative, size=stat_result.st_size, sha256=sha256, crc32=crc32, mtime_ns=stat_result.st_mtime_ns)
+
+
+def abort_upload(upload_id: str) -> None:
+    directory = _upload_dir(upload_id)
+    if not os.path.isdir(directory):
+        raise UploadNotFound(upload_id)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def purge_stale_uploads(max_age_seconds: float) -> int:
+    """Remove unfinished uploads untouched for max_age_seconds; returns how many were removed."""
+    incoming = os.path.join(settings.UPLOAD_DIR, INCOMING_DIR)
+    if not os.path.isdir(incoming):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for entry in os.scandir(incoming):
+        if _UPLOAD_ID.fullmatch(entry.name) and entry.is_dir():
+            data = os.path.join(entry.path, "data")
+            # pwrite() bumps the data file's mtime, so it tells when a client last sent bytes
+            last_activity = os.stat(data).st_mtime if os.path.exists(data) else entry.stat().st_mtime
+            if last_activity < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+    return removed
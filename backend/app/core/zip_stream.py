@@ -0,0 +1,195 @@
+"""Streaming ZIP archives of stored files: exact size up front, any byte range, constant memory.
+
+Entries are STORED (no compression; PDFs and media are already compressed) and every entry's
+CRC-32 is known before the first byte is sent, so the archive layout is fully determined by
+the member list: headers are built in memory (a few hundred bytes per file), file data is
+streamed from disk, nothing is written to a temporary file. The same members always produce
+the same bytes, which is what lets ZipStreamResponse announce Content-Length and serve
+Range requests for resumed downloads. ZIP64 records are added only when an entry, an offset
+or the entry count exceeds the classic format's limits.
+"""
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import anyio
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.byte_ranges import CHUNK_SIZE, RangeMixin, send_file_bytes
+from app.core.http_cache import make_etag
+
+ZIP64_LIMIT = 0xFFFFFFFF  # sizes/offsets at or above this need ZIP64 fields
+ZIP64_COUNT_LIMIT = 0xFFFF
+_ZIP64_MARKER = 0xFFFFFFFF  # classic field value meaning "see the ZIP64 record"
+_UTF8_NAMES = 0x0800  # general purpose flag bit 11: names are UTF-8
+_STORED = 0
+
+
+@dataclass(frozen=True)
+class ZipMember:
+    name: str  # name inside the archive
+    path: str  # file on disk
+    size: int
+    crc32: int
+    mtime: float
+
+
+# A piece of the archive: header bytes built in memory, or (path, size) of file data
+Segment = Union[bytes, Tuple[str, int]]
+
+
+def file_crc32(path: str) -> int:
+    """CRC-32 of a file, read in chunks (blocking: run it in a worker thread)."""
+    crc = 0
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def refresh_crc32(record, path: str, stat_result: os.stat_result) -> bool:
+    """Bring record.crc32 (an OrderFile) up to date with the file; True when it had to be recomputed.
+
+    The cache is keyed by the file's mtime, so a replaced file is read once more, then cached again.
+    Blocking when it recomputes: run it in a worker thread.
+    """
+    if record.crc32 is not None and record.crc32_mtime_ns == stat_result.st_mtime_ns:
+        return False
+    record.crc32, record.crc32_mtime_ns = file_crc32(path), stat_result.st_mtime_ns
+    return True
+
+
+def _dos_datetime(mtime: float) -> Tuple[int, int]:
+    # UTC, not local time: every worker must render the same bytes for a resumed range
+    t = time.gmtime(max(mtime, 315532800))  # the DOS epoch is 1980-01-01
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+def _zip64_extra(*values: int) -> bytes:
+    return struct.pack("<HH", 0x0001, 8 * len(values)) + struct.pack(f"<{len(values)}Q", *values)
+
+
+def zip_layout(members: Sequence[ZipMember]) -> Tuple[List[Segment], int]:
+    """Archive segments in order and the archive's total size in bytes."""
+    segments: List[Segment] = []
+    central = []
+    offset = 0
+    for member in members:
+        name = member.name.encode("utf-8")
+        dos_time, dos_date = _dos_datetime(member.mtime)
+        large = member.size >= ZIP64_LIMIT
+        version = 45 if large or offset >= ZIP64_LIMIT else 20
+        local_extra = _zip64_extra(member.size, member.size) if large else b""
+        local_size = _ZIP64_MARKER if large else member.size
+        header = struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50, version, _UTF8_NAMES, _STORED, dos_time, dos_date,
+            member.crc32, local_size, local_size, len(name), len(local_extra),
+        ) + name + local_extra
+        segments += [header, (member.path, member.size)]
+
+        extra_values = [member.size, member.size] if large else []
+        if offset >= ZIP64_LIMIT:
+            extra_values.append(offset)
+        central_extra = _zip64_extra(*extra_values) if extra_values else b""
+        central.append(
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50, version, version, _UTF8_NAMES, _STORED, dos_time, dos_date,
+                member.crc32, local_size, local_size, len(name), len(central_extra), 0, 0, 0, 0,
+                _ZIP64_MARKER if offset >= ZIP64_LIMIT else offset,
+            )
+            + name
+            + central_extra
+        )
+        offset += len(header) + member.size
+
+    directory = b"".join(central)
+    count = len(members)
+    end = b""
+    zip64 = count >= ZIP64_COUNT_LIMIT or len(directory) >= ZIP64_LIMIT or offset >= ZIP64_LIMIT
+    if zip64:
+        zip64_end_offset = offset + len(directory)
+        end += struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, len(directory), offset)
+        end += struct.pack("<IIQI", 0x07064B50, 0, zip64_end_offset, 1)
+    end += struct.pack(
+        "<IHHHHIIH",
+        0x06054B50, 0, 0, 0xFFFF if zip64 else count, 0xFFFF if zip64 else count,
+        _ZIP64_MARKER if zip64 else len(directory), _ZIP64_MARKER if zip64 else offset, 0,
+    )
+    segments += [directory + end]
+    return segments, offset + len(directory) + len(end)
+
+
+def unique_names(names: Sequence[str]) -> List[str]:
+    """Archive-safe member names: no directories, duplicates numbered like "guide (2).pdf"."""
+    seen = set()
+    result = []
+    for name in names:
+        base = name.replace("\\", "/").rsplit("/", 1)[-1] or "file"
+        stem, dot, ext = base.rpartition(".") if "." in base.lstrip(".") else (base, "", "")
+        candidate, n = base, 1
+        while candidate.lower() in seen:
+            n += 1
+            candidate = f"{stem} ({n}){dot}{ext}"
+        seen.add(candidate.lower())
+        result.append(candidate)
+    return result
+
+
+class ZipStreamResponse(RangeMixin, Response):
+    """ZIP of `members` generated while sending, with Content-Length, ETag and Range support."""
+
+    media_type = "application/zip"
+
+    def __init__(
+        self,
+        members: Sequence[ZipMember],
+        filename: str,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        super().__init__(headers=headers, background=background)
+        self.segments, self.content_size = zip_layout(members)
+        self.content_mtime = max((member.mtime for member in members), default=0.0)
+        self.headers["content-length"] = str(self.content_size)
+        self.headers.setdefault("content-disposition", f'attachment; filename="{filename}"')
+        self.headers.setdefault("last-modified", formatdate(self.content_mtime, usegmt=True))
+        self.headers.setdefault(
+            "etag", make_etag("zip", *((m.name, m.size, m.crc32, m.mtime) for m in members))
+        )
+        self.headers.setdefault("accept-ranges", "bytes")
+
+    def _overlapping(self, first: int, last: int) -> Iterator[Tuple[Segment, int, int]]:
+        """(segment, start, count) for the parts of segments that fall within first..last."""
+        position = 0
+        for segment in self.segments:
+            length = len(segment) if isinstance(segment, bytes) else segment[1]
+            start, stop = max(first, position), min(last + 1, position + length)
+            if start < stop:
+                yield segment, start - position, stop - start
+            position += length
+            if position > last:
+                return
+
+    async def send_span(self, scope: Scope, send: Send, first: int, last: int) -> None:
+        for segment, start, count in self._overlapping(first, last):
+            if isinstance(segment, bytes):
+                await send({"type": "http.response.body", "body": segment[start:start + count], "more_body": True})
+                continue
+            path, size = segment
+            async with await anyio.open_file(path, mode="rb") as file:
+                if (await anyio.to_thread.run_sync(os.fstat, file.wrapped.fileno())).st_size != size:
+                    raise RuntimeError(f"File {path} changed size while being archived.")
+                await send_file_bytes(scope, send, file, start, count)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.send_ranged(scope, send)
+        if self.background is not None:
+            await self.background()
@@ -1,7 +1,10 @@
-from sqlalchemy import create_engine, inspect, text
+from typing import List
+
+from sqlalchemy import BigInteger, create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.ranking import popularity_rebuild_sql
 
 # PostgreSQL is the supported database (view data in pgAdmin, DBeaver, etc.)
 engine = create_engine(
@@ -95,6 +98,305 @@ def ensure_preferred_language_column() -> None:
         )
 
 
+def product_search_ddl() -> List[str]:
+    """Idempotent DDL for product full-text search (unaccent text search config, tsvector trigger, GIN index) and title trigram indexes."""
+    language = settings.SEARCH_LANGUAGE
+    stemmer = "simple" if language == "simple" else f"{language}_stem"
+    document = (
+        "setweight(to_tsvector('product_search', coalesce({row}title, '')), 'A') || "
+        "setweight(to_tsvector('product_search', coalesce({row}description, '')), 'B')"
+    )
+    return [
+        "CREATE EXTENSION IF NOT EXISTS unaccent",
+        f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'product_search') THEN
+                CREATE TEXT SEARCH CONFIGURATION product_search (COPY = {language});
+                ALTER TEXT SEARCH CONFIGURATION product_search
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, {stemmer};
+            END IF;
+        END
+        $$
+        """,
+        "ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector TSVECTOR",
+        f"""
+        CREATE OR REPLACE FUNCTION products_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {document.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_products_search_vector ON products",
+        """
+        CREATE TRIGGER trg_products_search_vector
+            BEFORE INSERT OR UPDATE OF title, description ON products
+            FOR EACH ROW EXECUTE FUNCTION products_search_vector_update()
+        """,
+        f"UPDATE products SET search_vector = {document.format(row='')} WHERE search_vector IS NULL",
+        "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING GIN (search_vector)",
+        # Title suggestions (app.core.search.suggest_statement)
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_products_title_trgm ON products USING GIN (lower(title) gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_products_title_prefix ON products (lower(title) text_pattern_ops)",
+    ]
+
+
+def ensure_product_search() -> None:
+    """Sync product full-text search objects for existing PostgreSQL databases."""
+    inspector = inspect(engine)
+    if "products" not in inspector.get_table_names():
+        return
+
+    with engine.begin() as connection:
+        # Several workers may start at once; serialize the DDL.
+        connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('ensure_product_search'))"))
+        for statement in product_search_ddl():
+            connection.execute(text(statement))
+
+
+PRODUCT_CATALOG_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_products_created_at_id ON products (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_featured_created_at_id ON products (featured, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_category ON products (category)",
+    "CREATE INDEX IF NOT EXISTS ix_products_format ON products (format)",
+    "DROP INDEX IF EXISTS ix_products_price",
+    "CREATE INDEX IF NOT EXISTS ix_products_price_id ON products (price, id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_offer_end_date ON products (offer_end_date) WHERE offer_end_date IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_products_bestseller_created_at_id ON products (created_at, id) WHERE bestseller",
+    "CREATE INDEX IF NOT EXISTS ix_products_popularity_id ON products (popularity_score, id)",
+    """
+    CREATE INDEX IF NOT EXISTS ix_products_top_rated ON products
+        ((coalesce(rating_sum::float8 / nullif(rating_count, 0), 0)), rating_count, id)
+    """,
+]
+
+
+def ensure_product_catalog_indexes() -> None:
+    """Sync product listing indexes (keyset pagination, facet filters, sort orders) for existing PostgreSQL databases.
+
+    Runs after the ensure_* functions that add the indexed columns.
+    """
+    inspector = inspect(engine)
+    if "products" not in inspector.get_table_names():
+        return
+
+    with engine.begin() as connection:
+        for statement in PRODUCT_CATALOG_INDEXES:
+            connection.execute(text(statement))
+
+
+REVIEW_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_reviews_product_created_at_id ON reviews (product_id, created_at, id)",
+]
+
+
+def ensure_review_indexes() -> None:
+    """Sync review listing indexes (keyset pagination per product) for existing PostgreSQL databases."""
+    inspector = inspect(engine)
+    if "reviews" not in inspector.get_table_names():
+        return
+
+    with engine.begin() as connection:
+        for statement in REVIEW_INDEXES:
+            connection.execute(text(statement))
+
+
+PRODUCT_COUNTERS = (
+    "like_count",
+    "review_count",
+    "rating_sum",
+    "rating_count",
+    "rating_1",
+    "rating_2",
+    "rating_3",
+    "rating_4",
+    "rating_5",
+)
+
+PRODUCT_COUNTERS_REBUILD_SQL = """
+UPDATE products AS p
+SET like_count = c.like_count,
+    review_count = c.review_count,
+    rating_sum = c.rating_sum,
+    rating_count = c.rating_count,
+    rating_1 = c.rating_1,
+    rating_2 = c.rating_2,
+    rating_3 = c.rating_3,
+    rating_4 = c.rating_4,
+    rating_5 = c.rating_5
+FROM (
+    SELECT
+        pr.id,
+        coalesce(l.n, 0) AS like_count,
+        coalesce(r.n, 0) AS review_count,
+        coalesce(r.rating_sum, 0) AS rating_sum,
+        coalesce(r.rating_count, 0) AS rating_count,
+        coalesce(r.rating_1, 0) AS rating_1,
+        coalesce(r.rating_2, 0) AS rating_2,
+        coalesce(r.rating_3, 0) AS rating_3,
+        coalesce(r.rating_4, 0) AS rating_4,
+        coalesce(r.rating_5, 0) AS rating_5
+    FROM products pr
+    LEFT JOIN (
+        SELECT product_id, count(*) AS n FROM product_likes GROUP BY product_id
+    ) l ON l.product_id = pr.id
+    LEFT JOIN (
+        SELECT
+            product_id,
+            count(*) AS n,
+            sum(rating) AS rating_sum,
+            count(rating) AS rating_count,
+            count(*) FILTER (WHERE rating = 1) AS rating_1,
+            count(*) FILTER (WHERE rating = 2) AS rating_2,
+            count(*) FILTER (WHERE rating = 3) AS rating_3,
+            count(*) FILTER (WHERE rating = 4) AS rating_4,
+            count(*) FILTER (WHERE rating = 5) AS rating_5
+        FROM reviews GROUP BY product_id
+    ) r ON r.product_id = pr.id
+) AS c
+WHERE p.id = c.id
+  AND (p.like_count, p.review_count, p.rating_sum, p.rating_count,
+       p.rating_1, p.rating_2, p.rating_3, p.rating_4, p.rating_5)
+      IS DISTINCT FROM (c.like_count, c.review_count, c.rating_sum, c.rating_count,
+                        c.rating_1, c.rating_2, c.rating_3, c.rating_4, c.rating_5)
+"""
+
+
+def rebuild_product_counters(connection) -> int:
+    """Recompute denormalized like/review/rating counters from source tables; returns rows corrected."""
+    return connection.execute(text(PRODUCT_COUNTERS_REBUILD_SQL)).rowcount
+
+
+def ensure_product_engagement_counters() -> None:
+    """Sync denormalized product engagement counters for existing PostgreSQL databases."""
+    inspector = inspect(engine)
+    if "products" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("products")}
+    missing = [name for name in PRODUCT_COUNTERS if name not in columns]
+    if not missing:
+        return
+
+    with engine.begin() as connection:
+        for name in missing:
+            connection.execute(
+                text(f"ALTER TABLE products ADD COLUMN IF NOT EXISTS {name} INTEGER NOT NULL DEFAULT 0")
+            )
+        rebuild_product_counters(connection)
+
+
+def rebuild_product_popularity(connection) -> int:
+    """Recompute popularity_score from completed orders and likes; returns rows changed."""
+    return connection.execute(text(popularity_rebuild_sql())).rowcount
+
+
+ORDER_ITEMS_BACKFILL_SQL = """
+INSERT INTO order_items (order_id, product_id, quantity, unit_price)
+SELECT o.id, o.product_id, 1, o.amount
+FROM orders o
+WHERE NOT EXISTS (SELECT 1 FROM order_items i WHERE i.order_id = o.id)
+"""
+
+
+def ensure_order_items() -> None:
+    """Give single-product orders created before order_items existed their one line."""
+    if "orders" not in inspect(engine).get_table_names():
+        return
+    with engine.begin() as connection:
+        # Several workers may start at once; serialize the backfill.
+        connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('ensure_order_items'))"))
+        # Orders are inserted together with their lines, so only a never-filled table needs the scan.
+        if connection.execute(text("SELECT EXISTS (SELECT 1 FROM order_items)")).scalar():
+            return
+        connection.execute(text(ORDER_ITEMS_BACKFILL_SQL))
+
+
+def ensure_product_popularity() -> None:
+    """Sync the products.popularity_score column for existing PostgreSQL databases."""
+    inspector = inspect(engine)
+    if "products" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("products")}
+    if "popularity_score" in columns:
+        return
+
+    with engine.begin() as connection:
+        connection.execute(
+            text("ALTER TABLE products ADD COLUMN IF NOT EXISTS popularity_score DOUBLE PRECISION NOT NULL DEFAULT 0")
+        )
+        rebuild_product_popularity(connection)
+
+
+# The release sweep is global (every expired PENDING reservation), so the index leads with the expiry.
+RESERVATION_EXPIRY_INDEX_DDL = [
+    "DROP INDEX IF EXISTS ix_orders_product_reserved_until",
+    "CREATE INDEX IF NOT EXISTS ix_orders_pending_reserved_until ON orders (stock_reserved_until) "
+    "WHERE status = 'PENDING' AND stock_reserved_until IS NOT NULL",
+]
+
+
+def ensure_stock_reservation_columns() -> None:
+    """Sync limited-stock tracking (products.stock_limited, orders.stock_reserved_until) for existing PostgreSQL databases."""
+    inspector = inspect(engine)
+    tables = inspector.get_table_names()
+    if "products" not in tables or "orders" not in tables:
+        return
+
+    product_columns = {column["name"] for column in inspector.get_columns("products")}
+    order_columns = {column["name"] for column in inspector.get_columns("orders")}
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('ensure_stock_reservation_columns'))"))
+        if "stock_limited" not in product_columns:
+            connection.execute(
+                text("ALTER TABLE products ADD COLUMN IF NOT EXISTS stock_limited BOOLEAN NOT NULL DEFAULT false")
+            )
+            connection.execute(text("UPDATE products SET stock_limited = true WHERE stock > 0"))
+        if "stock_reserved_until" not in order_columns:
+            connection.execute(
+                text("ALTER TABLE orders ADD COLUMN IF NOT EXISTS stock_reserved_until TIMESTAMP WITH TIME ZONE")
+            )
+        for statement in RESERVATION_EXPIRY_INDEX_DDL:
+            connection.execute(text(statement))
+
+
+def ensure_order_file_crc_columns() -> None:
+    """Add order_files.crc32/crc32_mtime_ns (cached CRCs for ZIP bundles) to existing PostgreSQL databases."""
+    inspector = inspect(engine)
+    if "order_files" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("order_files")}
+    with engine.begin() as connection:
+        for name in ("crc32", "crc32_mtime_ns"):
+            if name not in columns:
+                connection.execute(text(f"ALTER TABLE order_files ADD COLUMN IF NOT EXISTS {name} BIGINT"))
+
+
+def ensure_file_size_columns() -> None:
+    """Widen order_files/product_files.file_size to BIGINT (files of 2 GiB and more) on existing PostgreSQL databases."""
+    inspector = inspect(engine)
+    narrow = [
+        table
+        for table in ("order_files", "product_files")
+        if table in inspector.get_table_names()
+        and any(
+            column["name"] == "file_size" and not isinstance(column["type"], BigInteger)
+            for column in inspector.get_columns(table)
+        )
+    ]
+    if not narrow:
+        return
+    with engine.begin() as connection:
+        # Several workers may start at once; serialize the table rewrites.
+        connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('ensure_file_size_columns'))"))
+        for table in narrow:
+            connection.execute(text(f"ALTER TABLE {table} ALTER COLUMN file_size TYPE BIGINT"))
+
+
 def get_db():
     """Dependency to get database session."""
     db = SessionLocal()
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from fastapi import Header
+
+from app.core.idempotency import IDEMPOTENCY_HEADER, MAX_KEY_LENGTH
+
+
+def get_idempotency_key(
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        min_length=1,
+        max_length=MAX_KEY_LENGTH,
+        description="Client-generated token (e.g. a UUID); retries with the same key replay the first response",
+    ),
+) -> Optional[str]:
+    return idempotency_key
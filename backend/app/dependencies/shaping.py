@@ -0,0 +1,16 @@
+from typing import Optional
+
+from fastapi import Query
+
+from app.core.shaping import ResponseShape, parse_fields
+
+
+def get_response_shape(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. id,title,price or product.title on orders"
+    ),
+    shape: Optional[str] = Query(
+        None, pattern="^(camel|snake)$", description="Emit one naming convention instead of both"
+    ),
+) -> ResponseShape:
+    return ResponseShape(fields=parse_fields(fields), shape=shape)
@@ -51,6 +51,16 @@ TRANSLATIONS = {
             "invalid_refresh_sub": "Invalid refresh token",
             "email_not_verified_short": "Email not verified",
             "not_enough_permissions": "Not enough permissions",
+            "invalid_cursor": "Invalid or expired pagination cursor",
+            "import_format_unsupported": "Send the catalog as CSV (text/csv) or NDJSON (application/x-ndjson)",
+            "import_encoding": "Import files must be UTF-8 encoded",
+            "invalid_product_ids": "Provide between 1 and {max} numeric product ids",
+            "idempotency_key_reused": "This Idempotency-Key was already used for a different request",
+            "download_link_invalid": "This download link is invalid or has expired",
+            "upload_not_found": "Upload not found or already finished",
+            "upload_part_invalid": "Upload part number or size does not match the upload",
+            "upload_incomplete": "Some parts of this upload are missing",
+            "upload_checksum_mismatch": "Uploaded data does not match its SHA-256 checksum",
         },
         "emails": {
             "welcome_subject": "Welcome to VetLearn",
@@ -133,6 +143,16 @@ TRANSLATIONS = {
             "invalid_refresh_sub": "Jeton d'actualisation non valide",
             "email_not_verified_short": "E-mail non vérifié",
             "not_enough_permissions": "Permissions insuffisantes",
+            "invalid_cursor": "Curseur de pagination invalide ou expiré",
+            "import_format_unsupported": "Envoyez le catalogue en CSV (text/csv) ou NDJSON (application/x-ndjson)",
+            "import_encoding": "Les fichiers d'import doivent être encodés en UTF-8",
+            "invalid_product_ids": "Indiquez entre 1 et {max} identifiants de produits numériques",
+            "idempotency_key_reused": "Cette clé Idempotency-Key a déjà été utilisée pour une autre requête",
+            "download_link_invalid": "Ce lien de téléchargement est invalide ou a expiré",
+            "upload_not_found": "Téléversement introuvable ou déjà terminé",
+            "upload_part_invalid": "Le numéro ou la taille de la partie ne correspond pas au téléversement",
+            "upload_incomplete": "Certaines parties de ce téléversement sont manquantes",
+            "upload_checksum_mismatch": "Les données téléversées ne correspondent pas à leur somme SHA-256",
         },
         "emails": {
             "welcome_subject": "Bienvenue sur VetLearn",
@@ -215,6 +235,16 @@ TRANSLATIONS = {
             "invalid_refresh_sub": "刷新令牌无效",
             "email_not_verified_short": "邮箱未验证",
             "not_enough_permissions": "权限不足",
+            "invalid_cursor": "分页游标无效或已过期",
+            "import_format_unsupported": "请以 CSV (text/csv) 或 NDJSON (application/x-ndjson) 格式发送目录",
+            "import_encoding": "导入文件必须使用 UTF-8 编码",
+            "invalid_product_ids": "请提供 1 到 {max} 个数字产品 ID",
+            "idempotency_key_reused": "此 Idempotency-Key 已用于其他请求",
+            "download_link_invalid": "此下载链接无效或已过期",
+            "upload_not_found": "未找到上传或上传已完成",
+            "upload_part_invalid": "上传分片的编号或大小与上传不符",
+            "upload_incomplete": "此上传缺少部分分片",
+            "upload_checksum_mismatch": "上传的数据与其 SHA-256 校验和不符",
         },
         "emails": {
             "welcome_subject": "欢迎使用 VetLearn",
@@ -293,6 +323,16 @@ TRANSLATIONS = {
             "invalid_refresh_sub": "अमान्य रीफ़्रेश टोकन",
             "email_not_verified_short": "ईमेल सत्यापित नहीं",
             "not_enough_permissions": "पर्याप्त अनुमति नहीं",
+            "invalid_cursor": "अमान्य या समाप्त पेजिनेशन कर्सर",
+            "import_format_unsupported": "कैटलॉग CSV (text/csv) या NDJSON (application/x-ndjson) के रूप में भेजें",
+            "import_encoding": "इम्पोर्ट फ़ाइलें UTF-8 एन्कोडेड होनी चाहिए",
+            "invalid_product_ids": "1 से {max} तक संख्यात्मक उत्पाद आईडी दें",
+            "idempotency_key_reused": "यह Idempotency-Key पहले ही किसी अन्य अनुरोध के लिए उपयोग की जा चुकी है",
+            "download_link_invalid": "यह डाउनलोड लिंक अमान्य है या समाप्त हो गया है",
+            "upload_not_found": "अपलोड नहीं मिला या पहले ही पूरा हो चुका है",
+            "upload_part_invalid": "अपलोड भाग की संख्या या आकार अपलोड से मेल नहीं खाता",
+            "upload_incomplete": "इस अपलोड के कुछ भाग अनुपलब्ध हैं",
+            "upload_checksum_mismatch": "अपलोड किया गया डेटा उसके SHA-256 चेकसम से मेल नहीं खाता",
         },
         "emails": {
             "welcome_subject": "VetLearn में आपका स्वागत है",
@@ -371,6 +411,16 @@ TRANSLATIONS = {
             "invalid_refresh_sub": "Token de actualización no válido",
             "email_not_verified_short": "Correo no verificado",
             "not_enough_permissions": "Permisos insuficientes",
+            "invalid_cursor": "Cursor de paginación no válido o caducado",
+            "import_format_unsupported": "Envíe el catálogo como CSV (text/csv) o NDJSON (application/x-ndjson)",
+            "import_encoding": "Los archivos de importación deben estar codificados en UTF-8",
+            "invalid_product_ids": "Indique entre 1 y {max} identificadores de producto numéricos",
+            "idempotency_key_reused": "Esta Idempotency-Key ya se usó para otra solicitud",
+            "download_link_invalid": "Este enlace de descarga no es válido o ha caducado",
+            "upload_not_found": "Subida no encontrada o ya finalizada",
+            "upload_part_invalid": "El número o tamaño de la parte no coincide con la subida",
+            "upload_incomplete": "Faltan partes de esta subida",
+            "upload_checksum_mismatch": "Los datos subidos no coinciden con su suma SHA-256",
         },
         "emails": {
             "welcome_subject": "Bienvenido a VetLearn",
@@ -5,10 +5,21 @@ from app.db.database import (
     engine,
     Base,
     ensure_auth_verification_columns,
+    ensure_file_size_columns,
+    ensure_order_file_crc_columns,
+    ensure_order_items,
     ensure_password_reset_columns,
     ensure_preferred_language_column,
+    ensure_product_search,
+    ensure_product_catalog_indexes,
+    ensure_product_engagement_counters,
+    ensure_product_popularity,
+    ensure_review_indexes,
+    ensure_stock_reservation_columns,
 )
 from app.api.v1 import api_router
+from app.core.idempotency import REPLAYED_HEADER
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_EXACT_HEADER
 import app.models  # noqa: F401 — register SQLAlchemy models with Base.metadata
 
 # Create database tables
@@ -16,6 +27,15 @@ Base.metadata.create_all(bind=engine)
 ensure_auth_verification_columns()
 ensure_password_reset_columns()
 ensure_preferred_language_column()
+ensure_product_search()
+ensure_product_engagement_counters()
+ensure_order_items()
+ensure_product_popularity()
+ensure_product_catalog_indexes()
+ensure_review_indexes()
+ensure_stock_reservation_columns()
+ensure_order_file_crc_columns()
+ensure_file_size_columns()
 
 app = FastAPI(
     title="Vertinary Website API",
@@ -30,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_EXACT_HEADER, REPLAYED_HEADER, "Accept-Ranges", "Content-Range"],
 )
 
 # Include API router
@@ -1,17 +1,22 @@
 from app.models.user import User
 from app.models.product import Product
-from app.models.order import Order, OrderFile
+from app.models.order import Order, OrderFile, OrderItem
 from app.models.config import SiteConfig
 from app.models.review import Review
 from app.models.product_like import ProductLike
+from app.models.product_file import ProductFile
+from app.models.idempotency_key import IdempotencyKey
 
 __all__ = [
     "User",
     "Product",
     "Order",
     "OrderFile",
+    "OrderItem",
     "SiteConfig",
     "Review",
     "ProductLike",
+    "ProductFile",
+    "IdempotencyKey",
 ]
 
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, LargeBinary, SmallInteger
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response of a POST sent with an Idempotency-Key header (see app.core.idempotency)."""
+
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    # sha256 of endpoint + request body: the same key reused for another request is rejected
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(SmallInteger, nullable=False)
+    body = Column(LargeBinary, nullable=False)  # zlib-compressed JSON
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum, Text
+from sqlalchemy import BigInteger, Column, Integer, String, Float, ForeignKey, DateTime, Enum, Text, Index, Sequence, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -16,16 +16,31 @@ class PaymentMethod(str, enum.Enum):
     ORANGE_MONEY = "orange_money"
     BANK_TRANSFER = "bank_transfer"
 
+# Source of order numbers (see app.core.order_numbers)
+ORDER_NUMBER_SEQUENCE = Sequence("order_number_seq", start=1, metadata=Base.metadata)
+
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Expired reservations of unpaid orders (released lazily by create_order, across all products)
+        Index(
+            "ix_orders_pending_reserved_until",
+            "stock_reserved_until",
+            postgresql_where=text("status = 'PENDING' AND stock_reserved_until IS NOT NULL"),
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}  # RETURNING created_at / updated_at on flush
 
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String, unique=True, index=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # First line's product (single-product API and responses); every product is in `items`
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Float, nullable=False)  # total of all lines
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING, nullable=False)
     payment_method = Column(Enum(PaymentMethod), nullable=True)
+    # Set while this unpaid order holds its lines' quantities of limited stock (STOCK_RESERVATION_MINUTES)
+    stock_reserved_until = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -33,6 +48,26 @@ class Order(Base):
     user = relationship("User", back_populates="orders")
     product = relationship("Product", back_populates="orders")
     files = relationship("OrderFile", back_populates="order", cascade="all, delete-orphan")
+    items = relationship(
+        "OrderItem", back_populates="order", cascade="all, delete-orphan", order_by="OrderItem.id"
+    )
+
+class OrderItem(Base):
+    """One product line of an order."""
+    __tablename__ = "order_items"
+    __table_args__ = (
+        UniqueConstraint("order_id", "product_id", name="uq_order_item_order_product"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    quantity = Column(Integer, default=1, server_default="1", nullable=False)
+    unit_price = Column(Float, nullable=False)  # price when ordered
+
+    # Relationships
+    order = relationship("Order", back_populates="items")
+    product = relationship("Product")
 
 class OrderFile(Base):
     __tablename__ = "order_files"
@@ -41,7 +76,10 @@ class OrderFile(Base):
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
     file_name = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
-    file_size = Column(Integer, nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    # CRC-32 of the file for ZIP bundles, valid while the file's mtime (ns) is crc32_mtime_ns
+    crc32 = Column(BigInteger, nullable=True)
+    crc32_mtime_ns = Column(BigInteger, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, Index, cast, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.db.database import Base
 
@@ -8,6 +10,23 @@ from app.db.database import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination of the default "newest" listing, with and without ?featured=
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_featured_created_at_id", "featured", "created_at", "id"),
+        # Facet filters (?category=, ?format=, price range, ?on_offer=, ?bestseller=)
+        Index("ix_products_category", "category"),
+        Index("ix_products_format", "format"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_offer_end_date", "offer_end_date", postgresql_where=text("offer_end_date IS NOT NULL")),
+        Index("ix_products_bestseller_created_at_id", "created_at", "id", postgresql_where=text("bestseller")),
+        # ?sort=popular / ?sort=top_rated (ix_products_top_rated is declared below the class)
+        Index("ix_products_popularity_id", "popularity_score", "id"),
+    )
+    # INSERT/UPDATE ... RETURNING server-generated columns (created_at, updated_at, ...), so
+    # write endpoints can answer from the flushed object instead of reloading it
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
@@ -16,6 +35,8 @@ class Product(Base):
     original_price = Column(Float, nullable=True)
     image_url = Column(String, nullable=True)
     stock = Column(Integer, default=0)
+    # Set from a positive stock on create; a later stock of 0 marks it sold out (see product_payload_to_orm_dict)
+    stock_limited = Column(Boolean, default=False, server_default="false", nullable=False)
     sold = Column(Integer, default=0)
     # Optional merchandising / catalog fields used by the frontend
     category = Column(String, nullable=True)
@@ -26,8 +47,24 @@ class Product(Base):
     offer_end_date = Column(DateTime(timezone=True), nullable=True)
     featured = Column(Boolean, default=False)
     purchase_count = Column(Integer, default=0)
+    # Engagement counters, maintained in the same transaction as like/review writes
+    # (rebuild with scripts/reconcile_product_counters.py)
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
+    review_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Review count per star value (rating histogram)
+    rating_1 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_2 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_3 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_4 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_5 = Column(Integer, default=0, server_default="0", nullable=False)
+    # Time-decayed purchases + likes in the log domain, bumped on payment/like (see app.core.ranking)
+    popularity_score = Column(Float, default=0.0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Weighted title/description tsvector, maintained by a trigger (see ensure_product_search)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     # Relationships
     orders = relationship("Order", back_populates="product")
@@ -37,4 +74,18 @@ class Product(Base):
     likes = relationship(
         "ProductLike", back_populates="product", cascade="all, delete-orphan"
     )
+    files = relationship(
+        "ProductFile", back_populates="product", cascade="all, delete-orphan"
+    )
+
+    @hybrid_property
+    def average_rating(self) -> float:
+        return self.rating_sum / self.rating_count if self.rating_count else 0.0
+
+    @average_rating.expression
+    def average_rating(cls):
+        ratio = cast(cls.rating_sum, Float).op("/", return_type=Float)(func.nullif(cls.rating_count, 0))
+        return func.coalesce(ratio, 0.0)
+
 
+Index("ix_products_top_rated", Product.average_rating, Product.rating_count, Product.id)
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class ProductFile(Base):
+    """Downloadable asset of a product, copied onto each paid order as an OrderFile."""
+
+    __tablename__ = "product_files"
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    file_name = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)  # relative to UPLOAD_DIR
+    file_size = Column(BigInteger, nullable=False)  # bytes; chunked uploads go past 2 GiB
+    sha256 = Column(String(64), nullable=False)
+    # Computed during the upload; OrderFile copies start with a valid ZIP bundle CRC
+    crc32 = Column(BigInteger, nullable=True)
+    crc32_mtime_ns = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    product = relationship("Product", back_populates="files")
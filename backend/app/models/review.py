@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -8,7 +8,11 @@ class Review(Base):
     __tablename__ = "reviews"
     __table_args__ = (
         UniqueConstraint("user_id", "product_id", name="uq_review_user_product"),
+        # Keyset pagination of a product's reviews, newest first
+        Index("ix_reviews_product_created_at_id", "product_id", "created_at", "id"),
     )
+    # created_at / updated_at come back with the INSERT/UPDATE (RETURNING)
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
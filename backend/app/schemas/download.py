@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import datetime
 from typing import List
 
 class FileResponse(BaseModel):
@@ -12,3 +13,10 @@ class FileResponse(BaseModel):
 class DownloadFilesResponse(BaseModel):
     files: List[FileResponse]
 
+
+class DownloadLink(FileResponse):
+    url: str
+
+class DownloadLinksResponse(BaseModel):
+    expires_at: datetime
+    files: List[DownloadLink]
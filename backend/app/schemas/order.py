@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 from datetime import datetime
 from app.schemas.product import ProductResponse
 
@@ -14,13 +14,43 @@ class UserOrderSummary(BaseModel):
     email: str
 
 
+MAX_ORDER_ITEMS = 50
+
+
+class OrderItemCreate(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    product_id: int = Field(..., alias="productId")
+    quantity: int = Field(1, ge=1, le=1000)
+
+
 class OrderBase(BaseModel):
-    product_id: int
-    amount: float
+    product_id: Optional[int] = None
+    amount: Optional[float] = None
 
 
 class OrderCreate(OrderBase):
-    pass
+    """Single product (`product_id` + `amount`, as the checkout sends today) or `items[]`.
+
+    With `items` the amount is computed from current product prices.
+    """
+
+    items: Optional[List[OrderItemCreate]] = Field(None, min_length=1, max_length=MAX_ORDER_ITEMS)
+
+    @model_validator(mode="after")
+    def require_product_or_items(self) -> "OrderCreate":
+        if self.items is None and (self.product_id is None or self.amount is None):
+            raise ValueError("provide product_id and amount, or items")
+        return self
+
+    def quantities(self) -> Dict[int, int]:
+        """product id -> quantity, in request order (repeated products are merged)."""
+        if self.items is None:
+            return {self.product_id: 1}
+        lines: Dict[int, int] = {}
+        for item in self.items:
+            lines[item.product_id] = lines.get(item.product_id, 0) + item.quantity
+        return lines
 
 
 class PaymentRequest(BaseModel):
@@ -36,6 +66,25 @@ class PaymentRequest(BaseModel):
     email: Optional[str] = Field(None, alias="email")
 
 
+class OrderItemResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    product_id: int
+    quantity: int
+    unit_price: float
+    product: Optional[ProductResponse] = None
+
+    @computed_field
+    @property
+    def productId(self) -> int:
+        return self.product_id
+
+    @computed_field
+    @property
+    def unitPrice(self) -> float:
+        return self.unit_price
+
+
 class OrderResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
@@ -44,6 +93,7 @@ class OrderResponse(BaseModel):
     user_id: int
     product_id: int
     product: Optional[ProductResponse] = None
+    items: List[OrderItemResponse] = []
     user: Optional[UserOrderSummary] = None
     amount: float
     status: str
@@ -75,6 +125,7 @@ class OrderResponse(BaseModel):
                 "user_id": data.user_id,
                 "product_id": data.product_id,
                 "product": data.product,
+                "items": data.items,
                 "user": user_payload,
                 "amount": data.amount,
                 "status": st_val,
@@ -1,6 +1,17 @@
 from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
-from typing import Optional, Any
+from typing import Dict, List, Optional, Any
 from datetime import datetime
+import enum
+
+
+class ProductSort(str, enum.Enum):
+    """?sort= values for GET /products (default: newest, or relevance when searching)."""
+
+    NEWEST = "newest"
+    POPULAR = "popular"
+    TOP_RATED = "top_rated"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
 
 
 class ProductBase(BaseModel):
@@ -35,6 +46,9 @@ class ProductUpdate(BaseModel):
     format: Optional[str] = None
     pages: Optional[int] = None
     bestseller: Optional[bool] = None
+    stock_limited: Optional[bool] = Field(
+        default=None, description="Set false to make a limited product unlimited again"
+    )
 
 
 class ProductResponse(ProductBase):
@@ -43,6 +57,8 @@ class ProductResponse(ProductBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+    # Limited stock fully sold (stock 0 otherwise means unlimited)
+    sold_out: bool = False
     sold: int = 0
     purchase_count: int = 0
     created_at: datetime
@@ -63,6 +79,7 @@ class ProductResponse(ProductBase):
                 "original_price": data.original_price,
                 "image_url": data.image_url,
                 "stock": data.stock,
+                "sold_out": bool(getattr(data, "stock_limited", False)) and (data.stock or 0) <= 0,
                 "offer_end_date": data.offer_end_date,
                 "featured": data.featured,
                 "category": data.category,
@@ -131,11 +148,77 @@ class ProductDetailResponse(ProductResponse):
     like_count: int = 0
     review_count: int = 0
     liked_by_me: Optional[bool] = None
+    average_rating: float = 0.0
+    rating_count: int = 0
+    # Number of reviews per star value, keys 1..5
+    rating_histogram: Dict[int, int] = Field(default_factory=lambda: dict.fromkeys(range(1, 6), 0))
+
+
+# Upper bound for /products/batch (one indexed = ANY(...) lookup)
+MAX_BATCH_IDS = 300
+
+
+class ProductBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class ProductBatchResponse(BaseModel):
+    """Found products in request order (duplicates collapsed) and the ids that do not exist."""
+
+    items: List[ProductDetailResponse]
+    missing: List[int]
+
+
+class ProductSuggestion(BaseModel):
+    id: int
+    title: str
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class ProductFacetsResponse(BaseModel):
+    """Facet counts for GET /products/facets (categories/formats sorted by count)."""
+
+    total: int = 0
+    categories: List[FacetCount] = Field(default_factory=list)
+    formats: List[FacetCount] = Field(default_factory=list)
+    bestseller: int = 0
+    on_offer: int = 0
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class ProductImportError(BaseModel):
+    row: int = Field(..., description="CSV line number or NDJSON line number")
+    errors: List[str]
+
+
+class ProductImportReport(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ProductImportError] = Field(default_factory=list)
+    errors_truncated: bool = False
+
 
+def product_payload_to_orm_dict(data: dict, creating: bool = False) -> dict:
+    """Turn API create/update dict into SQLAlchemy Product column values.
 
-def product_payload_to_orm_dict(data: dict) -> dict:
-    """Turn API/create dict into SQLAlchemy Product constructor kwargs."""
+    Only a create derives stock_limited from stock. On an update, stock 0 on a
+    limited product means sold out, not unlimited; a positive stock still
+    switches tracking on, and an explicit stock_limited always wins.
+    """
     out = dict(data)
     if "format" in out:
         out["content_format"] = out.pop("format")
+    if out.get("stock_limited") is None:
+        out.pop("stock_limited", None)
+        stock = out.get("stock")
+        if creating and "stock" in out:
+            # Admin form: "leave empty or 0 for unlimited stock"
+            out["stock_limited"] = bool(stock and stock > 0)
+        elif stock and stock > 0:
+            out["stock_limited"] = True
     return out
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class UploadCreate(BaseModel):
+    """Start a chunked upload of a product file; `sha256` (hex) is checked when it finishes."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    product_id: int = Field(..., alias="productId")
+    file_name: str = Field(..., alias="fileName", min_length=1, max_length=255)
+    size: int = Field(..., ge=1)
+    sha256: Optional[str] = Field(None, pattern=r"^[0-9a-fA-F]{64}$")
+
+
+class UploadStatus(BaseModel):
+    id: str
+    product_id: int
+    file_name: str
+    size: int
+    part_size: int
+    part_count: int
+    received_parts: List[int]
+
+
+class UploadPartReceipt(BaseModel):
+    part_number: int
+    size: int
+    sha256: str
+
+
+class ProductFileResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    product_id: int
+    file_name: str
+    file_size: int
+    sha256: str
+    created_at: Optional[datetime] = None
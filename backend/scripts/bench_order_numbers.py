@@ -0,0 +1,108 @@
+"""
+Benchmark order inserts with legacy random order numbers (ORD- + 8 random hex
+digits) vs. sequence-backed numbers (app.core.order_numbers).
+
+Each strategy fills its own temporary copy of the orders table (same columns and
+indexes, no foreign keys) using one INSERT per order, as checkout does, and reports
+insert throughput, the size of the unique order_number index and how many random
+numbers collided. Temporary tables and a temporary sequence are used, so nothing
+is left behind and order_number_seq is not consumed:
+
+    python scripts/bench_order_numbers.py --rows 200000
+"""
+import argparse
+import sys
+import os
+import time
+import uuid
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import BigInteger, column, func, insert, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.database import engine, Base
+from app.core.order_numbers import order_number_expression
+import app.models  # noqa: F401 — register SQLAlchemy models with Base.metadata
+
+COLUMNS = ("id", "order_number", "user_id", "product_id", "amount", "status")
+
+
+def _bench_table(connection, name: str):
+    # Indexes only: copying defaults would draw ids from the real orders_id_seq.
+    connection.execute(text(f"CREATE TEMP TABLE {name} (LIKE orders INCLUDING INDEXES) ON COMMIT DROP"))
+    return table(name, *(column(c) for c in COLUMNS))
+
+
+def _row(order_id: int, number) -> dict:
+    return {
+        "id": order_id,
+        "order_number": number,
+        "user_id": 1,
+        "product_id": 1,
+        "amount": 2500.0,
+        "status": "PENDING",
+    }
+
+
+def _legacy(connection, rows: int) -> int:
+    target = _bench_table(connection, "bench_orders_random")
+    collisions = 0
+    for order_id in range(1, rows + 1):
+        statement = (
+            pg_insert(target)
+            .values(_row(order_id, f"ORD-{uuid.uuid4().hex[:8].upper()}"))
+            .on_conflict_do_nothing()
+            .returning(target.c.order_number)
+        )
+        # The old code path had no retry: a duplicate was an IntegrityError for the buyer.
+        collisions += connection.execute(statement).first() is None
+    return collisions
+
+
+def _sequence(connection, rows: int) -> int:
+    target = _bench_table(connection, "bench_orders_sequence")
+    connection.execute(text("CREATE TEMP SEQUENCE bench_order_number_seq"))
+    value = select(func.nextval("bench_order_number_seq").label("value")).subquery("seq")
+    number = select(order_number_expression(value.c.value.cast(BigInteger))).scalar_subquery()
+    for order_id in range(1, rows + 1):
+        connection.execute(insert(target).values(_row(order_id, number)))
+    return 0
+
+
+def _index_size(connection, name: str) -> int:
+    index = connection.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :name AND indexdef LIKE '%UNIQUE%order_number%'"),
+        {"name": name},
+    ).scalar_one()
+    return connection.execute(text("SELECT pg_relation_size(CAST(:index AS regclass))"), {"index": index}).scalar()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+
+    print(f"{'strategy':<10} {'rows/s':>10} {'index MB':>10} {'collisions':>11}")
+    for label, fill, name in (
+        ("random", _legacy, "bench_orders_random"),
+        ("sequence", _sequence, "bench_orders_sequence"),
+    ):
+        with engine.connect() as connection:
+            transaction = connection.begin()
+            try:
+                started = time.perf_counter()
+                collisions = fill(connection, args.rows)
+                elapsed = time.perf_counter() - started
+                size = _index_size(connection, name) / 2**20
+                print(f"{label:<10} {args.rows / elapsed:>10.0f} {size:>10.1f} {collisions:>11}")
+            finally:
+                transaction.rollback()
+    print("\n✓ Done")
+
+
+if __name__ == "__main__":
+    main()
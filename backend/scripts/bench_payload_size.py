@@ -0,0 +1,112 @@
+"""
+Benchmark product/order payload sizes for the ?shape= and ?fields= response modes.
+
+Builds synthetic responses in memory (no database needed) and reports raw and
+gzip-compressed JSON sizes plus serialization time for each mode:
+
+    python scripts/bench_payload_size.py --items 100
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.shaping import ResponseShape, parse_fields
+from app.schemas.order import OrderResponse
+from app.schemas.product import ProductResponse
+
+MODES = [
+    ("legacy", ResponseShape()),
+    ("shape=snake", ResponseShape(shape="snake")),
+    ("shape=camel", ResponseShape(shape="camel")),
+]
+# What a product card / order history row actually renders
+CARD_FIELDS = {
+    "products": "id,title,price,originalPrice,imageUrl",
+    "orders": "id,orderNumber,status,amount,createdAt,product.title,product.imageUrl",
+}
+
+
+def _products(rng: random.Random, count: int) -> list:
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    return [
+        ProductResponse(
+            id=i,
+            title=f"Guide pratique de l'élevage n°{i}",
+            description="Méthodes, rations et calendrier sanitaire. " * rng.randint(2, 6),
+            price=float(rng.randint(1, 50) * 500),
+            original_price=float(rng.randint(51, 80) * 500),
+            image_url=f"/uploads/products/{i}.webp",
+            stock=0,
+            offer_end_date=now + timedelta(days=rng.randint(1, 30)),
+            category="Volaille",
+            format="PDF",
+            pages=rng.randint(20, 200),
+            sold=rng.randint(0, 500),
+            purchase_count=rng.randint(0, 500),
+            created_at=now - timedelta(days=rng.randint(1, 365)),
+            updated_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _orders(products: list) -> list:
+    return [
+        OrderResponse(
+            id=i,
+            order_number=f"ORD-{i:08X}",
+            user_id=1,
+            product_id=product.id,
+            product=product,
+            user={"id": 1, "name": "Awa", "email": "awa@example.com"},
+            amount=product.price,
+            status="completed",
+            payment_method="mobile_money",
+            created_at=product.created_at,
+            updated_at=product.updated_at,
+        )
+        for i, product in enumerate(products, start=1)
+    ]
+
+
+def _measure(content: list, shape: ResponseShape, repeat: int) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = json.dumps(shape.apply(jsonable_encoder(content)), ensure_ascii=False, separators=(",", ":")).encode()
+        timings.append((time.perf_counter() - started) * 1000)
+    return len(body), len(gzip.compress(body)), statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    products = _products(random.Random(42), args.items)
+    for label, content in (("products", products), ("orders", _orders(products))):
+        print(f"\n{label} x{args.items}")
+        print(f"{'mode':<14} {'bytes':>10} {'gzip':>10} {'vs legacy':>10} {'p50':>9}")
+        baseline = None
+        card = ResponseShape(fields=parse_fields(CARD_FIELDS[label]), shape="camel")
+        for mode, shape in MODES + [("fields=card", card)]:
+            raw, compressed, p50 = _measure(content, shape, args.repeat)
+            baseline = baseline or raw
+            print(f"{mode:<14} {raw:>10} {compressed:>10} {raw / baseline:>9.0%} {p50:>7.2f}ms")
+    print("\n✓ Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark product search: legacy ILIKE scan vs. the tsvector/GIN full-text path.
+
+Seeds a synthetic catalog inside a transaction that is rolled back at the end,
+so it is safe to point at a development database:
+
+    python scripts/bench_product_search.py --rows 100000
+"""
+import argparse
+import random
+import statistics
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.db.database import engine, Base, ensure_product_search
+from app.models.product import Product
+from app.core.search import product_search
+import app.models  # noqa: F401 — register SQLAlchemy models with Base.metadata
+
+WORDS = [
+    "élevage", "poulets", "pondeuses", "chair", "porcs", "lapins", "chèvres", "moutons",
+    "bovins", "vaccination", "alimentation", "rations", "maïs", "soja", "poussins",
+    "couveuse", "incubation", "santé", "maladies", "prévention", "bâtiment", "hygiène",
+    "rentabilité", "gestion", "stocks", "aquaculture", "tilapia", "silure", "abeilles",
+    "miel", "fourrage", "pâturage", "reproduction", "sevrage", "croissance", "engraissement",
+]
+QUERIES = ["vaccination", "poulets chair", "maladie", "elevage porcs", "tilapia", "aliment"]
+
+
+def _random_text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def _seed(session: Session, rows: int, batch_size: int = 5000) -> None:
+    rng = random.Random(42)
+    for start in range(0, rows, batch_size):
+        batch = [
+            {
+                "title": _random_text(rng, 4).capitalize(),
+                "description": _random_text(rng, 40),
+                "price": float(rng.randint(1, 50) * 500),
+            }
+            for _ in range(min(batch_size, rows - start))
+        ]
+        session.execute(insert(Product), batch)
+    session.execute(text("ANALYZE products"))
+
+
+def _time(fn, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _ilike(session: Session, q: str, limit: int):
+    return (
+        session.query(Product.id)
+        .filter(Product.title.ilike(f"%{q}%") | Product.description.ilike(f"%{q}%"))
+        .limit(limit)
+        .all()
+    )
+
+
+def _fulltext(session: Session, q: str, limit: int):
+    condition, rank = product_search(q)
+    return (
+        session.query(Product.id)
+        .filter(condition)
+        .order_by(rank.desc(), Product.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    ensure_product_search()
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(bind=connection)
+        try:
+            started = time.perf_counter()
+            _seed(session, args.rows)
+            print(f"✓ Seeded {args.rows} products in {time.perf_counter() - started:.1f}s (rolled back at exit)\n")
+            print(f"{'query':<18} {'ilike p50':>10} {'ilike p95':>10} {'fts p50':>10} {'fts p95':>10}")
+            for q in QUERIES:
+                ilike = _time(lambda: _ilike(session, q, args.limit), args.repeat)
+                fts = _time(lambda: _fulltext(session, q, args.limit), args.repeat)
+                print(
+                    f"{q:<18} {statistics.median(ilike):>8.2f}ms "
+                    f"{statistics.quantiles(ilike, n=20)[-1]:>8.2f}ms "
+                    f"{statistics.median(fts):>8.2f}ms "
+                    f"{statistics.quantiles(fts, n=20)[-1]:>8.2f}ms"
+                )
+        finally:
+            session.close()
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
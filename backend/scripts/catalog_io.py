@@ -0,0 +1,74 @@
+"""
+Bulk product catalog import/export from the command line.
+
+    python scripts/catalog_io.py import products.csv
+    python scripts/catalog_io.py import products.ndjson --batch-size 5000
+    python scripts/catalog_io.py export --format csv > products.csv
+
+Import validates every row like POST /api/products/import and prints a JSON
+report of inserted/failed rows; export streams through a server-side cursor.
+"""
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.db.database import SessionLocal
+from app.core.catalog_io import (
+    FORMATS,
+    IMPORT_BATCH_SIZE,
+    export_products,
+    import_products,
+    iter_records,
+)
+import app.models  # noqa: F401 — register SQLAlchemy models with Base.metadata
+
+
+def _guess_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def run_import(path: str, fmt: str, batch_size: int) -> int:
+    db = SessionLocal()
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as handle:
+            report = import_products(db, iter_records(handle, fmt), batch_size=batch_size)
+    finally:
+        db.close()
+    print(report.model_dump_json(indent=2))
+    print(f"✓ Inserted {report.inserted} product(s), {report.failed} row(s) rejected", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def run_export(fmt: str) -> int:
+    db = SessionLocal()
+    try:
+        for chunk in export_products(db, fmt):
+            sys.stdout.write(chunk)
+    finally:
+        db.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = commands.add_parser("import", help="load products from a CSV or NDJSON file")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--format", choices=FORMATS, help="defaults from the file extension")
+    import_cmd.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    export_cmd = commands.add_parser("export", help="write the catalog to stdout")
+    export_cmd.add_argument("--format", choices=FORMATS, default="ndjson")
+
+    args = parser.parse_args()
+    if args.command == "import":
+        return run_import(args.path, args.format or _guess_format(args.path), args.batch_size)
+    return run_export(args.format)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
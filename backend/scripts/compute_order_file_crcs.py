@@ -0,0 +1,54 @@
+"""
+Precompute the CRC-32 of every order file for ZIP bundle downloads.
+
+GET /api/downloads/{order_id}/bundle computes a missing or outdated CRC on first use,
+which reads the whole file before the download starts. Run this after adding or
+replacing files in UPLOAD_DIR so customers never wait for it:
+
+    python scripts/compute_order_file_crcs.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.config import settings
+from app.core.zip_stream import refresh_crc32
+from app.db.database import SessionLocal
+import app.models  # noqa: F401 — register SQLAlchemy models with Base.metadata
+from app.models.order import OrderFile
+
+
+def compute(batch_size: int = 500) -> None:
+    updated = missing = 0
+    last_id = 0
+    with SessionLocal() as db:
+        # Keyset pages instead of a server-side cursor: committing between batches would close it
+        while True:
+            records = (
+                db.query(OrderFile)
+                .filter(OrderFile.id > last_id)
+                .order_by(OrderFile.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not records:
+                break
+            for record in records:
+                path = os.path.join(settings.UPLOAD_DIR, record.file_path)
+                try:
+                    stat_result = os.stat(path)
+                except FileNotFoundError:
+                    missing += 1
+                    print(f"  ! missing on disk: {record.file_path} (order file {record.id})")
+                    continue
+                if refresh_crc32(record, path, stat_result):
+                    updated += 1
+            last_id = records[-1].id
+            db.commit()
+            db.expunge_all()
+    print(f"✓ Computed {updated} CRC(s); {missing} file(s) missing on disk")
+
+if __name__ == "__main__":
+    compute()
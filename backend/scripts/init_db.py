@@ -8,7 +8,7 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from app.db.database import SessionLocal, engine, Base, ensure_auth_verification_columns
+from app.db.database import SessionLocal, engine, Base, ensure_auth_verification_columns, ensure_product_search
 from app.models.user import User, UserRole
 from app.models.config import SiteConfig
 from app.core.security import get_password_hash
@@ -18,6 +18,7 @@ def init_db():
     # Create all tables
     Base.metadata.create_all(bind=engine)
     ensure_auth_verification_columns()
+    ensure_product_search()
     
     db = SessionLocal()
     
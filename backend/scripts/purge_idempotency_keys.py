@@ -0,0 +1,27 @@
+"""
+Delete expired Idempotency-Key responses (older than IDEMPOTENCY_KEY_TTL_HOURS).
+
+Expired entries are already ignored and overwritten on reuse; run this from cron to
+keep the table small:
+
+    python scripts/purge_idempotency_keys.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.idempotency import purge_expired
+from app.db.database import SessionLocal
+
+
+def purge() -> None:
+    with SessionLocal() as db:
+        removed = purge_expired(db)
+        db.commit()
+    print(f"✓ Removed {removed} expired idempotency key(s)")
+
+
+if __name__ == "__main__":
+    purge()
@@ -0,0 +1,25 @@
+"""
+Delete unfinished chunked uploads with no new data for UPLOAD_SESSION_TTL_HOURS.
+
+Aborted or forgotten uploads keep their sparse data file under UPLOAD_DIR/.incoming;
+run this from cron to reclaim the space:
+
+    python scripts/purge_stale_uploads.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.config import settings
+from app.core.uploads import purge_stale_uploads
+
+
+def purge() -> None:
+    removed = purge_stale_uploads(settings.UPLOAD_SESSION_TTL_HOURS * 3600)
+    print(f"✓ Removed {removed} stale upload(s)")
+
+
+if __name__ == "__main__":
+    purge()
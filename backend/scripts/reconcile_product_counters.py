@@ -0,0 +1,37 @@
+"""
+Rebuild the denormalized engagement counters on products (like_count,
+review_count, rating_sum, rating_count, rating_1..rating_5) from product_likes
+and reviews, and popularity_score from completed orders and likes. Use it to
+backfill after bulk imports or manual SQL edits.
+
+Safe to run at any time; only rows that drifted are rewritten:
+
+    python scripts/reconcile_product_counters.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.db.database import (
+    engine,
+    ensure_product_engagement_counters,
+    ensure_product_popularity,
+    rebuild_product_counters,
+    rebuild_product_popularity,
+)
+
+
+def reconcile() -> None:
+    ensure_product_engagement_counters()
+    ensure_product_popularity()
+    with engine.begin() as connection:
+        corrected = rebuild_product_counters(connection)
+        rescored = rebuild_product_popularity(connection)
+    print(f"✓ Product counters reconciled ({corrected} row(s) corrected)")
+    print(f"✓ Popularity scores rebuilt ({rescored} row(s) changed)")
+
+
+if __name__ == "__main__":
+    reconcile()
@@ -0,0 +1,161 @@
+import asyncio
+from email.utils import formatdate
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.byte_ranges import (
+    MAX_RANGES,
+    ZEROCOPY_EXTENSION,
+    RangeFileResponse,
+    RangeMixin,
+    RangeNotSatisfiable,
+    parse_range_header,
+)
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+def test_range_senders_must_implement_send_span():
+    class Incomplete(RangeMixin):
+        pass
+
+    with pytest.raises(TypeError, match="send_span"):
+        Incomplete()
+
+
+def test_parse_single_open_and_suffix_ranges():
+    assert parse_range_header("bytes=0-99", 1000) == [(0, 99)]
+    assert parse_range_header("bytes=900-", 1000) == [(900, 999)]
+    assert parse_range_header("bytes=-100", 1000) == [(900, 999)]
+    assert parse_range_header("bytes=-5000", 1000) == [(0, 999)]
+    assert parse_range_header("bytes=990-5000", 1000) == [(990, 999)]
+    assert parse_range_header("Bytes = 0-0", 1000) == [(0, 0)]
+
+
+def test_parse_merges_overlapping_and_adjacent_ranges():
+    assert parse_range_header("bytes=500-599, 0-99,100-199, 550-650", 1000) == [(0, 199), (500, 650)]
+    # ranges past the end are dropped as long as one is satisfiable
+    assert parse_range_header("bytes=0-9,5000-6000", 1000) == [(0, 9)]
+
+
+@pytest.mark.parametrize(
+    "header", [None, "", "items=0-5", "bytes=", "bytes=5-1", "bytes=a-b", "bytes=-", "bytes=1-2-3", "bytes=١-٢"]
+)
+def test_parse_ignores_malformed_headers(header):
+    assert parse_range_header(header, 1000) is None
+
+
+def test_parse_ignores_too_many_ranges():
+    header = "bytes=" + ",".join(f"{i * 10}-{i * 10 + 1}" for i in range(MAX_RANGES + 1))
+    assert parse_range_header(header, 1000) is None
+
+
+@pytest.mark.parametrize("header,size", [("bytes=1000-", 1000), ("bytes=-0", 1000), ("bytes=0-", 0)])
+def test_parse_raises_when_nothing_is_satisfiable(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range_header(header, size)
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "guide.pdf"
+    path.write_bytes(CONTENT)
+    app = FastAPI()
+
+    @app.api_route("/file", methods=["GET", "HEAD"])
+    def download():
+        return RangeFileResponse(path, filename="guide.pdf", media_type="application/pdf")
+
+    return TestClient(app)
+
+
+def test_full_download_advertises_ranges_and_validators(client):
+    response = client.get("/file")
+    assert response.status_code == 200 and response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["last-modified"].endswith("GMT")
+
+    head = client.head("/file")
+    assert head.status_code == 200 and head.content == b""
+    assert head.headers["content-length"] == str(len(CONTENT))
+
+
+def test_single_range_is_206(client):
+    response = client.get("/file", headers={"Range": "bytes=1000-1999"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[1000:2000]
+    assert response.headers["content-range"] == f"bytes 1000-1999/{len(CONTENT)}"
+    assert response.headers["content-length"] == "1000"
+
+
+def test_multiple_ranges_are_multipart_byteranges(client):
+    response = client.get("/file", headers={"Range": "bytes=0-9,-10"})
+    assert response.status_code == 206
+    content_type = response.headers["content-type"]
+    assert content_type.startswith("multipart/byteranges; boundary=")
+    boundary = content_type.split("boundary=")[1].encode()
+    assert int(response.headers["content-length"]) == len(response.content)
+
+    parts = response.content.split(b"--" + boundary)
+    assert parts[0] == b"" and parts[-1] == b"--\r\n"
+    first, last = (part.strip(b"\r\n").split(b"\r\n\r\n", 1) for part in parts[1:-1])
+    assert b"Content-Range: bytes 0-9/10240" in first[0] and first[1] == CONTENT[:10]
+    assert b"Content-Range: bytes 10230-10239/10240" in last[0] and last[1] == CONTENT[-10:]
+    assert b"Content-Type: application/pdf" in first[0]
+
+
+def test_unsatisfiable_range_is_416(client):
+    response = client.get("/file", headers={"Range": "bytes=20000-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert response.content == b""
+
+
+def test_if_range_resumes_only_the_same_version(client):
+    etag = client.head("/file").headers["etag"]
+    same = client.get("/file", headers={"Range": "bytes=10-19", "If-Range": etag})
+    assert same.status_code == 206 and same.content == CONTENT[10:20]
+
+    changed = client.get("/file", headers={"Range": "bytes=10-19", "If-Range": '"older"'})
+    assert changed.status_code == 200 and changed.content == CONTENT
+    weak = client.get("/file", headers={"Range": "bytes=10-19", "If-Range": f"W/{etag}"})
+    assert weak.status_code == 200
+
+    stale_date = formatdate(0, usegmt=True)
+    assert client.get("/file", headers={"Range": "bytes=10-19", "If-Range": stale_date}).status_code == 200
+
+
+def test_conditional_get_is_304(client):
+    first = client.get("/file")
+    again = client.get("/file", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == first.headers["etag"]
+
+    since = client.get("/file", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert since.status_code == 304
+
+
+def test_zero_copy_extension_is_used_when_advertised(tmp_path):
+    path = tmp_path / "guide.pdf"
+    path.write_bytes(CONTENT)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"range", b"bytes=100-199,300-")],
+        "extensions": {ZEROCOPY_EXTENSION: {}},
+    }
+    messages = []
+
+    async def send(message):
+        if message["type"] == ZEROCOPY_EXTENSION:
+            message = dict(message, file=message["file"].name)
+        messages.append(message)
+
+    asyncio.run(RangeFileResponse(path)(scope, None, send))
+    zerocopy = [(m["offset"], m["count"]) for m in messages if m["type"] == ZEROCOPY_EXTENSION]
+    assert zerocopy == [(100, 100), (300, len(CONTENT) - 300)]
+    assert messages[0]["status"] == 206
+    assert messages[-1]["more_body"] is False
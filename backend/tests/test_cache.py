@@ -0,0 +1,56 @@
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_miss_counters():
+    cache = TTLCache(max_entries=4, ttl_seconds=10, clock=FakeClock())
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2, ttl_seconds=10, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=2, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 5
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidate_where_keeps_other_namespaces():
+    cache = TTLCache(max_entries=8, ttl_seconds=10, clock=FakeClock())
+    cache.set(("list", None), [])
+    cache.set(("search", "poulet"), [])
+    cache.set(("detail", 1), {})
+    cache.invalidate_where(lambda key: key[0] != "detail")
+    assert cache.get(("detail", 1)) == {}
+    assert cache.get(("list", None)) is None
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_zero_capacity_disables_cache():
+    cache = TTLCache(max_entries=0, ttl_seconds=10)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,45 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.products import CatalogFilters, _facets_statement, catalog_filters
+from app.models.product import Product
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}))
+
+
+def test_catalog_filters_are_normalized_and_hashable():
+    filters = catalog_filters(
+        featured=None,
+        category=["poulets", "porcs", "poulets"],
+        format=None,
+        min_price=None,
+        max_price=None,
+        bestseller=None,
+        on_offer=None,
+    )
+    assert filters.categories == ("porcs", "poulets")
+    assert hash(("list", filters)) == hash(("list", CatalogFilters(categories=("porcs", "poulets"))))
+
+
+def test_no_filters_leave_listing_unfiltered():
+    assert "WHERE" not in _sql(CatalogFilters().apply(select(Product.id)))
+
+
+def test_filters_compile_to_indexed_predicates():
+    filters = CatalogFilters(categories=("porcs",), formats=("pdf", "video"), min_price=1000, on_offer=True)
+    sql = _sql(filters.apply(select(Product.id)))
+    assert "products.category IN (%(category_1_1)s)" in sql
+    assert "products.format IN (%(format_1_1)s, %(format_1_2)s)" in sql
+    assert "products.price >= %(price_1)s" in sql
+    assert "products.offer_end_date > now()" in sql
+
+
+def test_facets_use_one_grouping_sets_query_with_disjunctive_counts():
+    sql = _sql(_facets_statement(CatalogFilters(categories=("porcs",), max_price=5000), None))
+    assert "GROUP BY GROUPING SETS((products.category), (products.format), ())" in sql
+    # The facet selection is applied per aggregate, not in WHERE, so other values still get counts.
+    where = sql.split("WHERE products.price")[0]
+    assert "FILTER (WHERE products.category IN" in where
+    assert sql.count("FROM products") == 1
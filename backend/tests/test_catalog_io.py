@@ -0,0 +1,42 @@
+import io
+
+from app.core.catalog_io import EXPORT_COLUMNS, IMPORT_COLUMNS, iter_records, validate_record
+
+
+def test_csv_rows_drop_empty_cells_and_keep_line_numbers():
+    body = io.StringIO(
+        "title,price,featured,format,description\n"
+        "Guide poulets,2500,true,PDF Guide,\n"
+        '"Guide, porcs",3000,,,"multi\nline"\n'
+    )
+    records = list(iter_records(body, "csv"))
+    assert records[0] == (2, {"title": "Guide poulets", "price": "2500", "featured": "true", "format": "PDF Guide"})
+    assert records[1] == (4, {"title": "Guide, porcs", "price": "3000", "description": "multi\nline"})
+
+
+def test_csv_row_with_extra_cells_is_an_error():
+    records = list(iter_records(io.StringIO("title,price\nA,1,oops\n"), "csv"))
+    assert records == [(2, "more cells than header columns")]
+
+
+def test_ndjson_reports_bad_lines_and_skips_blank_ones():
+    body = io.StringIO('{"title": "A", "price": 1}\n\nnot json\n[1]\n')
+    records = list(iter_records(body, "ndjson"))
+    assert records[0] == (1, {"title": "A", "price": 1})
+    assert records[1][0] == 3 and records[1][1].startswith("invalid JSON")
+    assert records[2] == (4, "expected a JSON object")
+
+
+def test_validate_record_maps_format_and_collects_errors():
+    values, errors = validate_record({"title": "A", "price": "2500", "format": "E-book", "featured": "yes"})
+    assert errors == []
+    assert values["content_format"] == "E-book" and values["featured"] is True and "format" not in values
+
+    values, errors = validate_record({"price": "cheap"})
+    assert values is None
+    assert any(error.startswith("title:") for error in errors)
+    assert any(error.startswith("price:") for error in errors)
+
+
+def test_export_columns_round_trip_into_import():
+    assert EXPORT_COLUMNS[1 : 1 + len(IMPORT_COLUMNS)] == IMPORT_COLUMNS
@@ -0,0 +1,49 @@
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.core.http_cache import conditional_response, etag_matches, make_etag
+
+
+def _request(if_none_match=None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+def test_make_etag_is_strong_and_stable():
+    etag = make_etag(1, "2026-10-18T00:00:00", 3)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(1, "2026-10-18T00:00:00", 3)
+    assert etag != make_etag(1, "2026-10-18T00:00:00", 4)
+
+
+def test_etag_matches_lists_weak_and_star():
+    etag = make_etag("x")
+    assert etag_matches(_request(f'"other", {etag}'), etag)
+    assert etag_matches(_request(f"W/{etag}"), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('"other"'), etag)
+    assert not etag_matches(_request(), etag)
+
+
+def test_conditional_response_round_trip():
+    app = FastAPI()
+    builds = []
+
+    @app.get("/thing")
+    def thing(request: Request, response: Response):
+        not_modified = conditional_response(request, response, make_etag("v1"), "public, no-cache")
+        if not_modified is not None:
+            return not_modified
+        builds.append(1)
+        return {"value": 1}
+
+    client = TestClient(app)
+    first = client.get("/thing")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, no-cache"
+
+    second = client.get("/thing", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+    assert len(builds) == 1
@@ -0,0 +1,99 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql
+
+from app.core import idempotency
+from app.core.shaping import ResponseShape
+from app.dependencies.idempotency import get_idempotency_key
+from app.models.idempotency_key import IdempotencyKey
+from app.models.product import Product
+from app.models.user import User
+from app.schemas.order import PaymentRequest
+
+def test_fingerprint_depends_on_scope_and_body_only():
+    body = PaymentRequest(payment_method="mobile_money")
+    same = idempotency.request_fingerprint("orders.payment:1", PaymentRequest(paymentMethod="mobile_money"))
+    assert idempotency.request_fingerprint("orders.payment:1", body) == same
+    assert idempotency.request_fingerprint("orders.payment:2", body) != same
+    assert idempotency.request_fingerprint("orders.payment:1", PaymentRequest(payment_method="online")) != same
+
+
+def test_replay_restores_status_body_and_shape():
+    body = {"id": 7, "order_number": "ORD-1", "created_at": "2026-10-18T00:00:00", "createdAt": "2026-10-18T00:00:00"}
+    stored = IdempotencyKey(status_code=201, body=idempotency.encode_body(body))
+    assert len(stored.body) < len(repr(body))
+
+    response = idempotency.replay(stored, ResponseShape())
+    assert response.status_code == 201
+    assert response.headers[idempotency.REPLAYED_HEADER] == "true"
+    assert response.body == b'{"id":7,"order_number":"ORD-1","created_at":"2026-10-18T00:00:00","createdAt":"2026-10-18T00:00:00"}'
+
+    camel = idempotency.replay(stored, ResponseShape(shape="camel"))
+    assert camel.body == b'{"id":7,"orderNumber":"ORD-1","createdAt":"2026-10-18T00:00:00"}'
+
+
+def test_store_is_one_upsert():
+    sql = str(idempotency.store_statement(1, "k", "f", 201, {"id": 1}).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO idempotency_keys")
+    assert "ON CONFLICT (user_id, key) DO UPDATE SET fingerprint = " in sql
+    assert sql.endswith("expires_at = (now() + %(now_1)s)")
+
+
+def test_header_is_optional_and_bounded():
+    api = FastAPI()
+
+    @api.post("/echo")
+    def echo(key=Depends(get_idempotency_key)):
+        return {"key": key}
+
+    client = TestClient(api)
+    assert client.post("/echo").json() == {"key": None}
+    assert client.post("/echo", headers={"Idempotency-Key": "abc"}).json() == {"key": "abc"}
+    assert client.post("/echo", headers={"Idempotency-Key": "x" * 256}).status_code == 422
+
+
+@pytest.mark.postgres
+def test_concurrent_duplicates_run_once(pg_sessions):
+    engine, Session = pg_sessions
+    tag = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User).values(name="u", email=f"idem-{tag}@example.com", hashed_password="x").returning(User.id)
+        ).scalar_one()
+        product_id = conn.execute(
+            insert(Product).values(title=f"idem-{tag}", price=1.0).returning(Product.id)
+        ).scalar_one()
+    fingerprint = idempotency.request_fingerprint("test", {"product_id": product_id})
+
+    def request(_) -> bool:
+        """True when the side effect ran, False when the stored response was replayed."""
+        with Session() as db:
+            stored = idempotency.claim(db, user_id, tag)
+            if stored is not None:
+                assert stored.fingerprint == fingerprint
+                db.rollback()
+                return False
+            db.execute(
+                update(Product)
+                .where(Product.id == product_id)
+                .values(purchase_count=Product.purchase_count + 1)
+            )
+            idempotency.store(db, user_id, tag, fingerprint, 201, {"ok": True})
+            db.commit()
+            return True
+
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(request, range(64)))
+        assert results.count(True) == 1
+        with engine.connect() as conn:
+            assert conn.execute(select(Product.purchase_count).where(Product.id == product_id)).scalar_one() == 1
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Product).where(Product.id == product_id))
+            conn.execute(delete(User).where(User.id == user_id))
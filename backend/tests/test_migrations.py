@@ -0,0 +1,17 @@
+import ast
+from pathlib import Path
+
+VERSIONS = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+
+
+def test_revisions_do_not_import_app_code():
+    # A revision must keep doing what it did when written; live app code keeps changing.
+    for path in sorted(VERSIONS.glob("*.py")):
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.ImportFrom):
+                modules = [node.module or ""]
+            elif isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            else:
+                continue
+            assert not any(module == "app" or module.startswith("app.") for module in modules), path.name
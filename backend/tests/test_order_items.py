@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.order import MAX_ORDER_ITEMS, OrderCreate, OrderResponse
+
+
+def test_single_product_body_is_one_line():
+    order = OrderCreate.model_validate({"product_id": 4, "amount": 2500})
+    assert order.items is None
+    assert order.quantities() == {4: 1}
+
+
+def test_items_merge_repeated_products_in_request_order():
+    order = OrderCreate.model_validate(
+        {"items": [{"productId": 9, "quantity": 2}, {"product_id": 3}, {"product_id": 9}]}
+    )
+    assert list(order.quantities().items()) == [(9, 3), (3, 1)]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {},
+        {"product_id": 4},
+        {"items": []},
+        {"items": [{"product_id": 1, "quantity": 0}]},
+        {"items": [{"product_id": i} for i in range(MAX_ORDER_ITEMS + 1)]},
+    ],
+)
+def test_invalid_bodies_are_rejected(body):
+    with pytest.raises(ValidationError):
+        OrderCreate.model_validate(body)
+
+
+def test_response_lists_lines():
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    order = SimpleNamespace(
+        id=1,
+        order_number="ORD-1",
+        user_id=2,
+        product_id=5,
+        product=None,
+        items=[SimpleNamespace(product_id=5, quantity=2, unit_price=1500.0, product=None)],
+        user=None,
+        amount=3000.0,
+        status="pending",
+        payment_method=None,
+        created_at=now,
+        updated_at=None,
+    )
+    data = OrderResponse.model_validate(order).model_dump()
+    assert data["items"] == [
+        {"product_id": 5, "quantity": 2, "unit_price": 1500.0, "product": None, "productId": 5, "unitPrice": 1500.0}
+    ]
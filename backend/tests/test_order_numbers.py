@@ -0,0 +1,47 @@
+import random
+
+from sqlalchemy import BigInteger, create_engine, literal, select
+from sqlalchemy.dialects import postgresql
+
+from app.core.order_numbers import (
+    ALPHABET,
+    MAX_VALUE,
+    PREFIX,
+    format_order_number,
+    next_order_number,
+    check_value,
+    order_number_expression,
+)
+
+SAMPLES = [1, 2, 31, 32, 1023, 1024, 123456789, MAX_VALUE]
+
+
+def test_numbers_are_fixed_width_and_sort_like_the_sequence():
+    numbers = [format_order_number(value) for value in SAMPLES]
+    assert numbers[0] == "ORD-00000001Y"
+    assert {len(number) for number in numbers} == {13}
+    assert sorted(numbers) == numbers
+
+
+def test_check_character_catches_single_substitutions():
+    rng = random.Random(7)
+    for _ in range(200):
+        number = format_order_number(rng.randint(1, MAX_VALUE))
+        *digits, check = [ALPHABET.index(char) for char in number[len(PREFIX):]]
+        position = rng.randrange(len(digits))
+        digits[position] = rng.choice([d for d in range(len(ALPHABET)) if d != digits[position]])
+        assert check_value(digits) != check
+
+
+def test_sql_expression_matches_python():
+    # The expression only uses integer ops, CAST and substr, so SQLite can evaluate it too.
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        for value in SAMPLES:
+            sql = conn.execute(select(order_number_expression(literal(value, BigInteger)))).scalar()
+            assert sql == format_order_number(value)
+
+
+def test_sequence_is_read_once_per_number():
+    sql = str(next_order_number().compile(dialect=postgresql.dialect()))
+    assert sql.count("nextval('order_number_seq')") == 1
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    keyset_order_by,
+)
+from app.models.product import Product
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trips_datetimes_and_numbers():
+    created = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor("newest", [created, 42])
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "newest", 2) == [created, 42]
+
+
+def test_cursor_rejects_other_sort_order():
+    cursor = encode_cursor("relevance", [0.5, 3])
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "newest", 2)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor("newest", [1])])
+def test_cursor_rejects_garbage(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "newest", 2)
+
+
+def test_uniform_keyset_uses_row_comparison():
+    keys = [(Product.created_at, True), (Product.id, True)]
+    sql = _sql(keyset_condition(keys, [datetime(2026, 1, 1), 7]))
+    assert sql.startswith("(products.created_at, products.id) < (")
+    assert [_sql(c) for c in keyset_order_by(keys)] == ["products.created_at DESC", "products.id DESC"]
+
+
+def test_mixed_keyset_expands_to_or_chain():
+    keys = [(Product.price, False), (Product.id, True)]
+    sql = _sql(keyset_condition(keys, [10.0, 7]))
+    assert "products.price >" in sql
+    assert "products.price = " in sql and "products.id <" in sql
+    assert " OR " in sql
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import any_, select
+from sqlalchemy.dialects import postgresql
+
+from app.api.dependencies import get_optional_current_user
+from app.api.v1 import products
+from app.api.v1.products import _id_array, _parse_ids
+from app.db.database import get_db
+from app.models.product import Product
+from app.schemas.product import MAX_BATCH_IDS, ProductBatchResponse, ProductDetailResponse
+
+
+def test_parse_ids_keeps_request_order():
+    assert _parse_ids("3, 1,2,,3", "en") == [3, 1, 2, 3]
+
+
+@pytest.mark.parametrize("raw", ["", "1,abc", ",".join(["1"] * (MAX_BATCH_IDS + 1))])
+def test_parse_ids_rejects_bad_lists(raw):
+    with pytest.raises(HTTPException) as excinfo:
+        _parse_ids(raw, "fr")
+    assert excinfo.value.status_code == 400
+    assert str(MAX_BATCH_IDS) in excinfo.value.detail
+
+
+def test_batch_lookup_binds_one_array_parameter():
+    statement = select(Product.id).where(Product.id == any_(_id_array(list(range(MAX_BATCH_IDS)))))
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert "products.id = ANY (%(ids)s::INTEGER[])" in str(compiled)
+    assert len(compiled.params) == 1
+
+
+@pytest.fixture
+def batch_client(monkeypatch):
+    created = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+    def fake_batch(db, ids, viewer):
+        found = [
+            ProductDetailResponse(id=product_id, title=f"Guide {product_id}", price=5000, created_at=created)
+            for product_id in ids
+            if product_id < 100
+        ]
+        return ProductBatchResponse(items=found, missing=[product_id for product_id in ids if product_id >= 100])
+
+    monkeypatch.setattr(products, "_batch", fake_batch)
+    app = FastAPI()
+    app.include_router(products.router, prefix="/api/products")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_optional_current_user] = lambda: None
+    return TestClient(app)
+
+
+def test_batch_fields_select_product_fields(batch_client):
+    expected = {"items": [{"id": 1, "title": "Guide 1"}, {"id": 2, "title": "Guide 2"}], "missing": [404]}
+    assert batch_client.get("/api/products/batch?ids=1,2,404&fields=id,title").json() == expected
+    posted = batch_client.post("/api/products/batch?fields=id,title", json={"ids": [1, 2, 404]})
+    assert posted.json() == expected
+
+
+def test_batch_camel_shape_applies_to_items(batch_client):
+    body = batch_client.get("/api/products/batch?ids=1&shape=camel").json()
+    assert body["missing"] == [] and body["items"][0]["createdAt"]
+    assert "created_at" not in body["items"][0]
@@ -0,0 +1,188 @@
+import math
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql
+
+from app.api.dependencies import get_optional_current_user
+from app.api.v1 import products
+from app.api.v1.product_engagement import _set_like, like_statement
+from app.core.cache import product_cache
+from app.db.database import get_db
+from app.core.ranking import EPOCH, LIKE_WEIGHT, decay_rate
+from app.models.product import Product
+from app.models.product_like import ProductLike
+from app.models.user import User
+
+
+def test_like_is_a_single_idempotent_statement():
+    sql = str(like_statement(1, 2, liked=True).compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_product_like_user_product DO NOTHING" in sql
+    assert "RETURNING product_likes.product_id" in sql
+    assert "like_count=(products.like_count +" in sql
+    assert "popularity_score=(greatest(products.popularity_score" in sql
+
+
+def test_unlike_deletes_with_returning():
+    sql = str(like_statement(1, 2, liked=False).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH changed AS \n(DELETE FROM product_likes")
+    assert "RETURNING product_likes.product_id, product_likes.created_at" in sql
+    assert "RETURNING products.like_count" in sql
+    assert "popularity_score=greatest(products.popularity_score + ln(greatest(" in sql
+
+
+@pytest.mark.postgres
+def test_parallel_likes_keep_exact_count(pg_sessions):
+    engine, Session = pg_sessions
+    n_users = 2000
+    tag = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        product_id = conn.execute(
+            insert(Product).values(title=f"likes-{tag}", price=1.0).returning(Product.id)
+        ).scalar_one()
+        user_ids = conn.execute(
+            insert(User).returning(User.id),
+            [
+                {"name": "u", "email": f"like-{tag}-{i}@example.com", "hashed_password": "x"}
+                for i in range(n_users)
+            ],
+        ).scalars().all()
+
+    def set_like(user_id: int, liked: bool) -> None:
+        with Session() as db:
+            _set_like(db, product_id, user_id, liked)
+            db.commit()
+
+    def count_state():
+        with engine.connect() as conn:
+            counter = conn.execute(select(Product.like_count).where(Product.id == product_id)).scalar_one()
+            rows = conn.execute(
+                select(func.count()).select_from(ProductLike).where(ProductLike.product_id == product_id)
+            ).scalar_one()
+        return counter, rows
+
+    try:
+        # Every user likes twice: duplicates must not double count.
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            list(pool.map(lambda uid: set_like(uid, True), user_ids * 2))
+        assert count_state() == (n_users, n_users)
+
+        half = user_ids[: n_users // 2]
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            list(pool.map(lambda uid: set_like(uid, False), half * 2))
+        assert count_state() == (n_users - len(half), n_users - len(half))
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Product).where(Product.id == product_id))
+            conn.execute(delete(User).where(User.id.in_(user_ids)))
+
+
+@pytest.mark.postgres
+def test_like_unlike_cycles_score_the_like_once(pg_sessions):
+    engine, Session = pg_sessions
+    tag = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        product_id = conn.execute(
+            insert(Product).values(title=f"cycle-{tag}", price=1.0).returning(Product.id)
+        ).scalar_one()
+        user_id = conn.execute(
+            insert(User).values(name="u", email=f"cycle-{tag}@example.com", hashed_password="x").returning(User.id)
+        ).scalar_one()
+
+    def score() -> float:
+        with engine.connect() as conn:
+            return conn.execute(select(Product.popularity_score).where(Product.id == product_id)).scalar_one()
+
+    try:
+        for liked in (True, False, True, False, True):
+            with Session() as db:
+                _set_like(db, product_id, user_id, liked)
+                db.commit()
+            if not liked:
+                assert score() == pytest.approx(0.0, abs=1e-9)
+        with engine.connect() as conn:
+            liked_at = conn.execute(
+                select(ProductLike.created_at).where(ProductLike.product_id == product_id)
+            ).scalar_one()
+        # exactly one like event (plus the empty score's unit), not three
+        expected = math.log(1 + LIKE_WEIGHT * math.exp((liked_at - EPOCH).total_seconds() * decay_rate()))
+        assert score() == pytest.approx(expected, rel=1e-9)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Product).where(Product.id == product_id))
+            conn.execute(delete(User).where(User.id == user_id))
+
+
+@pytest.fixture
+def catalog(pg_sessions):
+    """Products router over one liked and reviewed product; client(viewer) browses as that user (or anonymously)."""
+    engine, Session = pg_sessions
+    tag = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        product_id = conn.execute(
+            insert(Product).values(title=f"engaged-{tag}", price=1.0).returning(Product.id)
+        ).scalar_one()
+        fan, other = conn.execute(
+            insert(User).returning(User.id, User.name),
+            [{"name": name, "email": f"engaged-{tag}-{name}@example.com", "hashed_password": "x"} for name in ("fan", "other")],
+        ).all()
+    with Session() as db:
+        _set_like(db, product_id, fan.id, True)
+        db.execute(update(Product).where(Product.id == product_id).values(review_count=3))
+        db.commit()
+
+    def session():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def client(viewer=None) -> TestClient:
+        application = FastAPI()
+        application.include_router(products.router, prefix="/api/products")
+        application.dependency_overrides[get_db] = session
+        application.dependency_overrides[get_optional_current_user] = lambda: viewer
+        return TestClient(application)
+
+    product_cache.clear()
+    yield client, product_id, fan, other
+    product_cache.clear()
+    with engine.begin() as conn:
+        conn.execute(delete(Product).where(Product.id == product_id))
+        conn.execute(delete(User).where(User.id.in_([fan.id, other.id])))
+
+
+def _listed(client: TestClient, product_id: int, **params) -> dict:
+    # Newest first: the product just created leads the first page
+    page = client.get("/api/products", params={"limit": 5, **params})
+    assert page.status_code == 200
+    return next(item for item in page.json() if item["id"] == product_id)
+
+
+@pytest.mark.postgres
+def test_listing_engagement_is_opt_in(catalog):
+    client, product_id, fan, other = catalog
+    plain = _listed(client(fan), product_id)
+    assert not {"like_count", "review_count", "liked_by_me"} & set(plain)
+
+    mine = _listed(client(fan), product_id, include="engagement")
+    assert (mine["like_count"], mine["review_count"], mine["liked_by_me"]) == (1, 3, True)
+    assert _listed(client(other), product_id, include="engagement")["liked_by_me"] is False
+    assert _listed(client(), product_id, include="engagement")["liked_by_me"] is None
+
+    response = client(fan).get("/api/products", params={"limit": 5, "include": "engagement"})
+    assert response.headers["vary"] == "Authorization"
+
+
+@pytest.mark.postgres
+def test_detail_carries_engagement_and_viewer_like(catalog):
+    client, product_id, fan, other = catalog
+    detail = client(fan).get(f"/api/products/{product_id}").json()
+    assert (detail["like_count"], detail["review_count"], detail["liked_by_me"]) == (1, 3, True)
+    assert client(other).get(f"/api/products/{product_id}").json()["liked_by_me"] is False
+    assert client().get(f"/api/products/{product_id}").json()["liked_by_me"] is None
@@ -0,0 +1,57 @@
+import math
+
+from sqlalchemy import literal, select
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.products import _SORTS
+from app.core.pagination import keyset_condition
+from app.core.ranking import EPOCH, decay_rate, log_add_exp, popularity_bump, popularity_drop, popularity_rebuild_sql
+from app.core.config import settings
+from app.models.product_like import ProductLike
+from app.schemas.product import ProductSort
+
+
+def _sql(expression) -> str:
+    return str(expression.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_decay_halves_weight_per_half_life():
+    half_life = settings.POPULARITY_HALF_LIFE_DAYS * 86400
+    assert math.isclose(math.exp(decay_rate() * half_life), 2.0)
+
+
+def test_log_add_exp_is_overflow_safe():
+    sql = _sql(log_add_exp(literal(1000.0), literal(999.0)))
+    assert sql.startswith("greatest(1000.0, 999.0) + ln(1 + exp(-abs(1000.0 - 999.0)))")
+
+
+def test_popularity_bump_uses_database_clock():
+    sql = _sql(popularity_bump(literal(0.0), 3.0))
+    assert f"EXTRACT(epoch FROM now()) - {EPOCH.timestamp()}" in sql
+    assert str(math.log(3.0)) in sql
+
+
+def test_popularity_drop_is_overflow_safe_and_floored():
+    sql = _sql(popularity_drop(literal(5.0), 1.0, ProductLike.created_at))
+    assert sql.startswith("greatest(5.0 + ln(greatest(1 - exp(least(")
+    assert "EXTRACT(epoch FROM product_likes.created_at)" in sql
+    assert sql.endswith(", 0)")
+
+
+def test_rebuild_counts_completed_orders_and_likes():
+    sql = popularity_rebuild_sql()
+    assert "FROM orders o JOIN order_items i ON i.order_id = o.id" in sql
+    assert "WHERE o.status = 'COMPLETED'" in sql
+    assert "FROM product_likes" in sql
+
+
+def test_every_sort_has_a_unique_final_key():
+    assert set(_SORTS) == set(ProductSort)
+    for keys in _SORTS.values():
+        assert keys[-1][0].key == "id"
+
+
+def test_top_rated_keyset_uses_indexed_expression():
+    keys = _SORTS[ProductSort.TOP_RATED]
+    sql = _sql(select(literal(1)).where(keyset_condition(keys, [4.5, 10, 7])))
+    assert "(coalesce(CAST(products.rating_sum AS FLOAT) / nullif(products.rating_count, 0), 0.0)," in sql
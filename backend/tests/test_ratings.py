@@ -0,0 +1,38 @@
+from app.api.v1.product_engagement import _rating_deltas
+from app.api.v1.products import _STATS_COLUMNS, _stats
+from app.db.database import PRODUCT_COUNTERS, PRODUCT_COUNTERS_REBUILD_SQL
+from app.schemas.product import ProductDetailResponse
+
+
+def test_new_rating_fills_its_bucket():
+    assert _rating_deltas(None, 4) == {"rating_sum": 4, "rating_count": 1, "rating_4": 1}
+
+
+def test_changed_rating_moves_between_buckets():
+    assert _rating_deltas(2, 5) == {"rating_sum": 3, "rating_count": 0, "rating_2": -1, "rating_5": 1}
+
+
+def test_unchanged_rating_nets_to_zero():
+    deltas = _rating_deltas(3, 3)
+    assert not any(deltas.values())
+
+
+def test_removed_rating_leaves_its_bucket():
+    assert _rating_deltas(1, None) == {"rating_sum": -1, "rating_count": -1, "rating_1": -1}
+
+
+def test_stats_average_and_histogram():
+    stats = _stats(2, 3, 13, 3, 0, 0, 1, 1, 1)
+    assert stats["average_rating"] == 4.33
+    assert stats["rating_histogram"] == {1: 0, 2: 0, 3: 1, 4: 1, 5: 1}
+    assert _stats(0, 0, 0, 0, 0, 0, 0, 0, 0)["average_rating"] == 0.0
+
+
+def test_stats_columns_match_rebuild():
+    assert tuple(column.key for column in _STATS_COLUMNS) == PRODUCT_COUNTERS
+    for name in PRODUCT_COUNTERS:
+        assert f"{name} = c.{name}" in PRODUCT_COUNTERS_REBUILD_SQL
+
+
+def test_detail_response_defaults_to_empty_histogram():
+    assert set(ProductDetailResponse.model_fields["rating_histogram"].default_factory()) == {1, 2, 3, 4, 5}
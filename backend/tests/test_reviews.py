@@ -0,0 +1,128 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql
+
+from app.api.dependencies import get_current_user
+from app.api.v1 import product_engagement
+from app.api.v1.product_engagement import _REVIEW_KEYS, _invalidate_reviews, _review_rows
+from app.core.cache import product_cache
+from app.core.pagination import keyset_condition
+from app.db.database import get_db
+from app.models.product import Product
+from app.models.review import Review
+from app.models.user import User, UserRole
+
+
+def test_review_projection_selects_only_response_fields():
+    sql = str(_review_rows().compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT reviews.id, reviews.product_id, reviews.user_id, users.name AS user_name,")
+    assert "password" not in sql and "token" not in sql
+    assert "JOIN users ON users.id = reviews.user_id" in sql
+
+
+def test_review_cursor_is_a_row_comparison():
+    statement = _review_rows().where(Review.product_id == 1, keyset_condition(_REVIEW_KEYS, ["t", 5]))
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "(reviews.created_at, reviews.id) < (" in sql
+
+
+def test_review_writes_drop_only_that_products_pages():
+    product_cache.clear()
+    product_cache.set(("reviews", 1, 50), ([], None))
+    product_cache.set(("reviews", 2, 50), ([], None))
+    product_cache.set(("detail", 1), "product")
+    _invalidate_reviews(1)
+    assert product_cache.get(("reviews", 1, 50)) is None
+    assert product_cache.get(("detail", 1)) is None
+    assert product_cache.get(("reviews", 2, 50)) == ([], None)
+    product_cache.clear()
+
+
+@pytest.fixture
+def engagement(pg_sessions):
+    """Client for the review/like routes as one of two users (an author and an admin), and a product."""
+    engine, Session = pg_sessions
+    tag = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        product_id = conn.execute(
+            insert(Product).values(title=f"counters-{tag}", price=1.0).returning(Product.id)
+        ).scalar_one()
+        users = conn.execute(
+            insert(User).returning(User.id, User.name, User.role),
+            [
+                {"name": name, "email": f"counters-{tag}-{name}@example.com", "hashed_password": "x", "role": role}
+                for name, role in (("author", UserRole.USER), ("admin", UserRole.ADMIN))
+            ],
+        ).all()
+
+    def session():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def client_as(user) -> TestClient:
+        application = FastAPI()
+        application.include_router(product_engagement.router, prefix="/api/products")
+        application.dependency_overrides[get_db] = session
+        application.dependency_overrides[get_current_user] = lambda: user
+        return TestClient(application)
+
+    def counters():
+        with engine.connect() as conn:
+            return conn.execute(
+                select(
+                    Product.review_count, Product.rating_sum, Product.rating_count,
+                    Product.rating_2, Product.rating_5, Product.like_count,
+                ).where(Product.id == product_id)
+            ).one()._asdict()
+
+    product_cache.clear()
+    yield [client_as(user) for user in users], product_id, counters
+    product_cache.clear()
+    with engine.begin() as conn:
+        conn.execute(delete(Product).where(Product.id == product_id))
+        conn.execute(delete(User).where(User.id.in_([user.id for user in users])))
+
+
+@pytest.mark.postgres
+def test_review_writes_maintain_counters(engagement):
+    (author, _), product_id, counters = engagement
+    url = f"/api/products/{product_id}/reviews"
+    review = author.post(url, json={"body": "Utile", "rating": 5}).json()
+    assert counters() == dict(review_count=1, rating_sum=5, rating_count=1, rating_2=0, rating_5=1, like_count=0)
+
+    assert author.patch(f"{url}/{review['id']}", json={"rating": 2}).status_code == 200
+    assert counters() == dict(review_count=1, rating_sum=2, rating_count=1, rating_2=1, rating_5=0, like_count=0)
+
+    assert author.delete(f"{url}/{review['id']}").status_code == 204
+    assert counters() == dict(review_count=0, rating_sum=0, rating_count=0, rating_2=0, rating_5=0, like_count=0)
+
+
+@pytest.mark.postgres
+def test_concurrent_deletes_decrement_once(engagement):
+    (author, admin), product_id, counters = engagement
+    url = f"/api/products/{product_id}/reviews"
+    review = author.post(url, json={"body": "Utile", "rating": 5}).json()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        codes = list(pool.map(lambda client: client.delete(f"{url}/{review['id']}").status_code, [author, admin] * 4))
+    assert sorted(codes) == [204] + [404] * 7
+    assert counters()["review_count"] == 0 and counters()["rating_5"] == 0
+
+
+@pytest.mark.postgres
+def test_like_and_unlike_maintain_like_count(engagement):
+    (author, admin), product_id, counters = engagement
+    url = f"/api/products/{product_id}/like"
+    assert author.post(url).json() == {"liked": True, "like_count": 1}
+    assert author.post(url).json() == {"liked": True, "like_count": 1}
+    assert admin.post(url).json() == {"liked": True, "like_count": 2}
+    assert author.delete(url).json() == {"liked": False, "like_count": 1}
+    assert author.delete(url).json() == {"liked": False, "like_count": 1}
+    assert counters()["like_count"] == 1
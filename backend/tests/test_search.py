@@ -0,0 +1,210 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import products
+from app.core.cache import product_cache
+from app.core.shaping import ResponseShape
+from app.db.database import get_db, product_search_ddl
+from app.models.product import Product
+
+from app.core.search import (
+    MAX_SEARCH_TERMS,
+    MAX_SUGGEST_QUERY_LENGTH,
+    build_prefix_tsquery,
+    escape_like,
+    normalize_suggest_query,
+    product_search,
+    suggest_statement,
+)
+
+
+def test_build_prefix_tsquery_matches_each_word_as_prefix():
+    assert build_prefix_tsquery("poulets chair") == "poulets:* & chair:*"
+
+
+def test_build_prefix_tsquery_keeps_accents_for_unaccent():
+    assert build_prefix_tsquery("Élevage") == "Élevage:*"
+
+
+def test_build_prefix_tsquery_strips_tsquery_syntax():
+    assert build_prefix_tsquery("porcs & (lapins | !chèvres):*") == "porcs:* & lapins:* & chèvres:*"
+
+
+def test_build_prefix_tsquery_without_words_is_none():
+    assert build_prefix_tsquery("%_&!") is None
+    assert product_search("  ") is None
+
+
+def test_build_prefix_tsquery_caps_terms():
+    expression = build_prefix_tsquery(" ".join(f"w{i}" for i in range(50)))
+    assert expression.count(":*") == MAX_SEARCH_TERMS
+
+
+def test_product_search_uses_gin_vector_and_rank():
+    condition, rank = product_search("vaccination")
+    sql = str(condition.compile(dialect=postgresql.dialect()))
+    assert "products.search_vector @@ to_tsquery(CAST(" in sql
+    assert "AS REGCONFIG)" in sql
+    assert str(rank.compile(dialect=postgresql.dialect())).startswith("CAST(ts_rank(products.search_vector")
+    assert str(rank.compile(dialect=postgresql.dialect())).endswith(" AS FLOAT)")  # float8, like the cursor value
+
+
+def _suggest_sql(q: str) -> str:
+    return str(suggest_statement(q, 8).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_normalize_suggest_query_collapses_and_caps():
+    assert normalize_suggest_query("  Poulets   DE chair ") == "poulets de chair"
+    assert len(normalize_suggest_query("x" * 500)) == MAX_SUGGEST_QUERY_LENGTH
+
+
+def test_suggest_uses_substring_trigram_match_and_ranks_prefixes_first():
+    sql = _suggest_sql("vacc")
+    assert "WHERE lower(products.title) LIKE '%%vacc%%'" in sql
+    assert "ORDER BY lower(products.title) LIKE 'vacc%%'" in sql
+    assert "similarity(lower(products.title), 'vacc') DESC" in sql
+    assert sql.rstrip().endswith("LIMIT 8")
+
+
+def test_suggest_short_input_uses_prefix_only():
+    assert "WHERE lower(products.title) LIKE 'po%%'" in _suggest_sql("po")
+
+
+def test_suggest_escapes_like_wildcards():
+    assert escape_like("50%_off") == "50\\%\\_off"
+    params = suggest_statement("50%_off", 8).compile(dialect=postgresql.dialect()).params
+    assert "%50\\%\\_off%" in params.values()
+
+
+def _catalog_product(product_id: int, title: str) -> Product:
+    return Product(
+        id=product_id,
+        title=title,
+        price=5000.0,
+        featured=False,
+        bestseller=False,
+        sold=0,
+        purchase_count=0,
+        created_at=datetime(2026, 10, 18, tzinfo=timezone.utc),
+    )
+
+
+def test_stream_lines_are_one_json_document_each():
+    items = [_catalog_product(1, "Élevage de poulets\nde chair"), _catalog_product(2, 'Guide "porcs"')]
+    lines = list(products._ndjson_lines(items, ResponseShape()))
+    assert all(line.endswith("\n") and line.count("\n") == 1 for line in lines)
+    assert [json.loads(line)["title"] for line in lines] == ["Élevage de poulets\nde chair", 'Guide "porcs"']
+
+    shaped = list(products._ndjson_lines(items, ResponseShape(fields=("id", "title"))))
+    assert json.loads(shaped[0]) == {"id": 1, "title": "Élevage de poulets\nde chair"}
+    assert "Élevage" in shaped[0]  # UTF-8, not \\u escapes
+
+
+@pytest.fixture
+def search_api(pg_engine, monkeypatch):
+    """Search routes over a disposable database holding `count` products whose titles share a unique word."""
+    with pg_engine.begin() as conn:
+        for statement in product_search_ddl():
+            conn.execute(text(statement))
+    word = f"zq{uuid.uuid4().hex[:10]}"
+    count = 12
+    with pg_engine.begin() as conn:
+        conn.execute(
+            insert(Product),
+            # Varying repetitions give distinct relevance ranks; pairs of equal rank exercise the id tiebreak
+            [{"title": " ".join([word] * (1 + i // 2)), "price": 1.0} for i in range(count)],
+        )
+    Session = sessionmaker(bind=pg_engine)
+    monkeypatch.setattr(products, "SessionLocal", Session)
+
+    def session():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    application = FastAPI()
+    application.include_router(products.router, prefix="/api/products")
+    application.dependency_overrides[get_db] = session
+    product_cache.clear()
+    yield TestClient(application), word, count
+    product_cache.clear()
+    with pg_engine.begin() as conn:
+        conn.execute(delete(Product).where(Product.title.like(f"{word}%")))
+
+
+@pytest.mark.postgres
+def test_search_cursor_pages_are_stable(search_api):
+    client, word, count = search_api
+    first = client.get("/api/products/search", params={"q": word, "limit": 5})
+    assert first.headers["X-Total-Count"] == str(count) and first.headers["X-Total-Count-Exact"] == "true"
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": word, "limit": 5, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/products/search", params=params)
+        seen += [item["id"] for item in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == count
+    assert [item["id"] for item in first.json()] == seen[:5]
+    # a repeated page request resolves the same cursor to the same rows
+    second_cursor = first.headers["X-Next-Cursor"]
+    product_cache.clear()
+    again = client.get("/api/products/search", params={"q": word, "limit": 5, "cursor": second_cursor})
+    assert [item["id"] for item in again.json()] == seen[5:10]
+
+
+@pytest.mark.postgres
+def test_search_total_is_capped(search_api, monkeypatch):
+    client, word, count = search_api
+    monkeypatch.setattr(products, "SEARCH_COUNT_CAP", count - 2)
+    response = client.get("/api/products/search", params={"q": word, "limit": 3})
+    assert response.headers["X-Total-Count"] == str(count - 2)
+    assert response.headers["X-Total-Count-Exact"] == "false"
+    assert len(response.json()) == 3
+
+
+@pytest.mark.postgres
+def test_search_stream_is_ndjson_of_every_match(search_api):
+    client, word, count = search_api
+    paged = client.get("/api/products/search", params={"q": word, "limit": 100}).json()
+    response = client.get("/api/products/search", params={"q": word, "stream": "true", "fields": "id,title"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.endswith("\n")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [item["id"] for item in paged]
+    assert all(set(row) == {"id", "title"} for row in rows) and len(rows) == count
+
+
+@pytest.mark.postgres
+def test_search_pages_through_many_tied_ranks(search_api, pg_engine):
+    client, _, _ = search_api
+    word = f"zq{uuid.uuid4().hex[:10]}"
+    ties = 23  # identical titles: one rank shared across several pages
+    with pg_engine.begin() as conn:
+        conn.execute(insert(Product), [{"title": word, "price": 1.0} for _ in range(ties)])
+    try:
+        seen, cursor = [], None
+        for _ in range(ties):  # bounded: a cursor that does not advance would loop forever
+            params = {"q": word, "limit": 5, **({"cursor": cursor} if cursor else {})}
+            page = client.get("/api/products/search", params=params)
+            seen += [item["id"] for item in page.json()]
+            cursor = page.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert sorted(seen) == sorted(set(seen)) and len(seen) == ties
+        assert seen == sorted(seen, reverse=True)  # ties fall back to id order
+    finally:
+        with pg_engine.begin() as conn:
+            conn.execute(delete(Product).where(Product.title == word))
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.shaping import ResponseShape, field_tree, parse_fields, to_camel, to_snake
+from app.schemas.order import OrderResponse
+from app.schemas.product import ProductResponse
+
+CREATED = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+def _product() -> ProductResponse:
+    return ProductResponse(
+        id=1,
+        title="Guide de l'élevage",
+        price=5000,
+        original_price=7000,
+        image_url="/uploads/guide.png",
+        offer_end_date=None,
+        created_at=CREATED,
+    )
+
+
+def _order() -> OrderResponse:
+    return OrderResponse(
+        id=7,
+        order_number="ORD-1",
+        user_id=3,
+        product_id=1,
+        product=_product(),
+        amount=5000,
+        status="completed",
+        created_at=CREATED,
+    )
+
+
+def test_name_conversions_round_trip():
+    assert to_camel("offer_end_date") == "offerEndDate"
+    assert to_snake("offerEndDate") == "offer_end_date"
+    assert to_camel("id") == "id"
+
+
+def test_parse_fields_normalizes_and_nests():
+    assert parse_fields(" title,imageUrl,,product.createdAt ") == ("image_url", "product.created_at", "title")
+    assert field_tree(("product", "product.title", "id")) == {"product": None, "id": None}
+    assert field_tree(("product.title", "product.id")) == {"product": {"title": None, "id": None}}
+
+
+def test_inactive_shape_keeps_legacy_payload():
+    payload = jsonable_encoder(_product())
+    assert ResponseShape().apply(payload) is payload
+
+
+def test_snake_shape_drops_camel_twins_and_aliases():
+    payload = ResponseShape(shape="snake").apply(jsonable_encoder(_product()))
+    assert "image_url" in payload and "imageUrl" not in payload
+    assert "download_count" not in payload and "discount_end_date" not in payload
+    assert all(key == to_snake(key) for key in payload)
+
+
+def test_camel_shape_emits_single_convention_for_nested_orders():
+    payload = ResponseShape(shape="camel").apply(jsonable_encoder(_order()))
+    assert payload["orderNumber"] == "ORD-1"
+    assert "order_number" not in payload and "total" not in payload
+    assert payload["product"]["imageUrl"] == "/uploads/guide.png"
+    assert "image_url" not in payload["product"]
+
+
+def test_fields_select_nested_paths():
+    shape = ResponseShape(fields=parse_fields("id,orderNumber,product.title"), shape="camel")
+    payload = shape.apply(jsonable_encoder([_order()]))
+    assert payload == [{"id": 7, "orderNumber": "ORD-1", "product": {"title": "Guide de l'élevage"}}]
+
+
+def test_shaped_payload_is_smaller():
+    full = jsonable_encoder(_order())
+    slim = ResponseShape(shape="snake").apply(full)
+    assert len(str(slim)) < 0.7 * len(str(full))
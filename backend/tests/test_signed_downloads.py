@@ -0,0 +1,87 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import downloads
+from app.core.config import settings
+from app.core.signed_urls import InvalidDownloadToken, SignedFile, decode_token, encode_token
+from app.db.database import get_db
+
+CONTENT = b"%PDF-1.7 " + b"x" * 4000
+
+
+def _signed(path="orders/guide.pdf", name="Guide élevage.pdf", ttl=60) -> SignedFile:
+    return SignedFile(file_id=7, path=path, name=name, expires_at=int(time.time()) + ttl)
+
+
+def test_token_round_trip_is_url_safe():
+    signed = _signed()
+    token = encode_token(signed)
+    assert decode_token(token) == signed
+    assert all(char.isalnum() or char in "-_." for char in token)
+
+
+def test_tampered_or_expired_tokens_are_rejected():
+    token = encode_token(_signed())
+    payload, _, signature = token.partition(".")
+    forged = encode_token(_signed(path="../../etc/passwd")).partition(".")[0]
+    for bad in (f"{forged}.{signature}", f"{payload}.{signature[:-2]}", payload, "", "é.é"):
+        with pytest.raises(InvalidDownloadToken):
+            decode_token(bad)
+    with pytest.raises(InvalidDownloadToken):
+        decode_token(token, now=time.time() + 61)
+
+
+def test_signature_depends_on_secret_key(monkeypatch):
+    token = encode_token(_signed())
+    monkeypatch.setattr(settings, "SECRET_KEY", "rotated")
+    with pytest.raises(InvalidDownloadToken):
+        decode_token(token)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "orders").mkdir()
+    (tmp_path / "orders" / "guide.pdf").write_bytes(CONTENT)
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    app = FastAPI()
+    app.include_router(downloads.router, prefix="/api/downloads")
+
+    def no_database():
+        raise AssertionError("signed downloads must not open a database session")
+        yield
+
+    app.dependency_overrides[get_db] = no_database
+    return TestClient(app)
+
+
+def test_signed_download_needs_no_auth_or_database(client):
+    response = client.get(f"/api/downloads/signed/{encode_token(_signed())}", headers={"Range": "bytes=0-8"})
+    assert response.status_code == 206 and response.content == b"%PDF-1.7 "
+    assert response.headers["content-disposition"] == "attachment; filename*=utf-8''Guide%20%C3%A9levage.pdf"
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+def test_bad_or_dangling_links(client):
+    expired = client.get(f"/api/downloads/signed/{encode_token(_signed(ttl=-1))}", headers={"Accept-Language": "fr"})
+    assert expired.status_code == 403 and "expiré" in expired.json()["detail"]
+    missing = client.get(f"/api/downloads/signed/{encode_token(_signed(path='orders/gone.pdf'))}")
+    assert missing.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "mode,header,value",
+    [
+        ("x-accel-redirect", "x-accel-redirect", "/protected-uploads/orders/guide%20v2.pdf"),
+        ("x-sendfile", "x-sendfile", "orders/guide v2.pdf"),
+    ],
+)
+def test_offload_hands_the_file_to_the_web_server(client, monkeypatch, mode, header, value):
+    monkeypatch.setattr(settings, "DOWNLOAD_OFFLOAD", mode)
+    response = client.get(f"/api/downloads/signed/{encode_token(_signed(path='orders/guide v2.pdf', name='g.pdf'))}")
+    assert response.status_code == 200 and response.content == b""
+    assert response.headers[header].endswith(value)
+    assert response.headers["content-disposition"] == 'attachment; filename="g.pdf"'
+    assert response.headers["content-type"] == "application/pdf"
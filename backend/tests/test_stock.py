@@ -0,0 +1,184 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.api.v1.orders import _record_sales, _release_expired_reservations, _reserve_units
+from app.db.database import RESERVATION_EXPIRY_INDEX_DDL
+from app.models.order import Order
+from app.models.product import Product
+from app.schemas.product import ProductResponse, ProductUpdate, product_payload_to_orm_dict
+
+def test_positive_stock_marks_product_limited():
+    assert product_payload_to_orm_dict({"stock": 5}, creating=True)["stock_limited"] is True
+    assert product_payload_to_orm_dict({"stock": 0}, creating=True)["stock_limited"] is False
+    assert product_payload_to_orm_dict({"stock": None}, creating=True)["stock_limited"] is False
+    assert "stock_limited" not in product_payload_to_orm_dict({"title": "A"}, creating=True)
+
+
+def test_updating_stock_to_zero_keeps_product_limited():
+    assert product_payload_to_orm_dict({"stock": 0}) == {"stock": 0}
+    assert product_payload_to_orm_dict({"stock": 5})["stock_limited"] is True
+    assert product_payload_to_orm_dict({"stock": 0, "stock_limited": False})["stock_limited"] is False
+    assert "stock_limited" not in product_payload_to_orm_dict({"stock": 0, "stock_limited": None})
+
+    product = Product(id=1, title="A", price=1.0, stock=3, stock_limited=True, featured=False,
+                      bestseller=False, sold=0, purchase_count=0, created_at=datetime.now(timezone.utc))
+    for column, value in product_payload_to_orm_dict(ProductUpdate(stock=0).model_dump(exclude_unset=True)).items():
+        setattr(product, column, value)
+    assert product.stock_limited is True
+    assert ProductResponse.model_validate(product).sold_out is True
+
+
+class _Recorder:
+    """Session stand-in that captures the statements a helper executes."""
+
+    def __init__(self, returned):
+        self.statements, self.returned = [], returned
+
+    def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        returned = self.returned
+
+        class Result:
+            def all(self):
+                return returned
+
+        return Result()
+
+
+def test_sales_of_all_lines_are_one_locked_update():
+    db = _Recorder(returned=[1, 3])
+    assert _record_sales(db, {3: 1, 1: 2}, held=False)
+    (sql,) = db.statements
+    assert sql.startswith("WITH locked AS \n(SELECT products.id")
+    assert "ORDER BY products.id FOR NO KEY UPDATE" in sql
+    assert "FROM (VALUES (%(param_4)s, %(param_5)s), (%(param_6)s, %(param_7)s)) AS lines (product_id, quantity)" in sql
+    assert "products.stock >= lines.quantity" in sql
+
+
+def test_release_locks_products_in_id_order():
+    db = _Recorder(returned=[])
+    _release_expired_reservations(db)
+    (sql,) = db.statements
+    assert "locked AS \n(SELECT products.id" in sql
+    assert "WHERE products.id IN (SELECT units.product_id" in sql
+    assert "ORDER BY products.id FOR NO KEY UPDATE" in sql
+    assert "products.id IN (SELECT locked.id" in sql
+
+
+def test_reservation_fails_when_any_line_is_short():
+    assert _reserve_units(_Recorder(returned=[1]), {1: 1, 2: 5}) is None
+
+
+def test_reservation_index_serves_the_global_release_sweep():
+    (index,) = [index for index in Order.__table__.indexes if "reserved_until" in index.name]
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert ddl.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS") == RESERVATION_EXPIRY_INDEX_DDL[-1]
+    assert "(stock_reserved_until) WHERE status = 'PENDING'" in ddl
+
+
+def _seed(engine, stock: int, limited: bool = True) -> int:
+    with engine.begin() as conn:
+        return conn.execute(
+            insert(Product)
+            .values(title=f"stock-{uuid.uuid4().hex[:8]}", price=1.0, stock=stock, stock_limited=limited)
+            .returning(Product.id)
+        ).scalar_one()
+
+
+def _state(engine, product_id: int):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(Product.stock, Product.sold, Product.purchase_count).where(Product.id == product_id)
+        ).one()
+
+
+@pytest.mark.postgres
+def test_parallel_payments_never_oversell(pg_sessions):
+    engine, Session = pg_sessions
+    stock, buyers = 25, 200
+    product_id = _seed(engine, stock)
+
+    def pay(_) -> bool:
+        with Session() as db:
+            sold = _record_sales(db, {product_id: 1}, held=False)
+            db.commit()
+            return sold is not None
+
+    try:
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(pay, range(buyers)))
+        assert results.count(True) == stock
+        assert tuple(_state(engine, product_id)) == (0, stock, stock)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Product).where(Product.id == product_id))
+
+
+@pytest.mark.postgres
+def test_parallel_reservations_never_go_negative(pg_sessions):
+    engine, Session = pg_sessions
+    stock = 10
+    product_id = _seed(engine, stock)
+
+    def reserve(_):
+        with Session() as db:
+            reserved = _reserve_units(db, {product_id: 1})
+            db.commit()
+            return reserved is not None
+
+    try:
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(reserve, range(100)))
+        assert results.count(True) == stock
+        assert _state(engine, product_id).stock == 0
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Product).where(Product.id == product_id))
+
+
+@pytest.mark.postgres
+def test_unlimited_stock_is_never_decremented(pg_sessions):
+    engine, Session = pg_sessions
+    product_id = _seed(engine, 0, limited=False)
+    try:
+        with Session() as db:
+            assert _record_sales(db, {product_id: 3}, held=False)
+            assert _reserve_units(db, {product_id: 1}) is None
+            db.commit()
+        assert tuple(_state(engine, product_id)) == (0, 0, 3)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Product).where(Product.id == product_id))
+
+
+@pytest.mark.postgres
+def test_multi_line_checkouts_are_all_or_nothing(pg_sessions):
+    engine, Session = pg_sessions
+    first, second = _seed(engine, 30), _seed(engine, 12)
+
+    def pay(n: int) -> bool:
+        # Alternate line order: rows are still locked in id order, so no deadlock.
+        lines = {first: 2, second: 1} if n % 2 else {second: 1, first: 2}
+        with Session() as db:
+            sold = _record_sales(db, lines, held=False)
+            if sold is None:
+                db.rollback()
+                return False
+            db.commit()
+            return True
+
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(pay, range(40)))
+        assert results.count(True) == 12
+        assert tuple(_state(engine, first)) == (6, 24, 24)
+        assert tuple(_state(engine, second)) == (0, 12, 12)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Product).where(Product.id.in_([first, second])))
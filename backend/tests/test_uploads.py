@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import os
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_current_admin_user
+from app.api.v1 import uploads as uploads_api
+from app.core import uploads
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "UPLOAD_PART_SIZE", 1000)
+    return tmp_path
+
+
+async def _body(data: bytes, chunk: int = 128):
+    for start in range(0, len(data), chunk):
+        await asyncio.sleep(0)  # let parallel parts interleave
+        yield data[start:start + chunk]
+
+
+def test_parallel_out_of_order_parts_assemble_atomically(upload_dir):
+    data = os.urandom(4500)
+    upload = uploads.create_upload(3, "Cours/Module 1.pdf", len(data), hashlib.sha256(data).hexdigest())
+    assert upload.part_count == 5 and upload.part_bounds(5) == (4000, 500)
+
+    async def send_all():
+        await asyncio.gather(
+            *(uploads.write_part(upload, n, _body(data[(n - 1) * 1000:n * 1000])) for n in (5, 2, 4, 1, 3))
+        )
+
+    asyncio.run(send_all())
+    assert list(uploads.stored_parts(upload)) == [1, 2, 3, 4, 5]
+    stored = uploads.finish_upload(upload)
+    assert stored.path == os.path.join("products", "3", f"{upload.id}-Module 1.pdf")
+    assert (upload_dir / stored.path).read_bytes() == data
+    assert (stored.size, stored.sha256, stored.crc32) == (len(data), hashlib.sha256(data).hexdigest(), zlib.crc32(data))
+    assert os.listdir(upload_dir / uploads.INCOMING_DIR) == []
+    with pytest.raises(uploads.UploadNotFound):
+        uploads.load_upload(upload.id)
+
+
+def test_single_part_digest_is_taken_while_writing():
+    data = b"%PDF-1.7 tiny"
+    upload = uploads.create_upload(1, "tiny.pdf", len(data))
+    receipt = asyncio.run(uploads.write_part(upload, 1, _body(data, 4)))
+    assert receipt == {"size": len(data), "sha256": hashlib.sha256(data).hexdigest(), "crc32": zlib.crc32(data)}
+    assert uploads.finish_upload(upload).sha256 == receipt["sha256"]
+
+
+def test_parts_are_held_to_their_slice():
+    upload = uploads.create_upload(1, "f.pdf", 1500)
+    with pytest.raises(uploads.PartTooLarge):
+        asyncio.run(uploads.write_part(upload, 2, _body(b"x" * 501)))
+    with pytest.raises(uploads.InvalidPart):
+        asyncio.run(uploads.write_part(upload, 1, _body(b"x" * 999)))
+    with pytest.raises(uploads.InvalidPart):
+        upload.part_bounds(3)
+    with pytest.raises(uploads.ChecksumMismatch):
+        asyncio.run(uploads.write_part(upload, 2, _body(b"x" * 500), sha256="0" * 64))
+    assert uploads.stored_parts(upload) == {}
+    with pytest.raises(uploads.IncompleteUpload):
+        uploads.finish_upload(upload)
+
+
+def test_failed_resend_unstores_the_part():
+    data = b"0123456789"
+    upload = uploads.create_upload(1, "f.pdf", len(data))
+    asyncio.run(uploads.write_part(upload, 1, _body(data)))
+    with pytest.raises(uploads.ChecksumMismatch):
+        asyncio.run(uploads.write_part(upload, 1, _body(b"9876543210"), sha256=hashlib.sha256(data).hexdigest()))
+    assert uploads.stored_parts(upload) == {}
+    with pytest.raises(uploads.IncompleteUpload):
+        uploads.finish_upload(upload)
+    with pytest.raises(uploads.InvalidPart):
+        asyncio.run(uploads.write_part(upload, 1, _body(data[:4])))
+    asyncio.run(uploads.write_part(upload, 1, _body(data)))
+    assert uploads.finish_upload(upload).sha256 == hashlib.sha256(data).hexdigest()
+
+
+def test_declared_checksum_is_verified_on_finish():
+    upload = uploads.create_upload(1, "f.pdf", 10, sha256="A" * 64)
+    asyncio.run(uploads.write_part(upload, 1, _body(b"0123456789")))
+    with pytest.raises(uploads.ChecksumMismatch):
+        uploads.finish_upload(upload)
+
+
+def test_upload_ids_cannot_escape_the_incoming_directory():
+    for bad in ("../../etc", "..", "A" * 32):
+        with pytest.raises(uploads.UploadNotFound):
+            uploads.load_upload(bad)
+
+
+def test_safe_file_name():
+    assert uploads.safe_file_name("..\\..\\évaluation finale?.pdf") == "évaluation finale_.pdf"
+    assert uploads.safe_file_name("../.hidden") == "hidden"
+    assert uploads.safe_file_name("/") == "file"
+
+
+def test_purge_removes_only_stale_uploads(upload_dir):
+    stale = uploads.create_upload(1, "old.pdf", 10)
+    fresh = uploads.create_upload(1, "new.pdf", 10)
+    data = upload_dir / uploads.INCOMING_DIR / stale.id / "data"
+    os.utime(data, (0, 0))
+    assert uploads.purge_stale_uploads(3600) == 1
+    assert uploads.load_upload(fresh.id) == fresh
+    with pytest.raises(uploads.UploadNotFound):
+        uploads.load_upload(stale.id)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(uploads_api.router, prefix="/api/admin/uploads")
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    return TestClient(app)
+
+
+def test_part_endpoints_stream_and_report_progress(client):
+    data = os.urandom(2200)
+    upload = uploads.create_upload(1, "guide.pdf", len(data))
+    url = f"/api/admin/uploads/{upload.id}"
+
+    first = client.put(f"{url}/parts/1", content=data[:1000])
+    assert first.status_code == 200
+    assert first.json() == {"part_number": 1, "size": 1000, "sha256": hashlib.sha256(data[:1000]).hexdigest()}
+
+    corrupted = client.put(f"{url}/parts/3", content=data[2000:], headers={"X-Content-SHA256": "0" * 64})
+    assert corrupted.status_code == 400
+    too_long = client.put(f"{url}/parts/3", content=data[1900:])
+    assert too_long.status_code == 413
+
+    progress = client.get(url).json()
+    assert progress["received_parts"] == [1] and progress["part_count"] == 3
+
+    assert client.put(f"{url}/parts/9", content=b"x").status_code == 400
+    assert client.get("/api/admin/uploads/" + "0" * 32, headers={"Accept-Language": "fr"}).json() == {
+        "detail": "Téléversement introuvable ou déjà terminé"
+    }
+    assert client.delete(url).status_code == 204
+    assert client.get(url).status_code == 404
@@ -0,0 +1,122 @@
+"""Statement budgets of the hot write endpoints (responses come from RETURNING, not reloads)."""
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.dependencies import get_current_admin_user, get_current_user
+from app.api.v1 import orders, product_engagement, products
+from app.db.database import get_db
+from app.models.order import Order
+from app.models.product import Product
+from app.models.user import User, UserRole
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+def api(pg_engine):
+    engine = pg_engine
+    Session = sessionmaker(bind=engine, autoflush=False)
+    tag = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User)
+            .values(name="Awa", email=f"writes-{tag}@example.com", hashed_password="x", role=UserRole.ADMIN)
+            .returning(User.id)
+        ).scalar_one()
+        product_ids = conn.execute(
+            insert(Product).returning(Product.id),
+            [
+                {"title": f"writes-{tag}-{i}", "price": 1000.0 * (i + 1), "stock": 5, "stock_limited": True}
+                for i in range(2)
+            ],
+        ).scalars().all()
+    with sessionmaker(bind=engine, expire_on_commit=False)() as db:
+        user = db.get(User, user_id)
+
+    def session():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    application = FastAPI()
+    application.include_router(products.router, prefix="/api/products")
+    application.include_router(product_engagement.router, prefix="/api/products")
+    application.include_router(orders.router, prefix="/api/orders")
+    application.dependency_overrides[get_db] = session
+    application.dependency_overrides[get_current_user] = lambda: user
+    application.dependency_overrides[get_current_admin_user] = lambda: user
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    @contextmanager
+    def counting():
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    yield TestClient(application), counting, product_ids
+    with engine.begin() as conn:
+        conn.execute(delete(Order).where(Order.user_id == user_id))
+        conn.execute(delete(Product).where(Product.title.like(f"writes-{tag}%")))
+        conn.execute(delete(User).where(User.id == user_id))
+
+
+def test_create_and_update_product_are_one_statement(api):
+    client, counting, _ = api
+    tag = uuid.uuid4().hex[:8]
+    with counting() as statements:
+        created = client.post("/api/products", json={"title": f"writes-{tag}", "price": 10})
+    assert created.status_code == 201 and created.json()["created_at"]
+    assert len(statements) == 1 and statements[0].startswith("INSERT INTO products")
+
+    with counting() as statements:
+        updated = client.put(f"/api/products/{created.json()['id']}", json={"price": 12})
+    assert updated.json()["price"] == 12 and updated.json()["updated_at"]
+    assert len(statements) == 1 and statements[0].startswith("UPDATE products")
+
+
+def test_create_review_is_one_statement(api):
+    client, counting, product_ids = api
+    with counting() as statements:
+        created = client.post(f"/api/products/{product_ids[0]}/reviews", json={"body": "Utile", "rating": 5})
+    assert created.status_code == 201
+    assert created.json()["user_name"] == "Awa"
+    assert len(statements) == 1
+
+    with counting() as statements:
+        again = client.post(f"/api/products/{product_ids[0]}/reviews", json={"body": "Encore", "rating": 4})
+    assert again.status_code == 409 and len(statements) == 1
+
+
+def test_checkout_statement_budget(api):
+    client, counting, product_ids = api
+    items = [{"product_id": product_ids[0], "quantity": 2}, {"product_id": product_ids[1]}]
+    with counting() as statements:
+        created = client.post("/api/orders", json={"items": items})
+    order = created.json()
+    assert created.status_code == 201
+    assert order["amount"] == 4000 and [item["quantity"] for item in order["items"]] == [2, 1]
+    # product lookup + one INSERT of the order and its lines
+    assert len(statements) == 2
+
+    with counting() as statements:
+        paid = client.post(f"/api/orders/{order['id']}/payment", json={"paymentMethod": "mobile_money"})
+    body = paid.json()["order"]
+    assert body["status"] == "completed"
+    assert [item["product"]["stock"] for item in body["items"]] == [3, 4]
+    # locked order load + one UPDATE over all products + the order UPDATE + attaching product files
+    assert len(statements) == 4
@@ -0,0 +1,113 @@
+import io
+import os
+import zipfile
+import zlib
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import zip_stream
+from app.core.zip_stream import ZipMember, ZipStreamResponse, file_crc32, refresh_crc32, unique_names, zip_layout
+
+
+@pytest.fixture
+def members(tmp_path):
+    contents = {"Module 1.pdf": os.urandom(3000), "Module 2 — été.pdf": b"%PDF" * 500, "vide.txt": b""}
+    result = []
+    for name, data in contents.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        result.append(ZipMember(name, str(path), len(data), zlib.crc32(data), path.stat().st_mtime))
+    return result, contents
+
+
+def _render(members) -> bytes:
+    segments, size = zip_layout(members)
+    body = b"".join(s if isinstance(s, bytes) else open(s[0], "rb").read() for s in segments)
+    assert len(body) == size
+    return body
+
+
+def test_layout_is_a_valid_stored_zip(members):
+    members, contents = members
+    archive = zipfile.ZipFile(io.BytesIO(_render(members)))
+    assert archive.testzip() is None  # every CRC checks out
+    assert archive.namelist() == list(contents)
+    for info in archive.infolist():
+        assert info.compress_type == zipfile.ZIP_STORED
+        assert archive.read(info) == contents[info.filename]
+
+
+def test_zip64_records_when_limits_are_exceeded(members, monkeypatch):
+    members, contents = members
+    monkeypatch.setattr(zip_stream, "ZIP64_LIMIT", 2000)  # stand-in for 4 GiB
+    body = _render(members)
+    assert b"PK\x06\x06" in body and b"PK\x06\x07" in body
+    archive = zipfile.ZipFile(io.BytesIO(body))
+    assert archive.testzip() is None
+    assert [archive.read(name) for name in contents] == list(contents.values())
+
+
+def test_unique_names_strip_directories_and_number_duplicates():
+    assert unique_names(["a/guide.pdf", "Guide.pdf", "..\\guide.pdf", ".env", "", "notes"]) == [
+        "guide.pdf",
+        "Guide (2).pdf",
+        "guide (3).pdf",
+        ".env",
+        "file",
+        "notes",
+    ]
+
+
+def test_crc_cache_is_keyed_by_mtime(tmp_path):
+    path = tmp_path / "f.pdf"
+    path.write_bytes(b"abc")
+    record = SimpleNamespace(crc32=None, crc32_mtime_ns=None)
+    assert refresh_crc32(record, str(path), path.stat()) is True
+    assert record.crc32 == zlib.crc32(b"abc") == file_crc32(str(path))
+    assert refresh_crc32(record, str(path), path.stat()) is False
+
+    path.write_bytes(b"abcd")
+    os.utime(path, ns=(0, record.crc32_mtime_ns + 1))
+    assert refresh_crc32(record, str(path), path.stat()) is True
+    assert record.crc32 == zlib.crc32(b"abcd")
+
+
+@pytest.fixture
+def client(members):
+    members, _ = members
+    app = FastAPI()
+
+    @app.api_route("/bundle", methods=["GET", "HEAD"])
+    def bundle():
+        return ZipStreamResponse(members, filename="ORD-00000001Y.zip")
+
+    return TestClient(app), _render(members)
+
+
+def test_bundle_response_has_exact_length_and_validators(client):
+    client, expected = client
+    response = client.get("/bundle")
+    assert response.status_code == 200 and response.content == expected
+    assert response.headers["content-length"] == str(len(expected))
+    assert response.headers["content-type"] == "application/zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="ORD-00000001Y.zip"'
+    assert response.headers["accept-ranges"] == "bytes"
+
+    head = client.head("/bundle")
+    assert head.content == b"" and head.headers["content-length"] == str(len(expected))
+    assert head.headers["etag"] == response.headers["etag"]
+
+
+def test_bundle_resumes_across_entry_boundaries(client):
+    client, expected = client
+    etag = client.head("/bundle").headers["etag"]
+    # from inside the first file's data to inside the second entry's header and beyond
+    response = client.get("/bundle", headers={"Range": "bytes=2500-3100", "If-Range": etag})
+    assert response.status_code == 206 and response.content == expected[2500:3101]
+
+    tail = client.get("/bundle", headers={"Range": "bytes=-100"})
+    assert tail.content == expected[-100:]
+    assert tail.headers["content-range"] == f"bytes {len(expected) - 100}-{len(expected) - 1}/{len(expected)}"
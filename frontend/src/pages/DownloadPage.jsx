@@ -29,14 +29,15 @@ const DownloadPage = () => {
   const handleDownload = async (fileId, fileName) => {
     setDownloading(fileId)
     try {
-      const blob = await downloadService.downloadFile(orderId, fileId)
-      const url = window.URL.createObjectURL(blob)
+      // Let the browser's download manager fetch the signed link: it streams to disk and can resume
+      const { files: links } = await downloadService.getDownloadLinks(orderId)
+      const link = links.find((f) => f.id === fileId)
+      if (!link) throw new Error(`No download link for file ${fileId}`)
       const a = document.createElement('a')
-      a.href = url
+      a.href = link.url
       a.download = fileName
       document.body.appendChild(a)
       a.click()
-      window.URL.revokeObjectURL(url)
       document.body.removeChild(a)
     } catch (error) {
       console.error('Download failed:', error)
@@ -6,6 +6,12 @@ export const downloadService = {
     return response.data
   },
 
+  // Signed, short-lived URLs the browser can download (and resume) without the auth header
+  async getDownloadLinks(orderId) {
+    const response = await api.post(`/downloads/${orderId}/links`)
+    return response.data
+  },
+
   async downloadFile(orderId, fileId) {
     const response = await api.get(`/downloads/${orderId}/files/${fileId}`, {
       responseType: 'blob',